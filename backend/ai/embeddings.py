@@ -0,0 +1,79 @@
+"""
+Local CPU-only text embeddings for relevance scoring.
+"""
+import hashlib
+import math
+import re
+import logging
+from collections import Counter
+from typing import List, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+TOKEN_PATTERN = re.compile(r"[^\W_]+", re.UNICODE)
+
+STOP_WORDS = frozenset("""
+a about above after again against all am an and any are as at be because been
+before being below between both but by can could did do does doing down during
+each few for from further had has have having he her here hers herself him
+himself his how i if in into is it its itself just me more most my myself no nor
+not now of off on once only or other our ours ourselves out over own same she
+should so some such than that the their theirs them themselves then there these
+they this those through to too under until up very was we were what when where
+which while who whom why will with would you your yours yourself yourselves
+said says also new one two
+""".split())
+
+class HashingEmbedder:
+    """Embed text with the hashing trick over word unigrams and bigrams.
+
+    Each token is hashed to one of ``dim`` buckets with a pseudo-random sign,
+    weighted by sublinear term frequency and accumulated into a dense vector
+    that is L2-normalized to float32. Vectors depend only on the text, so they
+    stay comparable across refreshes without any fitted vocabulary or model
+    files on disk.
+    """
+
+    name = "hashing-tf-v1"
+
+    def __init__(self, dim: int = 384):
+        self.dim = dim
+
+    def embed(self, text: str) -> np.ndarray:
+        """Embed a single text as a normalized float32 vector."""
+        return self.embed_batch([text])[0]
+
+    def embed_batch(self, texts: List[str]) -> np.ndarray:
+        """Embed texts into a ``(len(texts), dim)`` float32 matrix of unit rows.
+
+        Texts without any usable tokens produce all-zero rows.
+        """
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            counts = Counter(self._terms(text or ""))
+            if not counts:
+                continue
+            buckets = np.empty(len(counts), dtype=np.int64)
+            weights = np.empty(len(counts), dtype=np.float32)
+            for i, (term, count) in enumerate(counts.items()):
+                bucket, sign = self._bucket(term)
+                buckets[i] = bucket
+                weights[i] = sign * (1.0 + math.log(count))
+            np.add.at(matrix[row], buckets, weights)
+
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        np.divide(matrix, norms, out=matrix, where=norms > 0)
+        return matrix
+
+    def _terms(self, text: str) -> List[str]:
+        """Split text into content-word unigrams and bigrams."""
+        words = [word for word in TOKEN_PATTERN.findall(text.lower())
+                 if len(word) > 1 and word not in STOP_WORDS]
+        return words + [f"{first} {second}" for first, second in zip(words, words[1:])]
+
+    def _bucket(self, term: str) -> Tuple[int, float]:
+        """Hash a term to a stable ``(bucket, sign)`` pair."""
+        digest = int.from_bytes(hashlib.blake2b(term.encode('utf-8'), digest_size=8).digest(), 'little')
+        return digest % self.dim, 1.0 if digest >> 63 else -1.0
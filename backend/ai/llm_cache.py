@@ -0,0 +1,159 @@
+"""
+Persistent cache of LLM results keyed by model input.
+"""
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+import unicodedata
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+WHITESPACE_PATTERN = re.compile(r"\s+")
+
+def normalize_text(text: Optional[str]) -> str:
+    """Normalize text so trivially different copies share a cache key."""
+    return WHITESPACE_PATTERN.sub(' ', unicodedata.normalize('NFC', text or '')).strip()
+
+class LLMCache:
+    """Look up and store LLM results in the database's ``llm_cache`` table.
+
+    Keys hash the result kind, model id, prompt version and normalized input,
+    so a change to any of them misses instead of reusing a stale answer. The
+    table keeps at most ``max_entries`` results, evicting the least recently
+    used. Hits and misses are counted per kind since startup.
+
+    Lookups only read. Hits are collected in memory and written with the next
+    stored result, ahead of its eviction, or by ``flush`` once
+    ``HIT_FLUSH_SIZE`` have piled up or ``HIT_FLUSH_INTERVAL`` seconds passed.
+    """
+
+    HIT_FLUSH_SIZE = 100
+    HIT_FLUSH_INTERVAL = 30.0
+
+    def __init__(self, db, max_entries: int = None, enabled: bool = None):
+        if max_entries is None:
+            max_entries = int(os.environ.get('LLM_CACHE_MAX_ENTRIES', '20000'))
+        if enabled is None:
+            enabled = os.environ.get('LLM_CACHE_ENABLED', '1') not in ('0', 'false', 'no')
+
+        self.db = db
+        self.max_entries = max(0, max_entries)
+        self.enabled = enabled and self.max_entries > 0
+        self._lock = threading.Lock()
+        self._counts: Dict[str, Dict[str, int]] = {}
+        self._evictions = 0
+        # Hits not yet written: key -> [kind, count, last used]
+        self._pending_hits: Dict[str, list] = {}
+        self._pending_since: Optional[float] = None
+
+    @staticmethod
+    def key(kind: str, model: str, prompt_version: int, *parts: Optional[str]) -> str:
+        """Hash a request's identity into a cache key."""
+        digest = hashlib.sha256()
+        for part in (kind, model, str(prompt_version)) + tuple(normalize_text(part) for part in parts):
+            digest.update(part.encode('utf-8'))
+            digest.update(b'\0')
+        return digest.hexdigest()
+
+    def get(self, key: str, kind: str) -> Optional[Any]:
+        """Return the cached result for ``key``, or None on a miss."""
+        return self.get_many([key], kind)[0]
+
+    def get_many(self, keys: List[str], kind: str) -> List[Optional[Any]]:
+        """Return the cached result for each key (None on a miss) with one read."""
+        if not self.enabled or not keys:
+            return [None] * len(keys)
+        values = self.db.get_llm_results(keys)
+
+        results = []
+        for key in keys:
+            result = None
+            if values.get(key) is not None:
+                try:
+                    result = json.loads(values[key])
+                except ValueError:
+                    logger.warning(f"Ignoring unreadable LLM cache entry {key}")
+            results.append(result)
+
+        now = time.time()
+        with self._lock:
+            for key, result in zip(keys, results):
+                self._count(kind, 'hits' if result is not None else 'misses')
+                if result is not None:
+                    pending = self._pending_hits.setdefault(key, [kind, 0, now])
+                    pending[1] += 1
+                    pending[2] = now
+                    if self._pending_since is None:
+                        self._pending_since = now
+            due = self._pending_since is not None and (
+                len(self._pending_hits) >= self.HIT_FLUSH_SIZE or
+                now - self._pending_since >= self.HIT_FLUSH_INTERVAL)
+        if due:
+            self.flush()
+        return results
+
+    def put(self, key: str, kind: str, model: str, result: Any):
+        """Cache one result."""
+        self.put_many([(key, kind, model, result)])
+
+    def put_many(self, entries: List[Tuple[str, str, str, Any]]):
+        """Cache ``(key, kind, model, result)`` entries in one write."""
+        if not self.enabled or not entries:
+            return
+        evicted = self.db.store_llm_results(
+            [(key, kind, model, json.dumps(result)) for key, kind, model, result in entries],
+            self.max_entries,
+            self._take_pending_hits()
+        )
+        if evicted:
+            with self._lock:
+                self._evictions += evicted
+
+    def flush(self):
+        """Write the hits collected since the last write."""
+        hits = self._take_pending_hits()
+        if hits:
+            self.db.store_llm_results([], self.max_entries, hits)
+
+    def _take_pending_hits(self) -> List[Tuple[str, int, float]]:
+        """Remove and return pending hits as ``(key, count, last_used)``."""
+        with self._lock:
+            hits = [(key, count, last_used) for key, (_, count, last_used) in self._pending_hits.items()]
+            self._pending_hits = {}
+            self._pending_since = None
+        return hits
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters since startup merged with the stored entries per kind."""
+        stored = self.db.get_llm_cache_stats() if self.enabled else {}
+        with self._lock:
+            counts = {kind: dict(values) for kind, values in self._counts.items()}
+            evictions = self._evictions
+            pending = {}
+            for kind, count, _ in self._pending_hits.values():
+                pending[kind] = pending.get(kind, 0) + count
+
+        kinds = {}
+        for kind in sorted(set(stored) | set(counts)):
+            hits = counts.get(kind, {}).get('hits', 0)
+            misses = counts.get(kind, {}).get('misses', 0)
+            kinds[kind] = {
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": round(hits / (hits + misses), 3) if hits + misses else 0.0,
+                "entries": stored.get(kind, {}).get('entries', 0),
+                "bytes": stored.get(kind, {}).get('bytes', 0),
+                "lifetime_hits": stored.get(kind, {}).get('hits', 0) + pending.get(kind, 0),
+            }
+        return {"enabled": self.enabled, "max_entries": self.max_entries,
+                "evictions": evictions, "kinds": kinds}
+
+    def _count(self, kind: str, counter: str):
+        # Called with self._lock held
+        counts = self._counts.setdefault(kind, {})
+        counts[counter] = counts.get(counter, 0) + 1
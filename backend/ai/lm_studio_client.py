@@ -3,15 +3,59 @@ LM Studio client for AI-powered content analysis and filtering.
 """
 import openai
 import requests
-from typing import List, Dict, Any, Optional
+from requests.adapters import HTTPAdapter
+import numpy as np
+from typing import List, Dict, Any, Iterator, Optional
 import json
 import logging
+import os
+import threading
+import time
+
+from .embeddings import HashingEmbedder
+from .llm_cache import LLMCache
 
 logger = logging.getLogger(__name__)
 
+# Bump when a prompt changes so results cached for the old prompt are not reused
+ANALYSIS_PROMPT_VERSION = 1
+SUMMARY_PROMPT_VERSION = 1
+
+SUMMARY_SYSTEM_PROMPT = "You are a news summarizer. Provide concise, factual summaries."
+
+ANALYSIS_SCHEMA = """{
+    "category": "one of: technology, politics, business, science, health, sports, entertainment, fashion, world",
+    "sentiment": "positive, negative, or neutral",
+    "importance": "high, medium, or low",
+    "topics": ["list", "of", "key", "topics"],
+    "summary": "brief one-sentence summary",
+    "political_bias": -0.2,
+    "bias_confidence": 0.8,
+    "bias_reasoning": "Detailed explanation of why this bias score was assigned, including specific language choices, framing decisions, source selection, and perspective indicators that influenced the assessment.",
+    "relevance_boost": 0.0
+}"""
+
+ANALYSIS_GUIDELINES = """For political bias analysis:
+- -1.0 to -0.5: Left-leaning (progressive, liberal perspective)
+- -0.5 to -0.2: Slight left lean
+- -0.2 to 0.2: Neutral or non-political
+- 0.2 to 0.5: Slight right lean  
+- 0.5 to 1.0: Right-leaning (conservative perspective)
+
+For bias_reasoning, analyze and explain:
+1. Language choices (loaded words, emotional language, descriptive adjectives)
+2. Framing decisions (how the story is presented, what's emphasized)
+3. Source selection (which voices are included/excluded, credibility indicators)
+4. Perspective indicators (whose viewpoint is prioritized, balance of coverage)
+5. Context and implications (what's included/omitted from the broader context)
+
+Note: 
+- Fashion category includes: streetwear, high fashion, vintage clothing, designer brands, fashion trends, style guides, fashion weeks, and clothing culture.
+- Set relevance_boost to 0.5 if the article matches any category preferences listed above.
+"""
+
 class LMStudioClient:
-    def __init__(self, base_url: str = None, api_key: str = "lm-studio"):
-        import os
+    def __init__(self, base_url: str = None, api_key: str = "lm-studio", cache: Optional[LLMCache] = None):
         # Try environment variables first
         if base_url is None:
             lm_host = os.environ.get('LM_STUDIO_HOST')
@@ -48,103 +92,131 @@ class LMStudioClient:
         openai.api_base = f"{self.base_url}/v1"
         openai.api_key = api_key
         
+        # One pooled keep-alive session is shared by every call to LM Studio
+        self.timeout = float(os.environ.get('LM_STUDIO_TIMEOUT', '30'))
+        pool_size = max(1, int(os.environ.get('LM_STUDIO_POOL_SIZE', '8')))
+        self.session = requests.Session()
+        self.session.headers.update({"Content-Type": "application/json"})
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        
+        # Embeddings are computed locally on the CPU, independent of LM Studio
+        self.embedder = HashingEmbedder()
+        
+        # Analyses and summaries of text seen before are answered from the cache
+        self.cache = cache
+        
+        # Number of articles sent together in one categorization prompt
+        self.batch_size = max(1, int(os.environ.get('LLM_BATCH_SIZE', '4')))
+        
+        # Cache of the /v1/models probe so availability and model discovery
+        # don't cost an HTTP round trip per call
+        self.cache_ttl = float(os.environ.get('LM_STUDIO_CACHE_TTL', '60'))
+        self.down_ttl = float(os.environ.get('LM_STUDIO_DOWN_TTL', '15'))
+        self._model_lock = threading.Lock()
+        self._probe_done = threading.Condition(self._model_lock)
+        self._model_id: Optional[str] = None
+        self._available: Optional[bool] = None
+        self._checked_at = 0.0
+        self._probe_in_flight = False
+        
     def is_available(self) -> bool:
         """Check if LM Studio is running and accessible."""
+        return self._check_models()
+    
+    def _check_models(self) -> bool:
+        """Return cached availability, re-probing LM Studio when the cache is stale.
+        
+        The first call probes synchronously while concurrent callers wait for
+        its answer. After that a stale entry is refreshed on a background
+        thread while callers keep the cached answer, so a backend marked down
+        fails fast until a probe sees it come back.
+        """
+        with self._model_lock:
+            if self._available is None and self._probe_in_flight:
+                self._probe_done.wait_for(lambda: self._available is not None)
+                return self._available
+            if self._available is None:
+                self._probe_in_flight = True
+                first_probe = True
+            else:
+                first_probe = False
+                ttl = self.cache_ttl if self._available else self.down_ttl
+                stale = time.monotonic() - self._checked_at >= ttl
+                if stale and not self._probe_in_flight:
+                    self._probe_in_flight = True
+                    threading.Thread(target=self._probe_models, daemon=True,
+                                     name='lm-studio-probe').start()
+                return self._available
+        
+        if first_probe:
+            self._probe_models()
+        return bool(self._available)
+    
+    def _probe_models(self):
+        """Query /v1/models and record availability and the first model id."""
+        model_id = None
         try:
-            response = requests.get(f"{self.base_url}/v1/models", timeout=5)
+            response = self.session.get(f"{self.base_url}/v1/models", timeout=min(5, self.timeout))
             if response.status_code == 200:
                 models_data = response.json()
                 models = models_data.get('data', []) if isinstance(models_data, dict) else []
-                return len(models) > 0
-            return False
+                if models:
+                    model_id = models[0]['id']
         except Exception as e:
             logger.error(f"LM Studio not available: {e}")
-            return False
+        
+        with self._model_lock:
+            self._available = model_id is not None
+            if model_id is not None:
+                self._model_id = model_id
+            self._checked_at = time.monotonic()
+            self._probe_in_flight = False
+            self._probe_done.notify_all()
+    
+    def _mark_unavailable(self):
+        """Mark LM Studio as down after a failed request so later calls fail fast."""
+        with self._model_lock:
+            self._available = False
+            self._checked_at = time.monotonic()
     
     def _get_available_model(self) -> str:
         """Get the first available model."""
-        try:
-            response = requests.get(f"{self.base_url}/v1/models", timeout=5)
-            if response.status_code == 200:
-                models_data = response.json()
-                models = models_data.get('data', []) if isinstance(models_data, dict) else []
-                if models:
-                    return models[0]['id']
-            raise Exception("No models available")
-        except Exception as e:
-            logger.error(f"Error fetching models: {e}")
-            # Use the known model from LM Studio
-            return "mistralai/mistral-7b-instruct-v0.3"
+        self._check_models()
+        if self._model_id:
+            return self._model_id
+        # Use the known model from LM Studio
+        return "mistralai/mistral-7b-instruct-v0.3"
     
     def generate_embedding(self, text: str, model: str = "text-embedding-ada-002") -> Optional[List[float]]:
         """Generate embeddings for text content."""
         try:
-            # LM Studio may not have embedding models, so we'll simulate with a hash-based approach
-            # In production, you'd use a proper embedding model
-            import hashlib
-            import numpy as np
-            
-            # Create a simple hash-based embedding (for demo purposes)
-            # Replace this with actual embedding model when available
-            text_hash = hashlib.md5(text.encode()).hexdigest()
-            # Convert hash to vector (384 dimensions like many embedding models)
-            vector = []
-            for i in range(0, len(text_hash), 2):
-                vector.append(int(text_hash[i:i+2], 16) / 255.0)
-            
-            # Pad to standard embedding size
-            while len(vector) < 384:
-                vector.append(0.0)
-            
-            return vector[:384]
+            return self.embedder.embed(text).tolist()
             
         except Exception as e:
             logger.error(f"Error generating embedding: {e}")
             return None
     
+    def generate_embeddings(self, texts: List[str]) -> np.ndarray:
+        """Embed several texts at once as a float32 matrix of unit rows."""
+        return self.embedder.embed_batch(texts)
+    
     def categorize_article(self, title: str, content: str, model: str = None, category_prefs: List[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Categorize an article and extract metadata."""
         if model is None:
             model = self._get_available_model()
         
-        # Build preference context if provided
-        pref_context = ""
-        if category_prefs:
-            pref_context = "\n\nCategory Preferences:\n"
-            for pref in category_prefs:
-                pref_context += f"- {pref['category']}: Look for content about {', '.join(pref['keywords'])}\n"
+        pref_context = self._preference_context(category_prefs)
+        cache_key = self._analysis_key(model, title, content, pref_context)
+        cached = self._cache_get(cache_key, 'analysis')
+        if cached is not None:
+            return cached
         
         prompt = f"""Analyze this news article and provide a JSON response with the following structure:
-{{
-    "category": "one of: technology, politics, business, science, health, sports, entertainment, fashion, world",
-    "sentiment": "positive, negative, or neutral",
-    "importance": "high, medium, or low",
-    "topics": ["list", "of", "key", "topics"],
-    "summary": "brief one-sentence summary",
-    "political_bias": -0.2,
-    "bias_confidence": 0.8,
-    "bias_reasoning": "Detailed explanation of why this bias score was assigned, including specific language choices, framing decisions, source selection, and perspective indicators that influenced the assessment.",
-    "relevance_boost": 0.0
-}}
+{ANALYSIS_SCHEMA}
 
-For political bias analysis:
-- -1.0 to -0.5: Left-leaning (progressive, liberal perspective)
-- -0.5 to -0.2: Slight left lean
-- -0.2 to 0.2: Neutral or non-political
-- 0.2 to 0.5: Slight right lean  
-- 0.5 to 1.0: Right-leaning (conservative perspective)
-
-For bias_reasoning, analyze and explain:
-1. Language choices (loaded words, emotional language, descriptive adjectives)
-2. Framing decisions (how the story is presented, what's emphasized)
-3. Source selection (which voices are included/excluded, credibility indicators)
-4. Perspective indicators (whose viewpoint is prioritized, balance of coverage)
-5. Context and implications (what's included/omitted from the broader context)
-
-Note: 
-- Fashion category includes: streetwear, high fashion, vintage clothing, designer brands, fashion trends, style guides, fashion weeks, and clothing culture.
-- Set relevance_boost to 0.5 if the article matches any category preferences listed above.
-{pref_context}
+{ANALYSIS_GUIDELINES}{pref_context}
 
 Title: {title}
 Content: {content[:1000]}...
@@ -152,58 +224,245 @@ Content: {content[:1000]}...
 Respond only with valid JSON, no other text."""
         
         try:
-            # Use direct requests instead of openai library
-            # Note: Some models in LM Studio only support user/assistant roles
-            combined_prompt = f"You are a news article analyzer. Respond only with valid JSON.\n\n{prompt}"
-            payload = {
-                "model": model,
-                "messages": [
-                    {"role": "user", "content": combined_prompt}
-                ],
-                "max_tokens": 500,
-                "temperature": 0.1
-            }
+            if not self._check_models():
+                raise Exception("LM Studio is marked unavailable")
             
-            response = requests.post(
-                f"{self.base_url}/v1/chat/completions",
-                headers={"Content-Type": "application/json"},
-                json=payload,
-                timeout=30
+            result_text = self._chat_completion(
+                "You are a news article analyzer. Respond only with valid JSON.",
+                prompt, model, max_tokens=500
             )
             
-            if response.status_code == 200:
-                data = response.json()
-                result_text = data['choices'][0]['message']['content'].strip()
-                
-                # Extract JSON from response (in case there's extra text)
-                start = result_text.find('{')
-                end = result_text.rfind('}') + 1
-                if start != -1 and end != 0:
-                    result_text = result_text[start:end]
-                
-                result = json.loads(result_text)
-                
-                # Fix bias_reasoning if it's a dict (convert to string)
-                if isinstance(result.get('bias_reasoning'), dict):
-                    reasoning_dict = result['bias_reasoning']
-                    result['bias_reasoning'] = ". ".join([f"{k}: {v}" for k, v in reasoning_dict.items()])
-                
-                return result
-            else:
-                raise Exception(f"HTTP {response.status_code}")
+            # Extract JSON from response (in case there's extra text)
+            start = result_text.find('{')
+            end = result_text.rfind('}') + 1
+            if start != -1 and end != 0:
+                result_text = result_text[start:end]
+            
+            result = self._normalize_analysis(json.loads(result_text))
+            if result is None:
+                raise Exception("Response is not a valid analysis")
+            self._cache_put([(cache_key, 'analysis', model, result)])
+            return result
+            
         except Exception as e:
+            if isinstance(e, requests.exceptions.ConnectionError):
+                self._mark_unavailable()
             logger.error(f"Error categorizing article: {e}")
-            return {
-                "category": "uncategorized",
-                "sentiment": "neutral", 
-                "importance": "medium",
-                "topics": [],
-                "summary": title,
-                "political_bias": 0.0,
-                "bias_confidence": 0.0,
-                "bias_reasoning": "Unable to analyze bias due to AI processing error.",
-                "relevance_boost": 0.0
-            }
+            return self.default_analysis(title)
+    
+    def categorize_articles(self, articles: List[Dict[str, Any]], model: str = None,
+                            category_prefs: List[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """Categorize several articles with a single prompt.
+        
+        Articles with a cached analysis are answered from the cache. For the
+        rest the instruction block is sent once for the whole batch and the
+        model answers with a JSON array. Items that are missing or fail
+        validation are retried with individual categorize_article calls.
+        """
+        if not articles:
+            return []
+        if len(articles) == 1:
+            article = articles[0]
+            return [self.categorize_article(article['title'], article['content'],
+                                            model=model, category_prefs=category_prefs)]
+        if model is None:
+            model = self._get_available_model()
+        
+        pref_context = self._preference_context(category_prefs)
+        keys = [self._analysis_key(model, article['title'], article['content'], pref_context)
+                for article in articles]
+        results: List[Optional[Dict[str, Any]]] = self._cache_get_many(keys, 'analysis')
+        pending = [i for i, result in enumerate(results) if result is None]
+        if not pending:
+            return results
+        
+        article_blocks = "\n\n".join(
+            f"[{number}] Title: {articles[i]['title']}\nContent: {articles[i]['content'][:1000]}..."
+            for number, i in enumerate(pending, start=1)
+        )
+        prompt = f"""Analyze each of the {len(pending)} news articles below. For every article produce a JSON object with the following structure, plus an "article" field holding the article's number:
+{ANALYSIS_SCHEMA}
+
+{ANALYSIS_GUIDELINES}{pref_context}
+
+Articles:
+
+{article_blocks}
+
+Respond only with a valid JSON array of {len(pending)} objects, one per article in the order given, no other text."""
+        
+        try:
+            if not self._check_models():
+                raise Exception("LM Studio is marked unavailable")
+            
+            result_text = self._chat_completion(
+                "You are a news article analyzer. Respond only with valid JSON.",
+                prompt, model, max_tokens=500 * len(pending),
+                timeout=self.timeout * len(pending)
+            )
+            
+            # Extract the JSON array from the response (in case there's extra text)
+            start = result_text.find('[')
+            end = result_text.rfind(']') + 1
+            if start != -1 and end != 0:
+                result_text = result_text[start:end]
+            items = json.loads(result_text)
+            if not isinstance(items, list):
+                raise Exception("Response is not a JSON array")
+            
+            for position, item in enumerate(items):
+                if not isinstance(item, dict):
+                    continue
+                index = item.pop('article', position + 1)
+                try:
+                    index = int(index) - 1
+                except (TypeError, ValueError):
+                    index = position
+                if 0 <= index < len(pending) and results[pending[index]] is None:
+                    results[pending[index]] = self._normalize_analysis(item)
+            
+            self._cache_put([(keys[i], 'analysis', model, results[i])
+                             for i in pending if results[i] is not None])
+                    
+        except Exception as e:
+            if isinstance(e, requests.exceptions.ConnectionError):
+                self._mark_unavailable()
+            logger.error(f"Error categorizing article batch: {e}")
+        
+        failed = [i for i, result in enumerate(results) if result is None]
+        if failed:
+            logger.info(f"Falling back to single categorization for {len(failed)} of {len(articles)} articles")
+        for i in failed:
+            results[i] = self.categorize_article(articles[i]['title'], articles[i]['content'],
+                                                 model=model, category_prefs=category_prefs)
+        return results
+    
+    def _analysis_key(self, model: str, title: str, content: str, pref_context: str) -> Optional[str]:
+        """Cache key of an analysis; preferences are part of the prompt, so part of the key."""
+        if self.cache is None:
+            return None
+        return self.cache.key('analysis', model, ANALYSIS_PROMPT_VERSION, title, (content or '')[:1000], pref_context)
+    
+    def _cache_get(self, key: Optional[str], kind: str) -> Optional[Any]:
+        """Look up a cached result, if caching is configured."""
+        if self.cache is None or key is None:
+            return None
+        return self.cache.get(key, kind)
+    
+    def _cache_get_many(self, keys: List[Optional[str]], kind: str) -> List[Optional[Any]]:
+        """Look up several cached results with one read, if caching is configured."""
+        if self.cache is None or None in keys:
+            return [None] * len(keys)
+        return self.cache.get_many(keys, kind)
+    
+    def _cache_put(self, entries: List[tuple]):
+        """Cache ``(key, kind, model, result)`` entries, if caching is configured."""
+        if self.cache is not None:
+            self.cache.put_many([entry for entry in entries if entry[0] is not None])
+    
+    def _preference_context(self, category_prefs: Optional[List[Dict[str, Any]]]) -> str:
+        """Build the category preference section of the analysis prompt."""
+        pref_context = ""
+        if category_prefs:
+            pref_context = "\n\nCategory Preferences:\n"
+            for pref in category_prefs:
+                pref_context += f"- {pref['category']}: Look for content about {', '.join(pref['keywords'])}\n"
+        return pref_context
+    
+    def _normalize_analysis(self, result: Any) -> Optional[Dict[str, Any]]:
+        """Validate a parsed analysis, returning None if it is unusable."""
+        if not isinstance(result, dict) or not isinstance(result.get('category'), str):
+            return None
+        
+        # Fix bias_reasoning if it's a dict (convert to string)
+        if isinstance(result.get('bias_reasoning'), dict):
+            reasoning_dict = result['bias_reasoning']
+            result['bias_reasoning'] = ". ".join([f"{k}: {v}" for k, v in reasoning_dict.items()])
+        
+        for field in ('political_bias', 'bias_confidence', 'relevance_boost'):
+            if field in result:
+                try:
+                    result[field] = float(result[field])
+                except (TypeError, ValueError):
+                    return None
+        if 'topics' in result and not isinstance(result['topics'], list):
+            return None
+        
+        return result
+    
+    def _chat_completion(self, system_prompt: str, prompt: str, model: str,
+                         max_tokens: int, timeout: float = None) -> str:
+        """Send a single-message chat completion and return the reply text."""
+        response = self.session.post(
+            f"{self.base_url}/v1/chat/completions",
+            json=self._chat_payload(system_prompt, prompt, model, max_tokens),
+            timeout=timeout or self.timeout
+        )
+        
+        if response.status_code != 200:
+            raise Exception(f"HTTP {response.status_code}")
+        data = response.json()
+        return data['choices'][0]['message']['content'].strip()
+    
+    def _stream_chat_completion(self, system_prompt: str, prompt: str, model: str,
+                                max_tokens: int, timeout: float = None) -> Iterator[str]:
+        """Send a streaming chat completion and yield reply text as it arrives.
+        
+        LM Studio streams OpenAI-style Server-Sent Events: one ``data:`` line
+        per chunk carrying a ``delta``, ended by ``data: [DONE]``. ``timeout``
+        bounds the wait for each chunk rather than the whole reply.
+        """
+        payload = self._chat_payload(system_prompt, prompt, model, max_tokens)
+        payload["stream"] = True
+        
+        with self.session.post(
+            f"{self.base_url}/v1/chat/completions",
+            json=payload,
+            timeout=timeout or self.timeout,
+            stream=True
+        ) as response:
+            if response.status_code != 200:
+                raise Exception(f"HTTP {response.status_code}")
+            for line in response.iter_lines():
+                line = line.decode('utf-8') if isinstance(line, bytes) else line
+                if not line.startswith('data:'):
+                    continue
+                data = line[len('data:'):].strip()
+                if data == '[DONE]':
+                    break
+                choices = json.loads(data).get('choices') or [{}]
+                text = (choices[0].get('delta') or {}).get('content')
+                if text:
+                    yield text
+    
+    @staticmethod
+    def _chat_payload(system_prompt: str, prompt: str, model: str, max_tokens: int) -> Dict[str, Any]:
+        """Build a single-message chat completion request."""
+        # Use direct requests instead of openai library
+        # Note: Some models in LM Studio only support user/assistant roles
+        return {
+            "model": model,
+            "messages": [
+                {"role": "user", "content": f"{system_prompt}\n\n{prompt}"}
+            ],
+            "max_tokens": max_tokens,
+            "temperature": 0.1
+        }
+    
+    @staticmethod
+    def default_analysis(title: str) -> Dict[str, Any]:
+        """Fallback analysis used when an article cannot be categorized."""
+        return {
+            "category": "uncategorized",
+            "sentiment": "neutral", 
+            "importance": "medium",
+            "topics": [],
+            "summary": title,
+            "political_bias": 0.0,
+            "bias_confidence": 0.0,
+            "bias_reasoning": "Unable to analyze bias due to AI processing error.",
+            "relevance_boost": 0.0
+        }
     
     def calculate_relevance_score(self, article_embedding: List[float], 
                                  user_preferences: List[float], 
@@ -241,34 +500,65 @@ Respond only with valid JSON, no other text."""
         if model is None:
             model = self._get_available_model()
         
-        prompt = f"Summarize this news article in 1-2 sentences, focusing on the key facts:\n\n{content[:2000]}..."
+        cache_key = self._summary_key(model, content)
+        cached = self._cache_get(cache_key, 'summary')
+        if cached is not None:
+            return cached
         
         try:
-            # Use direct requests instead of openai library
-            # Note: Some models in LM Studio only support user/assistant roles
-            combined_prompt = f"You are a news summarizer. Provide concise, factual summaries.\n\n{prompt}"
-            payload = {
-                "model": model,
-                "messages": [
-                    {"role": "user", "content": combined_prompt}
-                ],
-                "max_tokens": 100,
-                "temperature": 0.1
-            }
+            if not self._check_models():
+                raise Exception("LM Studio is marked unavailable")
             
-            response = requests.post(
-                f"{self.base_url}/v1/chat/completions",
-                headers={"Content-Type": "application/json"},
-                json=payload,
-                timeout=30
-            )
-            
-            if response.status_code == 200:
-                data = response.json()
-                return data['choices'][0]['message']['content'].strip()
-            else:
-                raise Exception(f"HTTP {response.status_code}")
+            summary = self._chat_completion(SUMMARY_SYSTEM_PROMPT, self._summary_prompt(content), model, max_tokens=100)
+            if summary:
+                self._cache_put([(cache_key, 'summary', model, summary)])
+            return summary
                 
         except Exception as e:
+            if isinstance(e, requests.exceptions.ConnectionError):
+                self._mark_unavailable()
             logger.error(f"Error summarizing article: {e}")
-            return "Summary not available."
\ No newline at end of file
+            return "Summary not available."
+    
+    def stream_summary(self, content: str, model: str = None) -> Iterator[str]:
+        """Generate a summary like summarize_article, yielding text as the model produces it.
+        
+        A cached summary is yielded whole. Unlike summarize_article, errors
+        are raised instead of replaced by a placeholder, so a failed stream is
+        never mistaken for a summary.
+        """
+        if model is None:
+            model = self._get_available_model()
+        
+        cache_key = self._summary_key(model, content)
+        cached = self._cache_get(cache_key, 'summary')
+        if cached is not None:
+            yield cached
+            return
+        
+        if not self._check_models():
+            raise Exception("LM Studio is marked unavailable")
+        
+        parts = []
+        try:
+            for text in self._stream_chat_completion(SUMMARY_SYSTEM_PROMPT, self._summary_prompt(content),
+                                                     model, max_tokens=100):
+                parts.append(text)
+                yield text
+        except requests.exceptions.ConnectionError:
+            self._mark_unavailable()
+            raise
+        
+        summary = ''.join(parts).strip()
+        if summary:
+            self._cache_put([(cache_key, 'summary', model, summary)])
+    
+    @staticmethod
+    def _summary_prompt(content: str) -> str:
+        return f"Summarize this news article in 1-2 sentences, focusing on the key facts:\n\n{content[:2000]}..."
+    
+    def _summary_key(self, model: str, content: str) -> Optional[str]:
+        """Cache key of a summary."""
+        if self.cache is None:
+            return None
+        return self.cache.key('summary', model, SUMMARY_PROMPT_VERSION, content[:2000])
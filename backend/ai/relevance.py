@@ -0,0 +1,115 @@
+"""
+Vectorized relevance scoring of article embeddings against user preferences.
+"""
+import threading
+import logging
+from typing import Iterable, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+def score_embeddings(embeddings: np.ndarray, boosts: np.ndarray,
+                     preferences: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """Score unit-length embeddings against unit-length preference vectors.
+
+    Each article's score is its best priority-weighted cosine similarity to
+    any preference, mapped from [-1, 1] to [0, 1] and raised by the article's
+    AI relevance boost. With no preferences every article scores 0.5 plus
+    its boost.
+    """
+    if len(embeddings) == 0:
+        return np.empty(0, dtype=np.float32)
+    if len(preferences) == 0:
+        best = np.zeros(len(embeddings), dtype=np.float32)
+    else:
+        best = (embeddings @ preferences.T * weights).max(axis=1)
+    return np.minimum(1.0, (best + 1.0) / 2.0 + boosts).astype(np.float32)
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """Return a float32 copy of the matrix with unit-length (or zero) rows."""
+    matrix = np.array(matrix, dtype=np.float32, ndmin=2)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    np.divide(matrix, norms, out=matrix, where=norms > 0)
+    return matrix
+
+class RelevanceScorer:
+    """In-memory matrix of article embeddings for bulk relevance scoring.
+
+    Embeddings live in one contiguous, pre-normalized float32 matrix that
+    grows by doubling, so re-scoring every article is a single
+    matrix-vector product per preference.
+    """
+
+    def __init__(self, dim: int):
+        self.dim = dim
+        self.loaded = False
+        self._lock = threading.Lock()
+        self._rows = {}
+        self._ids = np.empty(0, dtype=np.int64)
+        self._matrix = np.empty((0, dim), dtype=np.float32)
+        self._boosts = np.empty(0, dtype=np.float32)
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def load(self, ids: np.ndarray, embeddings: np.ndarray, boosts: np.ndarray):
+        """Replace the matrix contents with the given articles."""
+        ids = np.asarray(ids, dtype=np.int64)
+        with self._lock:
+            self._ids = ids.copy()
+            self._matrix = normalize_rows(embeddings).reshape(len(ids), self.dim)
+            self._boosts = np.asarray(boosts, dtype=np.float32).copy()
+            self._rows = {article_id: row for row, article_id in enumerate(ids.tolist())}
+            self._size = len(ids)
+            self.loaded = True
+        logger.info(f"Loaded {self._size} article embeddings for relevance scoring")
+
+    def upsert(self, ids: Iterable[int], embeddings: np.ndarray, boosts: Iterable[float]):
+        """Add or replace articles in the matrix."""
+        with self._lock:
+            self._upsert(ids, embeddings, boosts)
+
+    def score_all(self, preferences: np.ndarray, weights: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Score every article, returning ``(ids, scores)`` arrays."""
+        with self._lock:
+            size = self._size
+            ids = self._ids[:size].copy()
+            scores = score_embeddings(self._matrix[:size], self._boosts[:size], preferences, weights)
+        return ids, scores
+
+    def _upsert(self, ids, embeddings, boosts):
+        ids = np.asarray(list(ids), dtype=np.int64)
+        if len(ids) == 0:
+            return
+        embeddings = normalize_rows(embeddings)
+        boosts = np.asarray(list(boosts), dtype=np.float32)
+
+        new_count = sum(1 for article_id in ids.tolist() if article_id not in self._rows)
+        self._reserve(self._size + new_count)
+
+        for article_id, embedding, boost in zip(ids.tolist(), embeddings, boosts):
+            row = self._rows.get(article_id)
+            if row is None:
+                row = self._size
+                self._rows[article_id] = row
+                self._ids[row] = article_id
+                self._size += 1
+            self._matrix[row] = embedding
+            self._boosts[row] = boost
+
+    def _reserve(self, capacity: int):
+        """Grow the backing arrays geometrically to hold ``capacity`` rows."""
+        if capacity <= len(self._ids):
+            return
+        new_capacity = max(capacity, 2 * len(self._ids), 1024)
+
+        ids = np.zeros(new_capacity, dtype=np.int64)
+        matrix = np.zeros((new_capacity, self.dim), dtype=np.float32)
+        boosts = np.zeros(new_capacity, dtype=np.float32)
+        ids[:self._size] = self._ids[:self._size]
+        matrix[:self._size] = self._matrix[:self._size]
+        boosts[:self._size] = self._boosts[:self._size]
+
+        self._ids, self._matrix, self._boosts = ids, matrix, boosts
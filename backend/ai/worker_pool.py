@@ -0,0 +1,136 @@
+"""
+Bounded-concurrency asyncio worker pool for blocking LLM calls.
+"""
+import asyncio
+import os
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+class LLMWorkerPool:
+    """Queue of LLM requests served by a fixed number of asyncio workers.
+
+    Each worker runs one blocking call at a time on a dedicated thread pool of
+    the same size, so no more than ``concurrency`` requests ever reach the
+    model server at once. Calls that exceed ``timeout`` fail with
+    ``asyncio.TimeoutError``; the underlying HTTP request is still bounded by
+    the client's own timeout.
+    """
+
+    def __init__(self, concurrency: int = None, timeout: float = None, queue_size: int = None):
+        if concurrency is None:
+            concurrency = int(os.environ.get('LLM_CONCURRENCY', '4'))
+        if timeout is None:
+            timeout = float(os.environ.get('LLM_REQUEST_TIMEOUT', '300'))
+        if queue_size is None:
+            queue_size = int(os.environ.get('LLM_QUEUE_SIZE', '1000'))
+
+        self.concurrency = max(1, concurrency)
+        self.timeout = timeout
+        self.queue_size = queue_size
+
+        self._executor = ThreadPoolExecutor(max_workers=self.concurrency,
+                                            thread_name_prefix='llm-worker')
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+
+    def _ensure_started(self):
+        """Start the workers on the running event loop if not already running there."""
+        loop = asyncio.get_running_loop()
+        if self._loop is loop and self._workers:
+            return
+
+        self._loop = loop
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._workers = [
+            loop.create_task(self._worker(), name=f"llm-worker-{i}")
+            for i in range(self.concurrency)
+        ]
+        logger.info(f"Started LLM worker pool with {self.concurrency} workers")
+
+    async def submit(self, func: Callable, *args, **kwargs) -> asyncio.Future:
+        """Queue a blocking call and return a future for its result."""
+        self._ensure_started()
+        future = self._loop.create_future()
+        await self._queue.put((future, partial(func, *args, **kwargs)))
+        return future
+
+    async def run(self, func: Callable, *args, **kwargs) -> Any:
+        """Queue a blocking call and wait for its result."""
+        future = await self.submit(func, *args, **kwargs)
+        return await future
+
+    async def stop(self):
+        """Cancel the workers. Queued calls that have not started are cancelled."""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+        while self._queue is not None and not self._queue.empty():
+            future, _ = self._queue.get_nowait()
+            future.cancel()
+
+    async def _worker(self):
+        """Serve queued calls one at a time until cancelled."""
+        while True:
+            future, call = await self._queue.get()
+            try:
+                if future.cancelled():
+                    continue
+                result = await asyncio.wait_for(
+                    self._loop.run_in_executor(self._executor, call),
+                    timeout=self.timeout
+                )
+                if not future.cancelled():
+                    future.set_result(result)
+            except asyncio.CancelledError:
+                if not future.done():
+                    future.cancel()
+                raise
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+            finally:
+                self._queue.task_done()
+
+class SingleFlight:
+    """Coalesce concurrent calls that share a key into one in-flight call.
+
+    The first caller for a key starts ``func()`` as a task; callers arriving
+    while it runs wait for the same task and receive its result or exception.
+    The key is released as soon as the call finishes, so later calls start
+    afresh. A caller that is cancelled stops waiting without cancelling the
+    shared call, which other callers may still need.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+
+    def in_flight(self, key: Hashable) -> bool:
+        """Whether a call for ``key`` is running."""
+        return key in self._calls
+
+    def start(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> asyncio.Future:
+        """Start ``func()`` for ``key`` unless a call for it is already running, and return the call."""
+        call = self._calls.get(key)
+        if call is None:
+            call = asyncio.ensure_future(func())
+            self._calls[key] = call
+            call.add_done_callback(partial(self._release, key))
+        return call
+
+    async def run(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        """Like start, then wait for the call's result."""
+        return await asyncio.shield(self.start(key, func))
+
+    def _release(self, key: Hashable, call: asyncio.Future):
+        if self._calls.get(key) is call:
+            del self._calls[key]
+        # Retrieve the outcome so a failure nobody waited for is not reported as unhandled
+        if not call.cancelled():
+            call.exception()
@@ -0,0 +1,140 @@
+"""
+Near-duplicate article detection with SimHash.
+"""
+import hashlib
+import os
+import re
+import threading
+import time
+import logging
+from typing import Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+WORD_PATTERN = re.compile(r"[^\W_]+", re.UNICODE)
+
+HASH_BITS = 64
+
+def simhash(text: str, shingle_size: int = 1, min_words: int = 8) -> Optional[int]:
+    """Compute a 64-bit SimHash over word shingles of ``text``.
+
+    Texts that differ by a few words produce hashes that differ in only a few
+    bits. Single words are the default: feed summaries are short, and longer
+    shingles let a one-word edit move too many bits. Returns None for texts
+    shorter than ``min_words`` words, which are too short to compare reliably.
+    """
+    words = WORD_PATTERN.findall((text or '').lower())
+    if len(words) < min_words:
+        return None
+
+    counts = [0] * HASH_BITS
+    for start in range(len(words) - shingle_size + 1):
+        shingle = ' '.join(words[start:start + shingle_size])
+        value = int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'little')
+        for bit in range(HASH_BITS):
+            counts[bit] += 1 if value >> bit & 1 else -1
+
+    return sum(1 << bit for bit, count in enumerate(counts) if count > 0)
+
+def hamming_distance(first: int, second: int) -> int:
+    """Count the bits that differ between two hashes."""
+    return bin(first ^ second).count('1')
+
+def to_signed(value: int) -> int:
+    """Map an unsigned 64-bit hash onto SQLite's signed INTEGER range."""
+    return value - (1 << HASH_BITS) if value >= 1 << (HASH_BITS - 1) else value
+
+def to_unsigned(value: int) -> int:
+    """Inverse of to_signed."""
+    return value + (1 << HASH_BITS) if value < 0 else value
+
+class SimHashIndex:
+    """Find stored stories whose SimHash is within ``max_distance`` bits.
+
+    Hashes are split into more than ``max_distance`` equal bands and indexed
+    by band value. Two hashes at most ``max_distance`` bits apart must agree
+    exactly on at least one band, so a lookup only compares against the few
+    stories sharing a band instead of every stored hash. Stories older than
+    ``window`` seconds are ignored.
+    """
+
+    def __init__(self, max_distance: int = None, window: float = None):
+        if max_distance is None:
+            max_distance = int(os.environ.get('DEDUP_MAX_DISTANCE', '6'))
+        if window is None:
+            window = float(os.environ.get('DEDUP_WINDOW_HOURS', '72')) * 3600
+
+        self.max_distance = max(0, min(max_distance, HASH_BITS // 2 - 1))
+        self.window = window
+        # Fewest bands (a power of two, so they split 64 bits evenly) that
+        # leaves one band untouched by max_distance differing bits
+        self.bands = 1
+        while self.bands <= self.max_distance:
+            self.bands *= 2
+        self.band_bits = HASH_BITS // self.bands
+        self.loaded = False
+        self._lock = threading.Lock()
+        self._hashes: Dict[int, Tuple[int, float]] = {}
+        self._bands: List[Dict[int, set]] = [{} for _ in range(self.bands)]
+
+    def __len__(self) -> int:
+        return len(self._hashes)
+
+    def load(self, entries: Iterable[Tuple[int, int, float]]):
+        """Replace the index contents with ``(story_id, hash, timestamp)`` entries."""
+        with self._lock:
+            self._hashes = {}
+            self._bands = [{} for _ in range(self.bands)]
+            for story_id, value, added_at in entries:
+                self._add(story_id, value, added_at)
+            self.loaded = True
+        logger.info(f"Loaded {len(self._hashes)} story hashes for duplicate detection")
+
+    def add(self, story_id: int, value: int, added_at: float = None):
+        """Index a story's hash."""
+        with self._lock:
+            self._add(story_id, value, added_at if added_at is not None else time.time())
+
+    def find(self, value: int, now: float = None) -> Optional[int]:
+        """Return the id of the closest recent story within range, if any."""
+        cutoff = (now if now is not None else time.time()) - self.window
+        best, best_distance = None, self.max_distance + 1
+        with self._lock:
+            candidates = set()
+            for band, buckets in zip(self._band_values(value), self._bands):
+                candidates |= buckets.get(band, set())
+            for story_id in candidates:
+                stored, added_at = self._hashes[story_id]
+                if added_at < cutoff:
+                    continue
+                distance = hamming_distance(value, stored)
+                # Ties go to the oldest story so copies share one representative
+                if distance < best_distance or (distance == best_distance and best is not None and story_id < best):
+                    best, best_distance = story_id, distance
+        return best
+
+    def prune(self, now: float = None):
+        """Forget stories older than the window."""
+        cutoff = (now if now is not None else time.time()) - self.window
+        with self._lock:
+            for story_id, (value, added_at) in list(self._hashes.items()):
+                if added_at < cutoff:
+                    self._remove(story_id)
+
+    def _add(self, story_id: int, value: int, added_at: float):
+        if story_id in self._hashes:
+            self._remove(story_id)
+        self._hashes[story_id] = (value, added_at)
+        for band, buckets in zip(self._band_values(value), self._bands):
+            buckets.setdefault(band, set()).add(story_id)
+
+    def _remove(self, story_id: int):
+        value, _ = self._hashes.pop(story_id)
+        for band, buckets in zip(self._band_values(value), self._bands):
+            buckets[band].discard(story_id)
+            if not buckets[band]:
+                del buckets[band]
+
+    def _band_values(self, value: int) -> List[int]:
+        mask = (1 << self.band_bits) - 1
+        return [value >> (band * self.band_bits) & mask for band in range(self.bands)]
@@ -3,37 +3,172 @@ RSS feed parser and content aggregation.
 """
 import feedparser
 import requests
-from typing import List, Dict, Any, Optional
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Dict, Any, Optional, Iterator
+from urllib.parse import urlparse
 from datetime import datetime
+import hashlib
+import os
+import threading
+import time
 import logging
 
 logger = logging.getLogger(__name__)
 
 class FeedParser:
-    def __init__(self):
+    def __init__(self, max_concurrency: int = None, per_host_limit: int = None,
+                 timeout: float = None):
+        if max_concurrency is None:
+            max_concurrency = int(os.environ.get('FEED_FETCH_CONCURRENCY', '16'))
+        if per_host_limit is None:
+            per_host_limit = int(os.environ.get('FEED_FETCH_PER_HOST', '2'))
+        if timeout is None:
+            timeout = float(os.environ.get('FEED_FETCH_TIMEOUT', '10'))
+        
+        self.max_concurrency = max(1, max_concurrency)
+        self.per_host_limit = max(1, per_host_limit)
+        self.timeout = timeout
+        
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'AI News Feed Reader 1.0'
         })
+        # Keep enough pooled connections for every concurrent fetch to a host
+        adapter = HTTPAdapter(pool_connections=self.max_concurrency,
+                              pool_maxsize=self.per_host_limit)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        
+        self._host_slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._host_slots_lock = threading.Lock()
     
     def parse_feed(self, url: str) -> List[Dict[str, Any]]:
         """Parse RSS feed and return list of articles."""
+        return self.fetch_feed({'url': url})['articles']
+    
+    def fetch_feed(self, feed: Dict[str, Any]) -> Dict[str, Any]:
+        """Fetch and parse a single feed, returning its articles and fetch status.
+        
+        The feed's stored ``etag`` and ``last_modified`` validators are sent as a
+        conditional GET. A 304 response (status ``not_modified``) or a body whose
+        hash matches ``content_hash`` (status ``unchanged``) returns without
+        running feedparser.
+        """
+        url = feed['url']
+        result = {
+            'feed': feed,
+            'status': 'ok',
+            'articles': [],
+            'error': None,
+            'etag': feed.get('etag'),
+            'last_modified': feed.get('last_modified'),
+            'content_hash': feed.get('content_hash')
+        }
         try:
-            response = self.session.get(url, timeout=10)
-            feed = feedparser.parse(response.content)
+            headers = {}
+            if feed.get('etag'):
+                headers['If-None-Match'] = feed['etag']
+            if feed.get('last_modified'):
+                headers['If-Modified-Since'] = feed['last_modified']
+            
+            with self._host_slot(url):
+                status_code, response_headers, body = self._download(url, headers)
+            
+            if status_code == 304:
+                logger.info(f"Feed not modified: {url}")
+                result['status'] = 'not_modified'
+                return result
+            
+            result['etag'] = response_headers.get('ETag')
+            result['last_modified'] = response_headers.get('Last-Modified')
+            result['content_hash'] = hashlib.sha256(body).hexdigest()
+            if feed.get('content_hash') == result['content_hash']:
+                logger.info(f"Feed content unchanged: {url}")
+                result['status'] = 'unchanged'
+                return result
+            
+            feed_data = feedparser.parse(body)
+            if feed_data.bozo and not feed_data.entries:
+                # Error pages and parked domains often answer 200 with HTML
+                raise ValueError(f"Not a valid feed: {feed_data.get('bozo_exception')}")
             
             articles = []
-            for entry in feed.entries:
+            for entry in feed_data.entries:
                 article = self._extract_article_data(entry)
                 if article:
                     articles.append(article)
             
             logger.info(f"Parsed {len(articles)} articles from {url}")
-            return articles
+            result['articles'] = articles
             
         except Exception as e:
             logger.error(f"Error parsing feed {url}: {e}")
-            return []
+            result['status'] = 'error'
+            result['error'] = str(e)
+        
+        return result
+    
+    def fetch_feeds(self, feeds: List[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """Fetch feeds concurrently, yielding each result as soon as it completes.
+        
+        At most ``max_concurrency`` feeds are downloaded at once and at most
+        ``per_host_limit`` of those target the same host, so a slow or dead
+        feed only ever occupies its own slot.
+        """
+        if not feeds:
+            return
+        
+        ordered = self._interleave_by_host(feeds)
+        workers = min(self.max_concurrency, len(ordered))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='feed-fetch') as executor:
+            futures = [executor.submit(self.fetch_feed, feed) for feed in ordered]
+            for future in as_completed(futures):
+                yield future.result()
+    
+    def _download(self, url: str, headers: Dict[str, str] = None):
+        """Download a feed body, giving up once the overall timeout has elapsed.
+        
+        Returns a ``(status_code, headers, body)`` tuple.
+        """
+        deadline = time.monotonic() + self.timeout
+        response = self.session.get(url, headers=headers, timeout=self.timeout, stream=True)
+        try:
+            response.raise_for_status()
+            if response.status_code == 304:
+                return response.status_code, response.headers, b''
+            chunks = []
+            for chunk in response.iter_content(chunk_size=65536):
+                chunks.append(chunk)
+                if time.monotonic() > deadline:
+                    raise TimeoutError(f"Download exceeded {self.timeout}s")
+            return response.status_code, response.headers, b''.join(chunks)
+        finally:
+            response.close()
+    
+    def _host_slot(self, url: str) -> threading.BoundedSemaphore:
+        """Get the semaphore limiting concurrent requests to the URL's host."""
+        host = urlparse(url).netloc.lower()
+        with self._host_slots_lock:
+            slot = self._host_slots.get(host)
+            if slot is None:
+                slot = threading.BoundedSemaphore(self.per_host_limit)
+                self._host_slots[host] = slot
+            return slot
+    
+    def _interleave_by_host(self, feeds: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Order feeds round-robin across hosts so workers rarely wait on a host limit."""
+        by_host: Dict[str, List[Dict[str, Any]]] = {}
+        for feed in feeds:
+            by_host.setdefault(urlparse(feed['url']).netloc.lower(), []).append(feed)
+        
+        ordered = []
+        queues = list(by_host.values())
+        while queues:
+            for queue in queues:
+                ordered.append(queue.pop(0))
+            queues = [queue for queue in queues if queue]
+        return ordered
     
     def _extract_article_data(self, entry) -> Optional[Dict[str, Any]]:
         """Extract relevant data from feed entry."""
@@ -58,21 +193,28 @@ class FeedParser:
             
             # Clean HTML from content
             content = self._clean_html(content)
+            title = entry.title if hasattr(entry, 'title') else 'No Title'
             
             return {
-                'title': entry.title if hasattr(entry, 'title') else 'No Title',
+                'title': title,
                 'url': entry.link if hasattr(entry, 'link') else '',
                 'content': content,
                 'author': entry.author if hasattr(entry, 'author') else 'Unknown',
                 'published': pub_date.isoformat(),
                 'source_url': entry.link if hasattr(entry, 'link') else '',
-                'guid': entry.id if hasattr(entry, 'id') else entry.link
+                'guid': entry.id if hasattr(entry, 'id') else entry.link,
+                'content_hash': self.content_hash(title, content)
             }
             
         except Exception as e:
             logger.error(f"Error extracting article data: {e}")
             return None
     
+    @staticmethod
+    def content_hash(title: str, content: str) -> str:
+        """Hash the parts of an article that feed into AI analysis."""
+        return hashlib.sha1(f"{title}\n{content}".encode('utf-8')).hexdigest()
+    
     def _clean_html(self, text: str) -> str:
         """Remove HTML tags from text."""
         import re
@@ -85,7 +227,7 @@ class FeedParser:
     def get_feed_info(self, url: str) -> Dict[str, Any]:
         """Get information about the RSS feed."""
         try:
-            response = self.session.get(url, timeout=10)
+            response = self.session.get(url, timeout=self.timeout)
             feed = feedparser.parse(response.content)
             
             return {
@@ -112,7 +254,6 @@ class FeedParser:
 DEFAULT_FEEDS = [
     'https://feeds.bbci.co.uk/news/rss.xml',
     'https://rss.cnn.com/rss/edition.rss',
-    'https://feeds.reuters.com/reuters/topNews',
     'https://rss.nytimes.com/services/xml/rss/nyt/HomePage.xml',
     'https://feeds.arstechnica.com/arstechnica/index',
     'https://feeds.feedburner.com/TechCrunch',
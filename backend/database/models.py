@@ -3,23 +3,254 @@ Database models and operations for the news feed application.
 """
 import sqlite3
 import json
-from typing import List, Dict, Any, Optional
+import io
+import pickle
+import re
+import struct
+import threading
+import time
+from contextlib import contextmanager
+from typing import List, Dict, Any, Iterator, Optional
 from datetime import datetime
 import logging
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
+# Embedding blobs are a small header followed by little-endian float32 values
+EMBEDDING_MAGIC = b'NFEV'
+EMBEDDING_FORMAT_VERSION = 1
+EMBEDDING_HEADER = struct.Struct('<4sHH')  # magic, format version, dimensions
+
+# Columns that can be projected in article listings; "snippet" and "duplicate_count" are derived
+ARTICLE_FIELDS = {
+    'id': 'id', 'title': 'title', 'url': 'url', 'content': 'content', 'author': 'author',
+    'published': 'published', 'source_url': 'source_url', 'guid': 'guid',
+    'category': 'category', 'sentiment': 'sentiment', 'importance': 'importance',
+    'topics': 'topics', 'summary': 'summary', 'ai_summary': 'ai_summary',
+    'political_bias': 'political_bias', 'bias_confidence': 'bias_confidence',
+    'bias_reasoning': 'bias_reasoning', 'embedding': 'embedding',
+    'relevance_score': 'relevance_score', 'relevance_boost': 'relevance_boost',
+    'read_status': 'read_status', 'content_hash': 'content_hash',
+    'created_at': 'created_at', 'updated_at': 'updated_at',
+    'duplicate_of': 'duplicate_of',
+    'snippet': 'substr(content, 1, 200) AS snippet',
+    'duplicate_count': '(SELECT COUNT(*) FROM articles AS copies '
+                       'WHERE copies.duplicate_of = articles.id) AS duplicate_count',
+}
+
+# Light projection used for feed list views: no full content, reasoning or embedding
+ARTICLE_CARD_FIELDS = [
+    'id', 'title', 'url', 'author', 'published', 'category', 'sentiment', 'importance',
+    'topics', 'summary', 'snippet', 'political_bias', 'bias_confidence',
+    'relevance_score', 'read_status', 'duplicate_count',
+]
+
+# Full-text indexed article columns and their BM25 weights (a title match counts most)
+SEARCH_COLUMNS = {'title': 10.0, 'content': 1.0, 'summary': 4.0, 'topics': 2.0}
+
+# Markers around matched terms in search snippets
+SEARCH_HIGHLIGHT = ('<mark>', '</mark>')
+
+SEARCH_TERM_PATTERN = re.compile(r'"([^"]*)"?|([^\s"]+)')
+
+def search_match_query(text: str) -> Optional[str]:
+    """Turn user search text into an FTS5 query matching all of its terms.
+    
+    Every term is quoted, so FTS5 operators and punctuation typed by the user
+    are matched literally instead of failing to parse; "quoted phrases" stay
+    phrases. The last word also matches as a prefix so partially typed input
+    finds results. Returns None when the text has nothing to search for.
+    """
+    terms = []
+    for phrase, word in SEARCH_TERM_PATTERN.findall(text or ''):
+        term = phrase or word
+        if re.search(r'\w', term):
+            terms.append((f'"{term}"', bool(word)))
+    if not terms:
+        return None
+    
+    query, is_word = terms[-1]
+    if is_word and not text[-1].isspace():
+        terms[-1] = (f'{query}*', is_word)
+    return ' '.join(query for query, _ in terms)
+
+# Category of the fallback analysis stored when the model could not analyze an article
+FALLBACK_CATEGORY = 'uncategorized'
+
+# Values bound per chunked IN (...) query, well under SQLite's bound-parameter limit
+SELECT_IN_CHUNK_SIZE = 400
+
+# Columns written by an article upsert, in insert order
+ARTICLE_UPSERT_COLUMNS = [
+    'title', 'url', 'content', 'author', 'published', 'source_url', 'guid',
+    'category', 'sentiment', 'importance', 'topics', 'summary', 'ai_summary',
+    'political_bias', 'bias_confidence', 'bias_reasoning', 'embedding', 'relevance_score',
+    'relevance_boost', 'content_hash', 'simhash', 'duplicate_of',
+]
+
+# AI analysis columns; re-ingesting an article without a fresh analysis keeps the stored one
+ARTICLE_ANALYSIS_COLUMNS = [
+    'category', 'sentiment', 'importance', 'topics', 'summary', 'political_bias',
+    'bias_confidence', 'bias_reasoning', 'relevance_boost',
+]
+
+# Values the insert fills in when an article does not provide them
+_UPSERT_INSERT_VALUES = {
+    'published': 'COALESCE(:published, :fetched_at)',
+    'topics': "COALESCE(:topics, '[]')",
+    'bias_confidence': 'COALESCE(:bias_confidence, 0.0)',
+    'relevance_score': 'COALESCE(:relevance_score, 0.5)',
+    'relevance_boost': 'COALESCE(:relevance_boost, 0.0)',
+}
+
+# Stored values kept on update when the incoming article does not provide them
+_UPSERT_UPDATE_VALUES = {
+    'published': 'COALESCE(:published, articles.published)',
+    'ai_summary': 'COALESCE(:ai_summary, articles.ai_summary)',
+    'embedding': 'COALESCE(:embedding, articles.embedding)',
+    'relevance_score': 'COALESCE(:relevance_score, articles.relevance_score)',
+    **{column: f'COALESCE(:{column}, articles.{column})' for column in ARTICLE_ANALYSIS_COLUMNS},
+    # A story edited since it was stored may match itself
+    'duplicate_of': 'NULLIF(:duplicate_of, articles.id)',
+}
+
+def _article_upsert_sql() -> str:
+    """Build the article upsert statement.
+    
+    A conflict on url (or on guid, for an article whose link moved) updates
+    the stored row in place, so its id, read status and interactions survive.
+    The update only runs when some column actually differs, which makes
+    re-ingesting an unchanged article a no-op that rewrites no index entries.
+    """
+    values = [_UPSERT_INSERT_VALUES.get(column, f':{column}') for column in ARTICLE_UPSERT_COLUMNS]
+    
+    def on_conflict(target):
+        changes = {column: _UPSERT_UPDATE_VALUES.get(column, f'excluded.{column}')
+                   for column in ARTICLE_UPSERT_COLUMNS if column != target}
+        assignments = ', '.join(f'{column} = {value}' for column, value in changes.items())
+        changed = ' OR '.join(f'articles.{column} IS NOT {value}' for column, value in changes.items())
+        return (f'ON CONFLICT({target}) DO UPDATE SET {assignments}, updated_at = CURRENT_TIMESTAMP '
+                f'WHERE {changed}')
+    
+    return (f"INSERT INTO articles ({', '.join(ARTICLE_UPSERT_COLUMNS)}) "
+            f"VALUES ({', '.join(values)}) "
+            f"{on_conflict('url')} {on_conflict('guid')}")
+
+ARTICLE_UPSERT_SQL = _article_upsert_sql()
+
+class _ListUnpickler(pickle.Unpickler):
+    """Unpickler for legacy embedding rows that refuses to load any global."""
+    
+    def find_class(self, module, name):
+        raise pickle.UnpicklingError(f"Refusing to load {module}.{name} from an embedding blob")
+
 class DatabaseManager:
+    """SQLite access with reusable connections.
+    
+    Reads use one long-lived connection per thread; all writes go through a
+    single shared writer connection serialized by a lock. File databases run
+    in WAL mode so readers never block behind the writer.
+    """
+    
     def __init__(self, db_path: str = None):
         import os
         if db_path is None:
             db_path = os.environ.get('DATABASE_PATH', 'news_feed.db')
         self.db_path = db_path
+        
+        self.busy_timeout_ms = int(os.environ.get('SQLITE_BUSY_TIMEOUT', '5000'))
+        self.cache_size_kb = int(os.environ.get('SQLITE_CACHE_SIZE_KB', '20000'))
+        self.mmap_size = int(os.environ.get('SQLITE_MMAP_SIZE', str(256 * 1024 * 1024)))
+        
+        # An in-memory database only exists on the connection that created it,
+        # so readers share the writer connection instead of opening their own
+        self._in_memory = db_path == ':memory:' or db_path.startswith('file::memory:')
+        self._local = threading.local()
+        self._write_lock = threading.RLock()
+        self._writer_conn: Optional[sqlite3.Connection] = None
+        # Every thread's read connection, so close() and exited threads can release them
+        self._readers: Dict[threading.Thread, sqlite3.Connection] = {}
+        self._readers_lock = threading.Lock()
+        
         self.init_database()
     
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection with the application's PRAGMAs applied."""
+        conn = sqlite3.connect(self.db_path, timeout=self.busy_timeout_ms / 1000,
+                               check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute(f'PRAGMA busy_timeout = {self.busy_timeout_ms}')
+        if not self._in_memory:
+            conn.execute('PRAGMA journal_mode = WAL')
+        conn.execute('PRAGMA synchronous = NORMAL')
+        conn.execute(f'PRAGMA cache_size = {-self.cache_size_kb}')
+        conn.execute(f'PRAGMA mmap_size = {self.mmap_size}')
+        conn.execute('PRAGMA temp_store = MEMORY')
+        return conn
+    
+    @contextmanager
+    def _writer(self) -> Iterator[sqlite3.Connection]:
+        """Hold the shared writer connection, committing on success."""
+        with self._write_lock:
+            if self._writer_conn is None:
+                self._writer_conn = self._connect()
+            conn = self._writer_conn
+            try:
+                yield conn
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+    
+    @contextmanager
+    def _reader(self) -> Iterator[sqlite3.Connection]:
+        """Yield this thread's read connection."""
+        if self._in_memory:
+            with self._writer() as conn:
+                yield conn
+            return
+        
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._local.conn = self._connect()
+            self._register_reader(conn)
+        try:
+            yield conn
+        finally:
+            # End any implicit read transaction so the next read sees new commits
+            if conn.in_transaction:
+                conn.rollback()
+    
+    def _register_reader(self, conn: sqlite3.Connection):
+        """Record the calling thread's read connection, closing those of threads that have exited."""
+        with self._readers_lock:
+            for thread in [thread for thread in self._readers if not thread.is_alive()]:
+                self._close_connection(self._readers.pop(thread))
+            self._readers[threading.current_thread()] = conn
+    
+    @staticmethod
+    def _close_connection(conn: sqlite3.Connection):
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+    
+    def close(self):
+        """Close the writer and every thread's read connection."""
+        with self._write_lock, self._readers_lock:
+            for conn in self._readers.values():
+                self._close_connection(conn)
+            self._readers = {}
+            if self._writer_conn is not None:
+                self._close_connection(self._writer_conn)
+            self._writer_conn = None
+            self._local = threading.local()
+    
     def init_database(self):
         """Initialize database with required tables."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._writer() as conn:
             cursor = conn.cursor()
             
             # Articles table
@@ -98,6 +329,28 @@ class DatabaseManager:
                 )
             ''')
             
+            # Application metadata (embedding model, schema details)
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS app_metadata (
+                    key TEXT PRIMARY KEY,
+                    value TEXT
+                )
+            ''')
+            
+            # Cached LLM results keyed by a hash of the model input
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS llm_cache (
+                    key TEXT PRIMARY KEY,  -- SHA-256 of kind, model, prompt version and input
+                    kind TEXT NOT NULL,  -- analysis or summary
+                    model TEXT,
+                    value TEXT NOT NULL,  -- JSON-encoded result
+                    hits INTEGER DEFAULT 0,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    last_used REAL NOT NULL  -- Unix time of the last read or write
+                )
+            ''')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_llm_cache_last_used ON llm_cache (last_used)')
+            
             # Add read status column if it doesn't exist (migration)
             try:
                 cursor.execute('ALTER TABLE articles ADD COLUMN read_status BOOLEAN DEFAULT 0')
@@ -114,77 +367,383 @@ class DatabaseManager:
                 # Column already exists
                 pass
             
-            conn.commit()
+            # Add content hash column to articles table to detect changed entries (migration)
+            try:
+                cursor.execute('ALTER TABLE articles ADD COLUMN content_hash TEXT DEFAULT NULL')
+                logger.info("Added content_hash column to articles table")
+            except sqlite3.OperationalError:
+                # Column already exists
+                pass
+            
+            # Add relevance boost column so scores can be recomputed later (migration)
+            try:
+                cursor.execute('ALTER TABLE articles ADD COLUMN relevance_boost REAL DEFAULT 0.0')
+                logger.info("Added relevance_boost column to articles table")
+            except sqlite3.OperationalError:
+                # Column already exists
+                pass
+            
+            # Add near-duplicate story columns to articles table (migration)
+            for column in ('simhash', 'duplicate_of'):
+                try:
+                    cursor.execute(f'ALTER TABLE articles ADD COLUMN {column} INTEGER DEFAULT NULL')
+                    logger.info(f"Added {column} column to articles table")
+                except sqlite3.OperationalError:
+                    # Column already exists
+                    pass
+            
+            # Add conditional GET state columns to feeds table (migration)
+            for column in ('etag', 'last_modified', 'content_hash'):
+                try:
+                    cursor.execute(f'ALTER TABLE feeds ADD COLUMN {column} TEXT DEFAULT NULL')
+                    logger.info(f"Added {column} column to feeds table")
+                except sqlite3.OperationalError:
+                    # Column already exists
+                    pass
+            
+            # Add adaptive scheduling columns to feeds table (migration)
+            for column, definition in (('publish_rate', 'REAL'), ('fetch_interval', 'REAL'),
+                                       ('next_fetch_at', 'TIMESTAMP')):
+                try:
+                    cursor.execute(f'ALTER TABLE feeds ADD COLUMN {column} {definition} DEFAULT NULL')
+                    logger.info(f"Added {column} column to feeds table")
+                except sqlite3.OperationalError:
+                    # Column already exists
+                    pass
+            
+            # Add health tracking columns to feeds table (migration)
+            for column, definition in (('failure_count', 'INTEGER DEFAULT 0'), ('last_error', 'TEXT DEFAULT NULL'),
+                                       ('last_success', 'TIMESTAMP DEFAULT NULL'),
+                                       ('retry_after', 'TIMESTAMP DEFAULT NULL')):
+                try:
+                    cursor.execute(f'ALTER TABLE feeds ADD COLUMN {column} {definition}')
+                    logger.info(f"Added {column} column to feeds table")
+                except sqlite3.OperationalError:
+                    # Column already exists
+                    pass
+            
+            self._run_migrations(conn)
+            
             logger.info("Database initialized successfully")
     
+    def _run_migrations(self, conn: sqlite3.Connection):
+        """Apply versioned migrations newer than the database's user_version."""
+        migrations = [
+            (1, self._migrate_embeddings_to_float32),
+            (2, self._create_article_indexes),
+            (3, self._backfill_published),
+            (4, self._create_duplicate_index),
+            (5, self._create_search_index),
+        ]
+        
+        current = conn.execute('PRAGMA user_version').fetchone()[0]
+        for version, migration in migrations:
+            if version <= current:
+                continue
+            migration(conn)
+            conn.execute(f'PRAGMA user_version = {version}')
+            logger.info(f"Applied database migration {version}: {migration.__name__}")
+    
+    def _migrate_embeddings_to_float32(self, conn: sqlite3.Connection):
+        """Rewrite pickled embedding lists as float32 blobs."""
+        cursor = conn.execute(
+            'SELECT id, embedding FROM articles WHERE embedding IS NOT NULL AND substr(embedding, 1, 4) != ?',
+            (EMBEDDING_MAGIC,)
+        )
+        updates = []
+        for article_id, blob in cursor.fetchall():
+            try:
+                vector = _ListUnpickler(io.BytesIO(blob)).load()
+                updates.append((self._serialize_embedding(vector), article_id))
+            except Exception as e:
+                logger.warning(f"Dropping unreadable embedding for article {article_id}: {e}")
+                updates.append((None, article_id))
+        
+        conn.executemany('UPDATE articles SET embedding = ? WHERE id = ?', updates)
+        if updates:
+            logger.info(f"Converted {len(updates)} embeddings to float32 storage")
+    
+    def _create_article_indexes(self, conn: sqlite3.Connection):
+        """Create indexes matching the filter and sort shapes of get_articles.
+        
+        Every listing sorts by (relevance_score, published, id) descending after
+        optional equality filters on category and read_status, so each filter
+        combination gets an index with those equality columns first and the
+        sort key after them. That lets SQLite range-search the index and read
+        rows in order without a full scan or a temporary sort.
+        """
+        conn.execute('''
+            CREATE INDEX IF NOT EXISTS idx_articles_rank
+            ON articles (relevance_score DESC, published DESC, id DESC)
+        ''')
+        conn.execute('''
+            CREATE INDEX IF NOT EXISTS idx_articles_category_rank
+            ON articles (category, relevance_score DESC, published DESC, id DESC)
+        ''')
+        conn.execute('''
+            CREATE INDEX IF NOT EXISTS idx_articles_read_rank
+            ON articles (read_status, relevance_score DESC, published DESC, id DESC)
+        ''')
+        conn.execute('''
+            CREATE INDEX IF NOT EXISTS idx_articles_category_read_rank
+            ON articles (category, read_status, relevance_score DESC, published DESC, id DESC)
+        ''')
+    
+    def _backfill_published(self, conn: sqlite3.Connection):
+        """Give articles without a publication date their creation time.
+        
+        Keyset pagination compares (relevance_score, published, id) as a row
+        value, which never matches rows where published is NULL.
+        """
+        conn.execute('''
+            UPDATE articles
+            SET published = strftime('%Y-%m-%dT%H:%M:%S', COALESCE(created_at, CURRENT_TIMESTAMP))
+            WHERE published IS NULL
+        ''')
+        conn.execute('UPDATE articles SET relevance_score = 0.5 WHERE relevance_score IS NULL')
+    
+    def _create_duplicate_index(self, conn: sqlite3.Connection):
+        """Index duplicate articles by the story they belong to."""
+        conn.execute('''
+            CREATE INDEX IF NOT EXISTS idx_articles_duplicate_of
+            ON articles (duplicate_of) WHERE duplicate_of IS NOT NULL
+        ''')
+    
+    def _create_search_index(self, conn: sqlite3.Connection):
+        """Create the FTS5 search index over articles and the triggers keeping it in sync.
+        
+        The index is an external-content table: it stores only the inverted
+        index and reads column text back from articles for snippets. The
+        update trigger only fires when an indexed column actually changes, so
+        relevance rescoring and unchanged upserts don't touch the index.
+        """
+        columns = ', '.join(SEARCH_COLUMNS)
+        new_values = ', '.join(f'new.{column}' for column in SEARCH_COLUMNS)
+        old_values = ', '.join(f'old.{column}' for column in SEARCH_COLUMNS)
+        changed = ' OR '.join(f'old.{column} IS NOT new.{column}' for column in SEARCH_COLUMNS)
+        
+        conn.execute(f'''
+            CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+                {columns}, content='articles', content_rowid='id',
+                tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+            )
+        ''')
+        conn.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS articles_fts_insert AFTER INSERT ON articles BEGIN
+                INSERT INTO articles_fts (rowid, {columns}) VALUES (new.id, {new_values});
+            END
+        ''')
+        conn.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS articles_fts_delete AFTER DELETE ON articles BEGIN
+                INSERT INTO articles_fts (articles_fts, rowid, {columns}) VALUES ('delete', old.id, {old_values});
+            END
+        ''')
+        conn.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS articles_fts_update AFTER UPDATE OF {columns} ON articles
+            WHEN {changed} BEGIN
+                INSERT INTO articles_fts (articles_fts, rowid, {columns}) VALUES ('delete', old.id, {old_values});
+                INSERT INTO articles_fts (rowid, {columns}) VALUES (new.id, {new_values});
+            END
+        ''')
+        
+        # Rank by column-weighted BM25 and index the articles stored so far
+        weights = ', '.join(str(weight) for weight in SEARCH_COLUMNS.values())
+        conn.execute("INSERT INTO articles_fts (articles_fts, rank) VALUES ('rank', ?)", (f'bm25({weights})',))
+        conn.execute("INSERT INTO articles_fts (articles_fts) VALUES ('rebuild')")
+    
     def insert_article(self, article_data: Dict[str, Any]) -> Optional[int]:
         """Insert or update an article in the database."""
+        return self.insert_articles([article_data])['ids'][0]
+    
+    def insert_articles(self, articles: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Upsert a batch of articles in a single transaction.
+        
+        Returns ``inserted``, ``updated`` and ``skipped`` counts plus ``ids``,
+        the stored id of each input article (``None`` where it was skipped),
+        and ``error``, set when the batch could not be written at all.
+        Articles without a title or URL are skipped, as are earlier copies of
+        a URL repeated within the batch.
+        """
+        result = {'inserted': 0, 'updated': 0, 'skipped': 0, 'ids': [None] * len(articles), 'error': None}
+        
+        # The last copy of a repeated URL wins, as it would row by row
+        latest = {}
+        for position, article in enumerate(articles):
+            if article.get('title') and article.get('url'):
+                latest[article['url']] = position
+        result['skipped'] = len(articles) - len(latest)
+        if not latest:
+            return result
+        
+        urls = list(latest)
+        rows = [self._article_row(articles[latest[url]]) for url in urls]
+        
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                # Convert topics list to JSON string
-                topics_json = json.dumps(article_data.get('topics', []))
+            with self._writer() as conn:
+                last_id = conn.execute('SELECT COALESCE(MAX(id), 0) FROM articles').fetchone()[0]
                 
-                cursor.execute('''
-                    INSERT OR REPLACE INTO articles 
-                    (title, url, content, author, published, source_url, guid, 
-                     category, sentiment, importance, topics, summary, ai_summary,
-                     political_bias, bias_confidence, bias_reasoning, embedding, relevance_score)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    article_data.get('title'),
-                    article_data.get('url'),
-                    article_data.get('content'),
-                    article_data.get('author'),
-                    article_data.get('published'),
-                    article_data.get('source_url'),
-                    article_data.get('guid'),
-                    article_data.get('category'),
-                    article_data.get('sentiment'),
-                    article_data.get('importance'),
-                    topics_json,
-                    article_data.get('summary'),
-                    article_data.get('ai_summary'),
-                    article_data.get('political_bias'),
-                    article_data.get('bias_confidence', 0.0),
-                    article_data.get('bias_reasoning'),
-                    self._serialize_embedding(article_data.get('embedding')),
-                    article_data.get('relevance_score', 0.5)
-                ))
-                
-                return cursor.lastrowid
+                try:
+                    written = conn.executemany(ARTICLE_UPSERT_SQL, rows).rowcount
+                except sqlite3.IntegrityError as e:
+                    # One row clashes with a different stored article (e.g. a
+                    # reused guid); redo the batch row by row and drop just those
+                    logger.warning(f"Bulk article upsert hit a conflict, retrying row by row: {e}")
+                    conn.rollback()
+                    written = 0
+                    for row in rows:
+                        try:
+                            written += conn.execute(ARTICLE_UPSERT_SQL, row).rowcount
+                        except sqlite3.IntegrityError as e:
+                            logger.warning(f"Skipping article {row['url']}: {e}")
                 
+                ids = self._ids_by_url(conn, urls)
+        
         except Exception as e:
-            logger.error(f"Error inserting article: {e}")
-            return None
+            logger.error(f"Error inserting articles: {e}")
+            result['skipped'] = len(articles)
+            result['error'] = str(e)
+            return result
+        
+        # Ids are AUTOINCREMENT, so only newly inserted rows lie above the old maximum
+        result['inserted'] = sum(1 for article_id in ids.values() if article_id > last_id)
+        result['updated'] = written - result['inserted']
+        result['skipped'] += len(urls) - written
+        for url, position in latest.items():
+            result['ids'][position] = ids.get(url)
+        return result
+    
+    def _article_row(self, article_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the named upsert parameters for one article."""
+        return {
+            'title': article_data.get('title'),
+            'url': article_data.get('url'),
+            'content': article_data.get('content'),
+            'author': article_data.get('author'),
+            'published': article_data.get('published'),
+            'fetched_at': datetime.now().isoformat(),
+            'source_url': article_data.get('source_url'),
+            'guid': article_data.get('guid'),
+            'category': article_data.get('category'),
+            'sentiment': article_data.get('sentiment'),
+            'importance': article_data.get('importance'),
+            'topics': json.dumps(article_data['topics']) if article_data.get('topics') is not None else None,
+            'summary': article_data.get('summary'),
+            'ai_summary': article_data.get('ai_summary'),
+            'political_bias': article_data.get('political_bias'),
+            'bias_confidence': article_data.get('bias_confidence'),
+            'bias_reasoning': article_data.get('bias_reasoning'),
+            'embedding': self._serialize_embedding(article_data.get('embedding')),
+            'relevance_score': article_data.get('relevance_score'),
+            'relevance_boost': article_data.get('relevance_boost'),
+            'content_hash': article_data.get('content_hash'),
+            'simhash': article_data.get('simhash'),
+            'duplicate_of': article_data.get('duplicate_of'),
+        }
+    
+    @staticmethod
+    def _select_in(conn: sqlite3.Connection, sql: str, values) -> List[sqlite3.Row]:
+        """Run ``sql`` over ``values`` in chunks and return every row.
+        
+        ``sql`` holds one ``{}`` where the IN list's placeholders go.
+        """
+        values = list(values)
+        rows = []
+        for start in range(0, len(values), SELECT_IN_CHUNK_SIZE):
+            chunk = values[start:start + SELECT_IN_CHUNK_SIZE]
+            rows.extend(conn.execute(sql.format(','.join('?' * len(chunk))), chunk).fetchall())
+        return rows
+    
+    def _ids_by_url(self, conn: sqlite3.Connection, urls: List[str]) -> Dict[str, int]:
+        """Map each stored URL among ``urls`` to its article id."""
+        rows = self._select_in(conn, 'SELECT id, url FROM articles WHERE url IN ({})', urls)
+        return {row['url']: row['id'] for row in rows}
+    
+    def _articles_query(self, category: Optional[str] = None,
+                        min_relevance: float = 0.0,
+                        read_status: Optional[bool] = None,
+                        after: Optional[tuple] = None,
+                        fields: Optional[List[str]] = None,
+                        collapse: bool = False):
+        """Build the filtered, ranked article listing query and its parameters.
+        
+        ``after`` is a ``(relevance_score, published, id)`` keyset cursor; only
+        articles ranked below it are returned. ``fields`` limits the selected
+        columns to names from ARTICLE_FIELDS (all columns when None). With
+        ``collapse``, near-duplicates are left out and only the first article
+        of each story is listed. The WHERE and ORDER BY shapes here are the
+        ones the article indexes are designed for; keep them in step with
+        _create_article_indexes.
+        """
+        # The keyset columns are always needed to build the next cursor
+        columns = self._article_columns(fields, ['id', 'relevance_score', 'published'])
+        filters, params = self._article_filters(category, min_relevance, read_status, collapse)
+        
+        query = f'''
+            SELECT {columns} FROM articles 
+            WHERE {filters}
+        '''
+        
+        if after is not None:
+            query += ' AND (relevance_score, published, id) < (?, ?, ?)'
+            params.extend(after)
+        
+        query += ' ORDER BY relevance_score DESC, published DESC, id DESC LIMIT ? OFFSET ?'
+        return query, params
+    
+    @staticmethod
+    def _article_columns(fields: Optional[List[str]], required: List[str]) -> str:
+        """SELECT list for ``fields`` from ARTICLE_FIELDS plus ``required`` (every column when None)."""
+        if fields is None:
+            return 'articles.*'
+        selected = list(dict.fromkeys(list(fields) + required))
+        return ', '.join(ARTICLE_FIELDS[field] for field in selected)
+    
+    @staticmethod
+    def _article_filters(category: Optional[str], min_relevance: float,
+                         read_status: Optional[bool], collapse: bool):
+        """WHERE conditions and parameters shared by article listings and search."""
+        conditions = ['relevance_score >= ?']
+        params = [min_relevance]
+        
+        if category:
+            conditions.append('category = ?')
+            params.append(category)
+        
+        if read_status is not None:
+            conditions.append('read_status = ?')
+            params.append(1 if read_status else 0)
+        
+        if collapse:
+            conditions.append('duplicate_of IS NULL')
+        
+        return ' AND '.join(conditions), params
     
     def get_articles(self, limit: int = 50, offset: int = 0, 
                     category: Optional[str] = None,
                     min_relevance: float = 0.0,
-                    read_status: Optional[bool] = None) -> List[Dict[str, Any]]:
-        """Get articles from database with filtering and pagination."""
+                    read_status: Optional[bool] = None,
+                    after: Optional[tuple] = None,
+                    fields: Optional[List[str]] = None,
+                    collapse: bool = False) -> List[Dict[str, Any]]:
+        """Get articles from database with filtering and pagination.
+        
+        Pages can be addressed by ``offset`` or, at constant cost however deep
+        the page, by an ``after`` keyset taken from the previous page's last
+        article (see article_cursor). ``offset`` is ignored when ``after`` is given.
+        Pass ``fields`` (e.g. ARTICLE_CARD_FIELDS) to read only those columns;
+        unselected columns such as the embedding are never read or decoded.
+        ``collapse`` lists one article per near-duplicate story.
+        """
+        unknown = set(fields or []) - set(ARTICLE_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown article fields: {', '.join(sorted(unknown))}")
+        
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
+            with self._reader() as conn:
                 cursor = conn.cursor()
                 
-                query = '''
-                    SELECT * FROM articles 
-                    WHERE relevance_score >= ?
-                '''
-                params = [min_relevance]
-                
-                if category:
-                    query += ' AND category = ?'
-                    params.append(category)
-                
-                if read_status is not None:
-                    query += ' AND read_status = ?'
-                    params.append(1 if read_status else 0)
-                
-                query += ' ORDER BY relevance_score DESC, published DESC LIMIT ? OFFSET ?'
-                params.extend([limit, offset])
+                query, params = self._articles_query(category, min_relevance, read_status, after, fields, collapse)
+                params.extend([limit, 0 if after is not None else offset])
                 
                 cursor.execute(query, params)
                 rows = cursor.fetchall()
@@ -192,8 +751,10 @@ class DatabaseManager:
                 articles = []
                 for row in rows:
                     article = dict(row)
-                    article['topics'] = json.loads(article.get('topics') or '[]')
-                    article['embedding'] = self._deserialize_embedding(article.get('embedding'))
+                    if 'topics' in article:
+                        article['topics'] = json.loads(article['topics'] or '[]')
+                    if 'embedding' in article:
+                        article['embedding'] = self._deserialize_embedding(article['embedding'])
                     articles.append(article)
                 
                 return articles
@@ -202,16 +763,118 @@ class DatabaseManager:
             logger.error(f"Error getting articles: {e}")
             return []
     
+    @staticmethod
+    def article_cursor(article: Dict[str, Any]) -> tuple:
+        """Keyset position of an article in the ranked listing."""
+        return (article['relevance_score'], article['published'], article['id'])
+    
+    def search_articles(self, query: str, limit: int = 20,
+                        category: Optional[str] = None,
+                        min_relevance: float = 0.0,
+                        read_status: Optional[bool] = None,
+                        after: Optional[tuple] = None,
+                        fields: Optional[List[str]] = None,
+                        collapse: bool = False) -> List[Dict[str, Any]]:
+        """Full-text search articles, best BM25 match first.
+        
+        ``query`` is user text (see search_match_query). Filters, ``fields``
+        and ``collapse`` work as in get_articles; ``after`` is the
+        ``(search_rank, id)`` keyset of the previous page's last result (see
+        search_cursor). Each result carries ``search_rank`` (lower is better)
+        and a ``search_snippet`` with matched terms wrapped in SEARCH_HIGHLIGHT.
+        Snippets are only built for the returned page.
+        """
+        unknown = set(fields or []) - set(ARTICLE_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown article fields: {', '.join(sorted(unknown))}")
+        match = search_match_query(query)
+        if match is None:
+            return []
+        
+        columns = self._article_columns(fields, ['id'])
+        filters, params = self._article_filters(category, min_relevance, read_status, collapse)
+        sql = f'''
+            SELECT {columns}, matches.search_rank
+            FROM (SELECT rowid AS match_id, rank AS search_rank
+                  FROM articles_fts WHERE articles_fts MATCH ?) AS matches
+            JOIN articles ON articles.id = matches.match_id
+            WHERE {filters}
+        '''
+        params.insert(0, match)
+        if after is not None:
+            sql += ' AND (matches.search_rank, articles.id) > (?, ?)'
+            params.extend(after)
+        sql += ' ORDER BY matches.search_rank, articles.id LIMIT ?'
+        params.append(limit)
+        
+        try:
+            with self._reader() as conn:
+                rows = conn.execute(sql, params).fetchall()
+                articles = []
+                for row in rows:
+                    article = dict(row)
+                    if 'topics' in article:
+                        article['topics'] = json.loads(article['topics'] or '[]')
+                    if 'embedding' in article:
+                        article['embedding'] = self._deserialize_embedding(article['embedding'])
+                    articles.append(article)
+                
+                if articles:
+                    placeholders = ', '.join('?' for _ in articles)
+                    snippets = dict(conn.execute(f'''
+                        SELECT rowid, snippet(articles_fts, -1, ?, ?, '…', 24)
+                        FROM articles_fts WHERE articles_fts MATCH ? AND rowid IN ({placeholders})
+                    ''', [*SEARCH_HIGHLIGHT, match] + [article['id'] for article in articles]).fetchall())
+                    for article in articles:
+                        article['search_snippet'] = snippets.get(article['id'])
+                
+                return articles
+                
+        except Exception as e:
+            logger.error(f"Error searching articles: {e}")
+            return []
+    
+    @staticmethod
+    def search_cursor(article: Dict[str, Any]) -> tuple:
+        """Keyset position of an article in search results."""
+        return (article['search_rank'], article['id'])
+    
+    def get_known_articles(self, urls: List[str], guids: List[str]) -> List[Dict[str, Any]]:
+        """Look up stored articles matching any of the given URLs or GUIDs.
+        
+        Returns the id, url, guid and content_hash of each match, plus
+        ``analyzed``, false while the article has no analysis or only the
+        fallback one. Lookups are batched so a whole feed costs a query per
+        chunk of URLs and of GUIDs.
+        """
+        urls = [url for url in set(urls) if url]
+        guids = [guid for guid in set(guids) if guid]
+        if not urls and not guids:
+            return []
+        
+        try:
+            with self._reader() as conn:
+                columns = (f"id, url, guid, content_hash, "
+                           f"COALESCE(category != '{FALLBACK_CATEGORY}', 0) AS analyzed")
+                rows = (self._select_in(conn, f'SELECT {columns} FROM articles WHERE url IN ({{}})', urls) +
+                        self._select_in(conn, f'SELECT {columns} FROM articles WHERE guid IN ({{}})', guids))
+                
+                known = {row['id']: dict(row) for row in rows}
+                return list(known.values())
+                
+        except Exception as e:
+            logger.error(f"Error looking up known articles: {e}")
+            return []
+    
     def record_user_interaction(self, article_id: int, action: str, value: float = 1.0):
         """Record user interaction with an article."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._writer() as conn:
                 cursor = conn.cursor()
                 cursor.execute('''
                     INSERT INTO user_interactions (article_id, action, value)
                     VALUES (?, ?, ?)
                 ''', (article_id, action, value))
-                conn.commit()
                 
         except Exception as e:
             logger.error(f"Error recording interaction: {e}")
@@ -219,22 +882,71 @@ class DatabaseManager:
     def update_article_ai_summary(self, article_id: int, ai_summary: str):
         """Update an article with AI-generated summary."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._writer() as conn:
                 cursor = conn.cursor()
                 cursor.execute('''
                     UPDATE articles SET ai_summary = ?, updated_at = CURRENT_TIMESTAMP
                     WHERE id = ?
                 ''', (ai_summary, article_id))
-                conn.commit()
                 
         except Exception as e:
             logger.error(f"Error updating AI summary: {e}")
     
+    def get_story_hashes(self, window: float) -> List[tuple]:
+        """Get ``(id, simhash, created_epoch)`` for story representatives stored in the last ``window`` seconds."""
+        try:
+            with self._reader() as conn:
+                cursor = conn.cursor()
+                cursor.execute('''
+                    SELECT id, simhash, CAST(strftime('%s', created_at) AS INTEGER)
+                    FROM articles
+                    WHERE simhash IS NOT NULL AND duplicate_of IS NULL
+                      AND created_at >= datetime(CURRENT_TIMESTAMP, ?)
+                ''', (f'-{int(window)} seconds',))
+                return [tuple(row) for row in cursor.fetchall()]
+                
+        except Exception as e:
+            logger.error(f"Error getting story hashes: {e}")
+            return []
+    
+    def set_duplicates(self, pairs) -> int:
+        """Point each ``(article_id, story_id)`` article at the story it duplicates."""
+        try:
+            with self._writer() as conn:
+                cursor = conn.executemany(
+                    'UPDATE articles SET duplicate_of = ? WHERE id = ? AND id != ?',
+                    [(story_id, article_id, story_id) for article_id, story_id in pairs]
+                )
+                return cursor.rowcount
+                
+        except Exception as e:
+            logger.error(f"Error marking duplicate articles: {e}")
+            return 0
+    
+    def get_article_analyses(self, article_ids) -> Dict[int, Dict[str, Any]]:
+        """Map each stored id among ``article_ids`` to its AI analysis columns."""
+        analyses = {}
+        try:
+            with self._reader() as conn:
+                rows = self._select_in(
+                    conn,
+                    f"SELECT id, {', '.join(ARTICLE_ANALYSIS_COLUMNS)} FROM articles WHERE id IN ({{}})",
+                    article_ids
+                )
+            for row in rows:
+                analysis = dict(row)
+                analysis['topics'] = json.loads(analysis['topics'] or '[]')
+                analyses[analysis.pop('id')] = analysis
+            return analyses
+        
+        except Exception as e:
+            logger.error(f"Error getting article analyses: {e}")
+            return {}
+    
     def get_article_by_id(self, article_id: int) -> Optional[Dict[str, Any]]:
         """Get a single article by ID."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
+            with self._reader() as conn:
                 cursor = conn.cursor()
                 cursor.execute('SELECT * FROM articles WHERE id = ?', (article_id,))
                 row = cursor.fetchone()
@@ -253,7 +965,7 @@ class DatabaseManager:
     def insert_feed(self, feed_data: Dict[str, Any]) -> Optional[int]:
         """Insert a new RSS feed."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._writer() as conn:
                 cursor = conn.cursor()
                 cursor.execute('''
                     INSERT OR REPLACE INTO feeds 
@@ -274,13 +986,124 @@ class DatabaseManager:
             logger.error(f"Error inserting feed: {e}")
             return None
     
-    def get_active_feeds(self) -> List[Dict[str, Any]]:
-        """Get all active RSS feeds."""
+    def get_active_feeds(self, ready_only: bool = False) -> List[Dict[str, Any]]:
+        """Get all active RSS feeds.
+        
+        With ``ready_only``, feeds still backing off after a failed fetch are left out.
+        """
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
+            with self._reader() as conn:
                 cursor = conn.cursor()
-                cursor.execute('SELECT * FROM feeds WHERE active = 1')
+                query = 'SELECT * FROM feeds WHERE active = 1'
+                if ready_only:
+                    query += ' AND (retry_after IS NULL OR retry_after <= CURRENT_TIMESTAMP)'
+                cursor.execute(query)
+                return [dict(row) for row in cursor.fetchall()]
+                
+        except Exception as e:
+            logger.error(f"Error getting feeds: {e}")
+            return []
+    
+    def update_feed_fetch_state(self, feed_id: int, etag: Optional[str],
+                                last_modified: Optional[str],
+                                content_hash: Optional[str]) -> bool:
+        """Store a feed's HTTP validators and body hash after a successful fetch.
+        
+        Also clears the feed's failure count, error and backoff.
+        """
+        try:
+            with self._writer() as conn:
+                cursor = conn.cursor()
+                cursor.execute('''
+                    UPDATE feeds
+                    SET etag = ?, last_modified = ?, content_hash = ?,
+                        last_fetched = CURRENT_TIMESTAMP, last_success = CURRENT_TIMESTAMP,
+                        failure_count = 0, last_error = NULL, retry_after = NULL
+                    WHERE id = ?
+                ''', (etag, last_modified, content_hash, feed_id))
+                return cursor.rowcount > 0
+                
+        except Exception as e:
+            logger.error(f"Error updating feed fetch state: {e}")
+            return False
+    
+    def get_due_feeds(self, limit: int) -> List[Dict[str, Any]]:
+        """Get up to ``limit`` active feeds whose next scheduled fetch has passed.
+        
+        Feeds that were never scheduled come first, then the most overdue.
+        """
+        try:
+            with self._reader() as conn:
+                cursor = conn.cursor()
+                cursor.execute('''
+                    SELECT * FROM feeds
+                    WHERE active = 1 AND (next_fetch_at IS NULL OR next_fetch_at <= CURRENT_TIMESTAMP)
+                      AND (retry_after IS NULL OR retry_after <= CURRENT_TIMESTAMP)
+                    ORDER BY next_fetch_at IS NOT NULL, next_fetch_at
+                    LIMIT ?
+                ''', (limit,))
+                return [dict(row) for row in cursor.fetchall()]
+        
+        except Exception as e:
+            logger.error(f"Error getting due feeds: {e}")
+            return []
+    
+    def update_feed_schedule(self, feed_id: int, publish_rate: Optional[float],
+                             fetch_interval: float, delay: float) -> bool:
+        """Store a feed's polling state and schedule its next fetch ``delay`` seconds from now."""
+        try:
+            with self._writer() as conn:
+                cursor = conn.cursor()
+                cursor.execute('''
+                    UPDATE feeds
+                    SET publish_rate = ?, fetch_interval = ?,
+                        next_fetch_at = datetime(CURRENT_TIMESTAMP, ?)
+                    WHERE id = ?
+                ''', (publish_rate, fetch_interval, f'{int(delay):+d} seconds', feed_id))
+                return cursor.rowcount > 0
+        
+        except Exception as e:
+            logger.error(f"Error updating feed schedule: {e}")
+            return False
+    
+    def record_feed_failure(self, feed_id: int, error: str, retry_delay: float,
+                            max_failures: int) -> int:
+        """Record a failed fetch and hold the feed back for ``retry_delay`` seconds.
+        
+        The feed is deactivated once it has failed ``max_failures`` times in a
+        row. Returns the new consecutive failure count.
+        """
+        try:
+            with self._writer() as conn:
+                cursor = conn.cursor()
+                cursor.execute('''
+                    UPDATE feeds
+                    SET failure_count = COALESCE(failure_count, 0) + 1, last_error = ?,
+                        last_fetched = CURRENT_TIMESTAMP,
+                        retry_after = datetime(CURRENT_TIMESTAMP, ?),
+                        next_fetch_at = datetime(CURRENT_TIMESTAMP, ?)
+                    WHERE id = ?
+                ''', (error, f'{int(retry_delay):+d} seconds', f'{int(retry_delay):+d} seconds', feed_id))
+                cursor.execute('''
+                    UPDATE feeds SET active = 0
+                    WHERE id = ? AND failure_count >= ?
+                ''', (feed_id, max_failures))
+                if cursor.rowcount:
+                    logger.warning(f"Deactivated feed {feed_id} after {max_failures} consecutive failures")
+                
+                row = cursor.execute('SELECT failure_count FROM feeds WHERE id = ?', (feed_id,)).fetchone()
+                return row[0] if row else 0
+                
+        except Exception as e:
+            logger.error(f"Error recording feed failure: {e}")
+            return 0
+    
+    def get_all_feeds(self) -> List[Dict[str, Any]]:
+        """Get every RSS feed, including deactivated ones."""
+        try:
+            with self._reader() as conn:
+                cursor = conn.cursor()
+                cursor.execute('SELECT * FROM feeds ORDER BY active DESC, id')
                 return [dict(row) for row in cursor.fetchall()]
                 
         except Exception as e:
@@ -290,7 +1113,7 @@ class DatabaseManager:
     def delete_feed(self, feed_id: int) -> bool:
         """Delete an RSS feed."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._writer() as conn:
                 cursor = conn.cursor()
                 cursor.execute('DELETE FROM feeds WHERE id = ?', (feed_id,))
                 return cursor.rowcount > 0
@@ -299,31 +1122,143 @@ class DatabaseManager:
             logger.error(f"Error deleting feed: {e}")
             return False
     
-    def _serialize_embedding(self, embedding: Optional[List[float]]) -> Optional[bytes]:
-        """Serialize embedding vector to bytes."""
+    def get_article_embeddings(self, dim: int):
+        """Load every stored embedding of the given size as one float32 matrix.
+        
+        Returns ``(ids, embeddings, relevance_boosts)`` arrays. Blobs are
+        concatenated and reinterpreted in one step rather than decoded row
+        by row.
+        """
+        blob_size = EMBEDDING_HEADER.size + dim * 4
+        try:
+            with self._reader() as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    'SELECT id, embedding, relevance_boost FROM articles WHERE length(embedding) = ?',
+                    (blob_size,)
+                )
+                rows = cursor.fetchall()
+            
+            ids = np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows))
+            boosts = np.fromiter((row[2] or 0.0 for row in rows), dtype=np.float32, count=len(rows))
+            raw = np.frombuffer(b''.join(row[1] for row in rows), dtype=np.uint8)
+            embeddings = raw.reshape(len(rows), blob_size)[:, EMBEDDING_HEADER.size:]
+            embeddings = np.ascontiguousarray(embeddings).view('<f4').reshape(len(rows), dim)
+            return ids, embeddings, boosts
+            
+        except Exception as e:
+            logger.error(f"Error loading article embeddings: {e}")
+            return (np.empty(0, dtype=np.int64), np.empty((0, dim), dtype=np.float32),
+                    np.empty(0, dtype=np.float32))
+    
+    def get_articles_missing_embeddings(self, limit: int, after_id: int = 0) -> List[Dict[str, Any]]:
+        """Get up to ``limit`` articles without an embedding, in id order after ``after_id``."""
+        try:
+            with self._reader() as conn:
+                cursor = conn.cursor()
+                cursor.execute('''
+                    SELECT id, title, COALESCE(content, '') AS content FROM articles
+                    WHERE embedding IS NULL AND id > ?
+                    ORDER BY id
+                    LIMIT ?
+                ''', (after_id, limit))
+                return [dict(row) for row in cursor.fetchall()]
+        
+        except Exception as e:
+            logger.error(f"Error getting articles without embeddings: {e}")
+            return []
+    
+    def update_article_embeddings(self, embeddings: List[tuple]) -> int:
+        """Write ``(article_id, embedding)`` pairs in one transaction."""
+        try:
+            with self._writer() as conn:
+                cursor = conn.cursor()
+                cursor.executemany(
+                    'UPDATE articles SET embedding = ? WHERE id = ?',
+                    [(self._serialize_embedding(embedding), int(article_id))
+                     for article_id, embedding in embeddings]
+                )
+                return cursor.rowcount
+        
+        except Exception as e:
+            logger.error(f"Error updating article embeddings: {e}")
+            return 0
+    
+    def update_relevance_scores(self, scores: List[tuple]) -> int:
+        """Write ``(article_id, relevance_score)`` pairs in one transaction."""
+        try:
+            with self._writer() as conn:
+                cursor = conn.cursor()
+                cursor.executemany(
+                    'UPDATE articles SET relevance_score = ? WHERE id = ? AND relevance_score IS NOT ?',
+                    [(float(score), int(article_id), float(score)) for article_id, score in scores]
+                )
+                return cursor.rowcount
+                
+        except Exception as e:
+            logger.error(f"Error updating relevance scores: {e}")
+            return 0
+    
+    def ensure_embedding_model(self, model: str, dim: int) -> bool:
+        """Record the embedding model and dimensionality used for stored vectors.
+        
+        If the database holds embeddings from a different model or size they
+        can't be compared with new ones, so they are cleared for the caller
+        to re-embed. Returns True when stored embeddings were invalidated.
+        """
+        try:
+            with self._writer() as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    "SELECT key, value FROM app_metadata WHERE key IN ('embedding_model', 'embedding_dim')"
+                )
+                stored = dict(cursor.fetchall())
+                
+                changed = bool(stored) and (stored.get('embedding_model') != model or
+                                            stored.get('embedding_dim') != str(dim))
+                if changed or not stored:
+                    # Embeddings predating the metadata came from the MD5 placeholder
+                    cursor.execute('UPDATE articles SET embedding = NULL WHERE embedding IS NOT NULL')
+                    if cursor.rowcount:
+                        logger.info(f"Cleared {cursor.rowcount} embeddings from a previous embedding model")
+                        changed = True
+                    cursor.executemany(
+                        'INSERT OR REPLACE INTO app_metadata (key, value) VALUES (?, ?)',
+                        [('embedding_model', model), ('embedding_dim', str(dim))]
+                    )
+                return changed
+                
+        except Exception as e:
+            logger.error(f"Error recording embedding model: {e}")
+            return False
+    
+    def _serialize_embedding(self, embedding) -> Optional[bytes]:
+        """Serialize an embedding vector to a float32 blob with a small header."""
         if embedding is None:
             return None
         try:
-            import pickle
-            return pickle.dumps(embedding)
+            vector = np.asarray(embedding, dtype='<f4').ravel()
+            header = EMBEDDING_HEADER.pack(EMBEDDING_MAGIC, EMBEDDING_FORMAT_VERSION, vector.size)
+            return header + vector.tobytes()
         except Exception:
             return None
     
-    def _deserialize_embedding(self, embedding_bytes: Optional[bytes]) -> Optional[List[float]]:
-        """Deserialize embedding vector from bytes."""
-        if embedding_bytes is None:
+    def _deserialize_embedding(self, embedding_bytes: Optional[bytes]) -> Optional[np.ndarray]:
+        """Decode an embedding blob into a read-only float32 array without copying."""
+        if embedding_bytes is None or len(embedding_bytes) < EMBEDDING_HEADER.size:
             return None
         try:
-            import pickle
-            return pickle.loads(embedding_bytes)
+            magic, version, dim = EMBEDDING_HEADER.unpack_from(embedding_bytes)
+            if magic != EMBEDDING_MAGIC or version != EMBEDDING_FORMAT_VERSION:
+                return None
+            return np.frombuffer(embedding_bytes, dtype='<f4', count=dim, offset=EMBEDDING_HEADER.size)
         except Exception:
             return None
     
     def get_category_preferences(self) -> List[Dict[str, Any]]:
         """Get all category preferences."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
+            with self._reader() as conn:
                 cursor = conn.cursor()
                 cursor.execute('SELECT * FROM category_preferences WHERE active = 1')
                 prefs = []
@@ -339,14 +1274,13 @@ class DatabaseManager:
     def upsert_category_preference(self, category: str, keywords: List[str], priority: float = 1.0) -> bool:
         """Insert or update category preference."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._writer() as conn:
                 cursor = conn.cursor()
                 cursor.execute('''
                     INSERT OR REPLACE INTO category_preferences 
                     (category, keywords, priority, active)
                     VALUES (?, ?, ?, 1)
                 ''', (category, json.dumps(keywords), priority))
-                conn.commit()
                 return True
         except Exception as e:
             logger.error(f"Error saving category preference: {e}")
@@ -355,10 +1289,9 @@ class DatabaseManager:
     def delete_category_preference(self, category: str) -> bool:
         """Delete a category preference."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._writer() as conn:
                 cursor = conn.cursor()
                 cursor.execute('DELETE FROM category_preferences WHERE category = ?', (category,))
-                conn.commit()
                 return cursor.rowcount > 0
         except Exception as e:
             logger.error(f"Error deleting category preference: {e}")
@@ -367,7 +1300,7 @@ class DatabaseManager:
     def mark_article_read(self, article_id: int) -> bool:
         """Mark an article as read."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._writer() as conn:
                 cursor = conn.cursor()
                 
                 # Update read status
@@ -384,7 +1317,6 @@ class DatabaseManager:
                         (article_id, 'read', 1.0)
                     )
                 
-                conn.commit()
                 return update_count > 0
                 
         except Exception as e:
@@ -394,7 +1326,7 @@ class DatabaseManager:
     def mark_article_unread(self, article_id: int) -> bool:
         """Mark an article as unread."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._writer() as conn:
                 cursor = conn.cursor()
                 
                 # Update read status
@@ -403,17 +1335,78 @@ class DatabaseManager:
                     (article_id,)
                 )
                 
-                conn.commit()
                 return cursor.rowcount > 0
                 
         except Exception as e:
             logger.error(f"Error marking article as unread: {e}")
             return False
 
+    def get_llm_results(self, keys: List[str]) -> Dict[str, str]:
+        """Get cached LLM results by key; keys without an entry are left out."""
+        try:
+            with self._reader() as conn:
+                rows = self._select_in(conn, 'SELECT key, value FROM llm_cache WHERE key IN ({})', keys)
+            return {row['key']: row['value'] for row in rows}
+            
+        except Exception as e:
+            logger.error(f"Error reading LLM cache: {e}")
+            return {}
+    
+    def store_llm_results(self, entries: List[tuple], max_entries: int, hits: List[tuple] = ()) -> int:
+        """Cache ``(key, kind, model, value)`` LLM results and record ``(key, count, last_used)`` hits.
+        
+        Hits are applied first so that least recently used entries beyond
+        ``max_entries``, evicted in the same transaction, reflect recent reads.
+        Returns the number of evicted entries.
+        """
+        if not entries and not hits:
+            return 0
+        try:
+            with self._writer() as conn:
+                conn.executemany(
+                    'UPDATE llm_cache SET hits = hits + ?, last_used = MAX(last_used, ?) WHERE key = ?',
+                    [(count, last_used, key) for key, count, last_used in hits]
+                )
+                if not entries:
+                    return 0
+                
+                now = time.time()
+                conn.executemany('''
+                    INSERT INTO llm_cache (key, kind, model, value, last_used)
+                    VALUES (?, ?, ?, ?, ?)
+                    ON CONFLICT(key) DO UPDATE SET value = excluded.value, last_used = excluded.last_used
+                ''', [(key, kind, model, value, now) for key, kind, model, value in entries])
+                cursor = conn.execute('''
+                    DELETE FROM llm_cache WHERE key IN (
+                        SELECT key FROM llm_cache ORDER BY last_used DESC LIMIT -1 OFFSET ?
+                    )
+                ''', (max(0, max_entries),))
+                return cursor.rowcount
+                
+        except Exception as e:
+            logger.error(f"Error writing LLM cache: {e}")
+            return 0
+    
+    def get_llm_cache_stats(self) -> Dict[str, Any]:
+        """Get the number, size and lifetime hits of cached LLM results by kind."""
+        try:
+            with self._reader() as conn:
+                cursor = conn.cursor()
+                cursor.execute('''
+                    SELECT kind, COUNT(*), SUM(LENGTH(value)), SUM(hits)
+                    FROM llm_cache GROUP BY kind
+                ''')
+                return {row[0]: {"entries": row[1], "bytes": row[2] or 0, "hits": row[3] or 0}
+                        for row in cursor.fetchall()}
+                
+        except Exception as e:
+            logger.error(f"Error getting LLM cache stats: {e}")
+            return {}
+    
     def get_read_count(self) -> Dict[str, int]:
         """Get count of read vs unread articles."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._reader() as conn:
                 cursor = conn.cursor()
                 
                 cursor.execute('''
@@ -0,0 +1,163 @@
+"""
+Background feed refresh jobs with progress reporting.
+"""
+import asyncio
+import logging
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Per-stage counters reported while a refresh runs
+PROGRESS_FIELDS = [
+    'feeds_total', 'feeds_fetched', 'feeds_failed', 'articles_found', 'articles_new',
+    'articles_duplicate', 'articles_analyzed', 'articles_inserted', 'articles_updated',
+    'articles_skipped',
+]
+
+class RefreshJob:
+    """State and progress of one refresh run.
+
+    ``scope`` is ``all`` for a pass over every active feed or ``due`` for
+    one over the feeds the scheduler found due.
+    """
+
+    def __init__(self, scope: str = 'all'):
+        self.id = uuid.uuid4().hex
+        self.scope = scope
+        self.status = 'pending'
+        self.progress = {field: 0 for field in PROGRESS_FIELDS}
+        self.error: Optional[str] = None
+        self.created_at = datetime.now().isoformat()
+        self.started_at: Optional[str] = None
+        self.finished_at: Optional[str] = None
+
+    @property
+    def done(self) -> bool:
+        return self.status in ('completed', 'failed')
+
+    def advance(self, **counts: int):
+        """Add to the job's progress counters."""
+        for field, count in counts.items():
+            self.progress[field] += count
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the job for the API."""
+        return {
+            'job_id': self.id,
+            'scope': self.scope,
+            'status': self.status,
+            'progress': dict(self.progress),
+            'error': self.error,
+            'created_at': self.created_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+        }
+
+class RefreshManager:
+    """Run at most one refresh at a time as a background task.
+
+    Starting a refresh while one is running returns the running job, so
+    concurrent callers share a single pass over the feeds. A full refresh
+    requested while a partial one runs is queued (status ``queued``) and
+    starts once the running job finishes. Finished jobs are kept for polling
+    until ``history`` newer ones have been started.
+    """
+
+    def __init__(self, history: int = 20):
+        self.history = history
+        self._jobs: 'OrderedDict[str, RefreshJob]' = OrderedDict()
+        self._current: Optional[RefreshJob] = None
+        self._task: Optional[asyncio.Task] = None
+        self._queued: Optional[Tuple[RefreshJob, Callable[[RefreshJob], Awaitable[Any]]]] = None
+
+    @property
+    def current(self) -> Optional[RefreshJob]:
+        """The running job, if any."""
+        if self._current is not None and not self._current.done:
+            return self._current
+        return None
+
+    def start(self, run: Callable[[RefreshJob], Awaitable[Any]],
+              scope: str = 'all') -> Tuple[RefreshJob, bool]:
+        """Start ``run(job)`` in the background unless a refresh covering ``scope`` is already running.
+
+        A full refresh requested while a partial one runs is queued behind it.
+        Returns the job and whether it was newly started or queued (False
+        when joining an existing job).
+        """
+        running = self.current
+        if running is not None:
+            if running.scope == 'all' or scope == running.scope:
+                return running, False
+            if self._queued is not None:
+                return self._queued[0], False
+
+            job = self._add_job(scope)
+            job.status = 'queued'
+            self._queued = (job, run)
+            logger.info(f"Refresh job {job.id} queued behind {running.scope} refresh {running.id}")
+            return job, True
+
+        job = self._add_job(scope)
+        self._launch(job, run)
+        return job, True
+
+    def _add_job(self, scope: str) -> RefreshJob:
+        job = RefreshJob(scope)
+        self._jobs[job.id] = job
+        while len(self._jobs) > self.history:
+            self._jobs.popitem(last=False)
+        return job
+
+    def _launch(self, job: RefreshJob, run: Callable[[RefreshJob], Awaitable[Any]]):
+        self._current = job
+        self._task = asyncio.get_running_loop().create_task(self._run(job, run), name=f"refresh-{job.id}")
+
+    def get(self, job_id: str) -> Optional[RefreshJob]:
+        """Look up a job by id."""
+        return self._jobs.get(job_id)
+
+    async def wait(self, job: RefreshJob) -> RefreshJob:
+        """Wait for a job started or queued by this manager to finish."""
+        while not job.done and self._task is not None and (
+                job is self._current or (self._queued is not None and job is self._queued[0])):
+            await asyncio.shield(self._task)
+        return job
+
+    async def stop(self):
+        """Cancel the running refresh and any queued one."""
+        if self._queued is not None:
+            queued, _ = self._queued
+            self._queued = None
+            queued.status = 'failed'
+            queued.error = 'cancelled'
+            queued.finished_at = datetime.now().isoformat()
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+
+    async def _run(self, job: RefreshJob, run: Callable[[RefreshJob], Awaitable[Any]]):
+        job.status = 'running'
+        job.started_at = datetime.now().isoformat()
+        logger.info(f"Refresh job {job.id} started")
+        try:
+            await run(job)
+            job.status = 'completed'
+        except asyncio.CancelledError:
+            job.status = 'failed'
+            job.error = 'cancelled'
+            raise
+        except Exception as e:
+            logger.error(f"Refresh job {job.id} failed: {e}")
+            job.status = 'failed'
+            job.error = str(e)
+        finally:
+            job.finished_at = datetime.now().isoformat()
+            logger.info(f"Refresh job {job.id} {job.status}: {job.progress}")
+            if self._queued is not None:
+                queued, queued_run = self._queued
+                self._queued = None
+                self._launch(queued, queued_run)
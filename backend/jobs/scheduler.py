@@ -0,0 +1,142 @@
+"""
+Periodic feed scheduling with per-feed adaptive polling intervals.
+"""
+import asyncio
+import os
+import random
+import logging
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+class FeedScheduler:
+    """Decide when each feed is next fetched and periodically refresh the due ones.
+
+    Every feed keeps a smoothed publish rate (new articles per hour) updated
+    after each fetch. Its polling interval aims at roughly one new article
+    per fetch, clamped between ``min_interval`` and ``max_interval`` seconds
+    and jittered so feeds drift apart instead of coming due together. Every
+    ``tick`` seconds at most ``budget`` due feeds are refreshed, which caps
+    fetch and LLM load no matter how many feeds fall due at once.
+
+    Feeds that fail to fetch back off exponentially and are deactivated
+    after ``max_failures`` consecutive failures.
+    """
+
+    # Weight of the newest observation in the smoothed publish rate
+    RATE_SMOOTHING = 0.3
+
+    def __init__(self, enabled: bool = None, min_interval: float = None, max_interval: float = None,
+                 default_interval: float = None, tick: float = None, budget: int = None,
+                 jitter: float = None, backoff_base: float = None, backoff_max: float = None,
+                 max_failures: int = None):
+        if enabled is None:
+            enabled = os.environ.get('FEED_SCHEDULER_ENABLED', '1') not in ('0', 'false', 'no')
+        if min_interval is None:
+            min_interval = float(os.environ.get('FEED_MIN_INTERVAL', '300'))
+        if max_interval is None:
+            max_interval = float(os.environ.get('FEED_MAX_INTERVAL', '21600'))
+        if default_interval is None:
+            default_interval = float(os.environ.get('FEED_DEFAULT_INTERVAL', '1800'))
+        if tick is None:
+            tick = float(os.environ.get('FEED_SCHEDULER_TICK', '60'))
+        if budget is None:
+            budget = int(os.environ.get('FEED_SCHEDULER_BUDGET', '10'))
+        if jitter is None:
+            jitter = float(os.environ.get('FEED_SCHEDULE_JITTER', '0.1'))
+        if backoff_base is None:
+            backoff_base = float(os.environ.get('FEED_BACKOFF_BASE', '300'))
+        if backoff_max is None:
+            backoff_max = float(os.environ.get('FEED_BACKOFF_MAX', '86400'))
+        if max_failures is None:
+            max_failures = int(os.environ.get('FEED_MAX_FAILURES', '10'))
+
+        self.enabled = enabled
+        self.min_interval = min_interval
+        self.max_interval = max(min_interval, max_interval)
+        self.default_interval = min(max(default_interval, self.min_interval), self.max_interval)
+        self.tick = tick
+        self.budget = max(1, budget)
+        self.jitter = jitter
+        self.backoff_base = backoff_base
+        self.backoff_max = max(backoff_base, backoff_max)
+        self.max_failures = max(1, max_failures)
+
+        self._task: Optional[asyncio.Task] = None
+
+    def interval_for(self, publish_rate: Optional[float]) -> float:
+        """Polling interval in seconds for a feed publishing ``publish_rate`` articles per hour."""
+        if publish_rate is None:
+            return self.default_interval
+        if publish_rate <= 0:
+            return self.max_interval
+        return min(max(3600.0 / publish_rate, self.min_interval), self.max_interval)
+
+    def plan(self, feed: Dict[str, Any], new_articles: int, now: datetime = None) -> Dict[str, Any]:
+        """Work out a feed's schedule after a successful fetch.
+
+        ``feed`` is the feed row as it was before the fetch, so its
+        ``last_fetched`` marks the start of the observation window. Returns
+        ``publish_rate``, ``fetch_interval`` and ``delay`` (seconds until the
+        next fetch, jittered).
+        """
+        now = now or datetime.utcnow()
+        rate = feed.get('publish_rate')
+
+        last_fetched = self._parse_timestamp(feed.get('last_fetched'))
+        if last_fetched is not None and now > last_fetched:
+            hours = (now - last_fetched).total_seconds() / 3600.0
+            observed = new_articles / hours
+            rate = observed if rate is None else \
+                (1 - self.RATE_SMOOTHING) * rate + self.RATE_SMOOTHING * observed
+
+        interval = self.interval_for(rate)
+        return {'publish_rate': rate, 'fetch_interval': interval, 'delay': self.jittered(interval)}
+
+    def backoff(self, feed: Dict[str, Any]) -> float:
+        """Seconds to wait before retrying a feed whose fetch just failed.
+
+        The wait doubles with each consecutive failure, from ``backoff_base``
+        up to ``backoff_max``.
+        """
+        failures = feed.get('failure_count') or 0
+        return self.jittered(min(self.backoff_base * 2 ** min(failures, 32), self.backoff_max))
+
+    def jittered(self, interval: float) -> float:
+        """Spread ``interval`` randomly by the configured jitter fraction."""
+        return interval * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def start(self, refresh_due: Callable[[int], Awaitable[Any]]):
+        """Call ``refresh_due(budget)`` every tick on the running event loop."""
+        if not self.enabled or (self._task is not None and not self._task.done()):
+            return
+        self._task = asyncio.get_running_loop().create_task(self._run(refresh_due), name='feed-scheduler')
+        logger.info(f"Feed scheduler started (tick {self.tick:.0f}s, budget {self.budget} feeds)")
+
+    async def stop(self):
+        """Stop the scheduling loop."""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    async def _run(self, refresh_due: Callable[[int], Awaitable[Any]]):
+        while True:
+            try:
+                await refresh_due(self.budget)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Scheduled refresh failed: {e}")
+            await asyncio.sleep(self.tick)
+
+    @staticmethod
+    def _parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+        """Parse a SQLite CURRENT_TIMESTAMP value (UTC)."""
+        if not value:
+            return None
+        try:
+            return datetime.fromisoformat(str(value))
+        except ValueError:
+            return None
@@ -3,15 +3,29 @@ Main application entry point for the news feed backend.
 """
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, AsyncIterator, Optional, Set, Tuple
 import asyncio
+import base64
+import json
 import logging
+import os
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import partial
 
 from ai.lm_studio_client import LMStudioClient
+from ai.llm_cache import LLMCache
+from ai.worker_pool import LLMWorkerPool, SingleFlight
+from ai.relevance import RelevanceScorer, score_embeddings, normalize_rows
 from content.feed_parser import FeedParser, DEFAULT_FEEDS
-from database.models import DatabaseManager
+from content.dedup import SimHashIndex, simhash, to_signed, to_unsigned
+from database.models import (DatabaseManager, ARTICLE_CARD_FIELDS, ARTICLE_FIELDS, FALLBACK_CATEGORY,
+                             search_match_query)
+from jobs.refresh import RefreshJob, RefreshManager
+from jobs.scheduler import FeedScheduler
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -30,8 +44,27 @@ app.add_middleware(
 
 # Initialize components
 db = DatabaseManager()
-lm_studio = LMStudioClient()
+llm_cache = LLMCache(db)
+lm_studio = LMStudioClient(cache=llm_cache)
+llm_pool = LLMWorkerPool()
+summary_flights = SingleFlight()
+scorer = RelevanceScorer(lm_studio.embedder.dim)
+stories = SimHashIndex()
 parser = FeedParser()
+refresh_manager = RefreshManager()
+scheduler = FeedScheduler()
+
+# Blocking database, HTTP and parsing work runs on this pool so the event loop
+# keeps serving other requests while a refresh or LLM call is in progress
+blocking_pool = ThreadPoolExecutor(
+    max_workers=int(os.environ.get('API_WORKER_THREADS', '8')),
+    thread_name_prefix='api-blocking'
+)
+
+async def run_blocking(func, *args, **kwargs):
+    """Run a blocking call on the blocking pool and await its result."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(blocking_pool, partial(func, *args, **kwargs))
 
 # Pydantic models for request validation
 class InteractionRequest(BaseModel):
@@ -47,22 +80,292 @@ class PreferenceRequest(BaseModel):
     keywords: List[str]
     priority: float = 1.0
 
+def select_new_articles(articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Drop articles that are already stored, analyzed, with identical content.
+    
+    Known articles are found with one batched lookup by URL and GUID, so only
+    new or changed entries, and those stored while the model was unavailable,
+    continue on to AI analysis and insertion.
+    """
+    known = db.get_known_articles(
+        [article.get('url') for article in articles],
+        [article.get('guid') for article in articles]
+    )
+    by_url = {row['url']: row for row in known}
+    by_guid = {row['guid']: row for row in known if row['guid']}
+    
+    selected = []
+    seen_urls = set()
+    for article in articles:
+        if article.get('url') in seen_urls:
+            continue
+        seen_urls.add(article.get('url'))
+        
+        existing = by_url.get(article.get('url')) or by_guid.get(article.get('guid'))
+        # Rows stored before content hashes existed count as unchanged
+        if (existing and existing['analyzed'] and
+                existing['content_hash'] in (None, article.get('content_hash'))):
+            continue
+        selected.append(article)
+    
+    return selected
+
+def has_analysis(article: Dict[str, Any]) -> bool:
+    """Whether an article carries a model analysis rather than none or the fallback."""
+    return article.get('category') not in (None, FALLBACK_CATEGORY)
+
+def embed_articles(articles: List[Dict[str, Any]]):
+    """Attach local embeddings to articles in one batch."""
+    if not articles:
+        return
+    
+    embeddings = lm_studio.generate_embeddings(
+        [f"{article['title']} {article['content']}" for article in articles]
+    )
+    for article, embedding in zip(articles, embeddings):
+        article['embedding'] = embedding
+
+def backfill_embeddings(batch_size: int = 500) -> int:
+    """Embed stored articles that have no embedding, e.g. after an embedding model change."""
+    embedded = 0
+    after_id = 0
+    while True:
+        articles = db.get_articles_missing_embeddings(batch_size, after_id)
+        if not articles:
+            break
+        embed_articles(articles)
+        embedded += db.update_article_embeddings(
+            [(article['id'], article['embedding']) for article in articles]
+        )
+        after_id = articles[-1]['id']
+    
+    if embedded:
+        logger.info(f"Embedded {embedded} stored articles")
+    return embedded
+
+async def analyze_articles(articles: List[Dict[str, Any]], preferences: List[Dict[str, Any]]) -> int:
+    """Attach AI analysis to articles, categorizing them concurrently.
+    
+    Returns the number of articles the model analyzed; articles in failed
+    batches get the default analysis instead.
+    """
+    if not articles or not await run_blocking(lm_studio.is_available):
+        return 0
+    
+    # Articles are categorized in batches that share one prompt, and the
+    # batches are queued on the worker pool and served in parallel
+    batches = [
+        articles[start:start + lm_studio.batch_size]
+        for start in range(0, len(articles), lm_studio.batch_size)
+    ]
+    batch_results = await asyncio.gather(*[
+        llm_pool.run(lm_studio.categorize_articles, batch, category_prefs=preferences)
+        for batch in batches
+    ], return_exceptions=True)
+    
+    analyzed = 0
+    for batch, analyses in zip(batches, batch_results):
+        if isinstance(analyses, BaseException):
+            logger.error(f"Error analyzing batch of {len(batch)} articles: {analyses!r}")
+            analyses = [lm_studio.default_analysis(article['title']) for article in batch]
+        else:
+            analyzed += len(batch)
+        
+        for article, ai_analysis in zip(batch, analyses):
+            article.update(ai_analysis)
+    return analyzed
+
+def prepare_articles(result: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Return a fetched feed's new articles, embedded, recording a failed fetch."""
+    feed = result['feed']
+    articles = result['articles']
+    logger.info(f"Refreshing feed: {feed['title']} ({result['status']}, {len(articles)} articles)")
+    
+    if result['status'] == 'error':
+        # Failing feeds back off exponentially and are eventually deactivated
+        db.record_feed_failure(feed['id'], result['error'], scheduler.backoff(feed), scheduler.max_failures)
+    
+    new_articles = select_new_articles(articles)
+    embed_articles(new_articles)
+    return new_articles
+
+def save_fetch_state(result: Dict[str, Any], new_articles: List[Dict[str, Any]]):
+    """Record a successful fetch of a feed and schedule its next fetch.
+    
+    Only called once the feed's articles are stored: until then the next
+    fetch stays unconditional, so articles lost to a failed or cancelled
+    refresh are fetched again. The feed's validators are also cleared while
+    any of its new articles lacks an analysis, so they are parsed and sent
+    to the model again on the next fetch.
+    """
+    feed = result['feed']
+    if all(has_analysis(article) for article in new_articles):
+        validators = (result['etag'], result['last_modified'], result['content_hash'])
+    else:
+        validators = (None, None, None)
+    db.update_feed_fetch_state(feed['id'], *validators)
+    db.update_feed_schedule(feed['id'], **scheduler.plan(feed, len(new_articles)))
+
+# Analysis fields shared by every article of a near-duplicate story
+ANALYSIS_FIELDS = list(LMStudioClient.default_analysis('').keys())
+
+def first_copy_index() -> Tuple[SimHashIndex, List[Dict[str, Any]]]:
+    """Start an index of stories first seen in one refresh, keyed by position in the returned list."""
+    return SimHashIndex(max_distance=stories.max_distance, window=stories.window), []
+
+def cluster_articles(articles: List[Dict[str, Any]],
+                     first_copies: Optional[Tuple[SimHashIndex, List[Dict[str, Any]]]] = None
+                     ) -> Tuple[List[Dict[str, Any]], List[Tuple[Dict[str, Any], Dict[str, Any]]]]:
+    """Group near-duplicate articles into stories before analysis.
+    
+    Each article gets a ``simhash``. One matching a recent stored story is
+    marked ``duplicate_of`` that story and reuses its stored analysis, or is
+    analyzed itself while the story has none. Later copies of a story first
+    seen in ``first_copies`` (from first_copy_index, shared by every feed of
+    a refresh; just these articles by default) are paired with the first
+    copy so they can share its analysis. Returns the articles that still
+    need analysis and the ``(copy, first_copy)`` pairs.
+    """
+    if not stories.loaded:
+        stories.load((story_id, to_unsigned(value), added_at)
+                     for story_id, value, added_at in db.get_story_hashes(stories.window))
+    stories.prune()
+    
+    matches = []
+    for article in articles:
+        value = simhash(f"{article['title']} {article['content']}")
+        article['simhash'] = to_signed(value) if value is not None else None
+        matches.append((article, value, stories.find(value) if value is not None else None))
+    
+    # Stored analyses of every matched story, read in one query
+    analyses = db.get_article_analyses({story_id for _, _, story_id in matches if story_id is not None})
+    
+    index, firsts = first_copies if first_copies is not None else first_copy_index()
+    representatives = []
+    copies = []
+    for article, value, story_id in matches:
+        if value is None:
+            representatives.append(article)
+            continue
+        
+        if story_id in analyses:
+            article['duplicate_of'] = story_id
+            if has_analysis(analyses[story_id]):
+                article.update(analyses[story_id])
+            else:
+                representatives.append(article)
+            continue
+        
+        position = index.find(value)
+        if position is not None:
+            copies.append((article, firsts[position]))
+        else:
+            index.add(len(firsts), value)
+            firsts.append(article)
+            representatives.append(article)
+    
+    return representatives, copies
+
+def store_articles(articles: List[Dict[str, Any]], preferences: List[Dict[str, Any]],
+                   copies: List[Tuple[Dict[str, Any], Dict[str, Any]]] = ()) -> Dict[str, Any]:
+    """Score and store analyzed articles, keeping the in-memory scorer and story index current."""
+    for article, first in copies:
+        article.update({field: first.get(field) for field in ANALYSIS_FIELDS})
+    
+    score_articles(articles, preferences)
+    
+    # Each feed's articles are written in one transaction
+    stored = db.insert_articles(articles)
+    inserted = [(article_id, article)
+                for article_id, article in zip(stored['ids'], articles)
+                if article_id]
+    
+    # Stored articles keep their id so copies, here or in a later feed, can point at them
+    for article_id, article in inserted:
+        article['id'] = article_id
+    
+    # Copies can only point at their story once its first copy has an id
+    db.set_duplicates([(article['id'], first['id']) for article, first in copies
+                       if article.get('id') and first.get('id')])
+    
+    copied = {id(article) for article, _ in copies}
+    for article_id, article in inserted:
+        if article.get('simhash') is not None and not article.get('duplicate_of') and id(article) not in copied:
+            stories.add(article_id, to_unsigned(article['simhash']))
+    
+    if scorer.loaded and inserted:
+        scorer.upsert(
+            [article_id for article_id, _ in inserted],
+            [article['embedding'] for _, article in inserted],
+            [article.get('relevance_boost') or 0.0 for _, article in inserted]
+        )
+    return stored
+
+def preference_vectors(preferences: List[Dict[str, Any]]):
+    """Embed category preferences, returning unit vectors and priority weights."""
+    if not preferences:
+        return np.empty((0, lm_studio.embedder.dim), dtype=np.float32), np.empty(0, dtype=np.float32)
+    
+    texts = [f"{pref['category']} {' '.join(pref['keywords'])}" for pref in preferences]
+    priorities = np.array([pref.get('priority') or 1.0 for pref in preferences], dtype=np.float32)
+    return normalize_rows(lm_studio.generate_embeddings(texts)), priorities / priorities.max()
+
+def score_articles(articles: List[Dict[str, Any]], preferences: List[Dict[str, Any]]):
+    """Set each article's relevance score from its embedding and AI relevance boost."""
+    if not articles:
+        return
+    
+    vectors, weights = preference_vectors(preferences)
+    embeddings = normalize_rows([article['embedding'] for article in articles])
+    boosts = np.array([float(article.get('relevance_boost') or 0.0) for article in articles], dtype=np.float32)
+    for article, score in zip(articles, score_embeddings(embeddings, boosts, vectors, weights)):
+        article['relevance_score'] = float(score)
+
+def rescore_articles() -> int:
+    """Recompute every stored article's relevance against the current preferences."""
+    if not scorer.loaded:
+        scorer.load(*db.get_article_embeddings(scorer.dim))
+    
+    vectors, weights = preference_vectors(db.get_category_preferences())
+    ids, scores = scorer.score_all(vectors, weights)
+    updated = db.update_relevance_scores(zip(ids.tolist(), scores.tolist()))
+    logger.info(f"Rescored {len(ids)} articles ({updated} changed)")
+    return updated
+
 @app.on_event("startup")
 async def startup_event():
     """Initialize application on startup."""
     logger.info("Starting AI News Feed backend...")
     
     # Check if LM Studio is available
-    if not lm_studio.is_available():
+    if not await run_blocking(lm_studio.is_available):
         logger.warning("LM Studio is not available. AI features will be limited.")
     
+    # Re-embed articles whose embeddings came from a different embedding model
+    await run_blocking(db.ensure_embedding_model, lm_studio.embedder.name, lm_studio.embedder.dim)
+    if await run_blocking(backfill_embeddings):
+        await run_blocking(rescore_articles)
+    
     # Add default feeds if database is empty
-    feeds = db.get_active_feeds()
+    feeds = await run_blocking(db.get_active_feeds)
     if not feeds:
         logger.info("Adding default RSS feeds...")
         for feed_url in DEFAULT_FEEDS:
-            feed_info = parser.get_feed_info(feed_url)
-            db.insert_feed(feed_info)
+            feed_info = await run_blocking(parser.get_feed_info, feed_url)
+            await run_blocking(db.insert_feed, feed_info)
+    
+    # Poll feeds in the background on their own schedules
+    scheduler.start(refresh_due_feeds)
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop background workers and close database connections on shutdown."""
+    await scheduler.stop()
+    await refresh_manager.stop()
+    await llm_pool.stop()
+    blocking_pool.shutdown(wait=False, cancel_futures=True)
+    llm_cache.flush()
+    db.close()
 
 @app.get("/")
 async def root():
@@ -70,47 +373,166 @@ async def root():
     return {
         "message": "AI News Feed API",
         "version": "1.0.0",
-        "lm_studio_available": lm_studio.is_available()
+        "lm_studio_available": await run_blocking(lm_studio.is_available)
     }
 
+def encode_cursor(position: tuple) -> str:
+    """Encode a keyset position as an opaque URL-safe cursor."""
+    return base64.urlsafe_b64encode(json.dumps(list(position)).encode()).decode().rstrip('=')
+
+def decode_cursor(cursor: str, size: int) -> tuple:
+    """Decode a cursor produced by encode_cursor for a keyset of ``size`` values ending in an id."""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        position = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(position, list) or len(position) != size:
+            raise ValueError("cursor is not a keyset position")
+        if any(isinstance(value, bool) or not isinstance(value, (int, float, str)) for value in position):
+            raise ValueError("cursor values must be numbers or strings")
+        if not isinstance(position[-1], int):
+            raise ValueError("cursor id is not an integer")
+        return tuple(position)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def select_fields(fields: Optional[str]) -> List[str]:
+    """Resolve a ``fields`` query parameter to article field names."""
+    if not fields:
+        return ARTICLE_CARD_FIELDS
+    if fields == 'full':
+        return [field for field in ARTICLE_FIELDS if field not in ('embedding', 'snippet')]
+    
+    selected = [field.strip() for field in fields.split(',') if field.strip()]
+    unknown = set(selected) - set(ARTICLE_FIELDS)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+    return selected
+
 @app.get("/articles")
 async def get_articles(
     limit: int = 20,
     offset: int = 0,
     category: Optional[str] = None,
     min_relevance: float = 0.0,
-    read_status: Optional[bool] = None
+    read_status: Optional[bool] = None,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    collapse: bool = True
 ) -> Dict[str, Any]:
-    """Get filtered articles with pagination."""
-    articles = db.get_articles(
+    """Get filtered articles with pagination.
+    
+    Pass the ``next_cursor`` of one page as ``cursor`` to fetch the next page;
+    ``offset`` paging is still supported. Articles are returned as compact
+    cards unless ``fields`` names the columns to return (comma-separated) or
+    is ``full`` for every column except the embedding. Near-duplicate copies
+    of a story are hidden unless ``collapse`` is false; each listed article's
+    ``duplicate_count`` says how many copies it stands for.
+    """
+    after = None
+    if cursor:
+        after = decode_cursor(cursor, 3)
+    
+    selected = select_fields(fields)
+    
+    articles = await run_blocking(
+        db.get_articles,
         limit=limit,
         offset=offset,
         category=category,
         min_relevance=min_relevance,
-        read_status=read_status
+        read_status=read_status,
+        after=after,
+        fields=selected,
+        collapse=collapse
     )
+    for article in articles:
+        if article.get('embedding') is not None:
+            article['embedding'] = article['embedding'].tolist()
+    
+    next_cursor = None
+    if articles and len(articles) == limit:
+        next_cursor = encode_cursor(db.article_cursor(articles[-1]))
     
     return {
         "articles": articles,
         "count": len(articles),
         "limit": limit,
-        "offset": offset
+        "offset": offset,
+        "next_cursor": next_cursor
+    }
+
+@app.get("/search")
+async def search_articles(
+    q: str,
+    limit: int = 20,
+    category: Optional[str] = None,
+    min_relevance: float = 0.0,
+    read_status: Optional[bool] = None,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    collapse: bool = True
+) -> Dict[str, Any]:
+    """Full-text search over article titles, content, summaries and topics.
+    
+    Results are ranked by BM25, best match first, and each has a
+    ``search_snippet`` with the matched terms wrapped in ``<mark>`` tags.
+    Every word must match; the last also matches as a prefix, and
+    ``"quoted phrases"`` match as phrases. Filters, ``fields``, ``collapse``
+    and ``cursor`` paging work as for /articles.
+    """
+    if search_match_query(q) is None:
+        raise HTTPException(status_code=400, detail="Search query has no words")
+    
+    after = None
+    if cursor:
+        after = decode_cursor(cursor, 2)
+    
+    articles = await run_blocking(
+        db.search_articles,
+        q,
+        limit=limit,
+        category=category,
+        min_relevance=min_relevance,
+        read_status=read_status,
+        after=after,
+        fields=select_fields(fields),
+        collapse=collapse
+    )
+    for article in articles:
+        if article.get('embedding') is not None:
+            article['embedding'] = article['embedding'].tolist()
+    
+    next_cursor = None
+    if articles and len(articles) == limit:
+        next_cursor = encode_cursor(db.search_cursor(articles[-1]))
+    
+    return {
+        "articles": articles,
+        "count": len(articles),
+        "limit": limit,
+        "query": q,
+        "next_cursor": next_cursor
     }
 
 @app.get("/feeds")
-async def get_feeds() -> List[Dict[str, Any]]:
-    """Get all active RSS feeds."""
-    return db.get_active_feeds()
+async def get_feeds(include_inactive: bool = False) -> List[Dict[str, Any]]:
+    """Get all active RSS feeds with their fetch health.
+    
+    ``include_inactive`` also lists feeds deactivated after repeated failures.
+    """
+    if include_inactive:
+        return await run_blocking(db.get_all_feeds)
+    return await run_blocking(db.get_active_feeds)
 
 @app.post("/feeds")
 async def add_feed(request: FeedRequest) -> Dict[str, Any]:
     """Add a new RSS feed."""
     try:
-        feed_info = parser.get_feed_info(request.url)
+        feed_info = await run_blocking(parser.get_feed_info, request.url)
         # Add category to feed info
         if request.category:
             feed_info['category'] = request.category
-        feed_id = db.insert_feed(feed_info)
+        feed_id = await run_blocking(db.insert_feed, feed_info)
         
         if feed_id:
             return {"message": "Feed added successfully", "feed_id": feed_id}
@@ -124,7 +546,7 @@ async def add_feed(request: FeedRequest) -> Dict[str, Any]:
 async def delete_feed(feed_id: int) -> Dict[str, Any]:
     """Delete an RSS feed."""
     try:
-        success = db.delete_feed(feed_id)
+        success = await run_blocking(db.delete_feed, feed_id)
         if success:
             return {"message": "Feed deleted successfully"}
         else:
@@ -132,52 +554,108 @@ async def delete_feed(feed_id: int) -> Dict[str, Any]:
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
-@app.post("/refresh")
-async def refresh_feeds() -> Dict[str, Any]:
-    """Refresh all feeds and process articles with AI."""
+async def run_refresh(job: RefreshJob, feeds: Optional[List[Dict[str, Any]]] = None):
+    """Fetch feeds (every active one by default) and store their new articles, reporting progress on the job.
+    
+    Each feed is clustered into stories as soon as it downloads and then
+    analyzed and stored by its own task, so the LLM worker pool is kept busy
+    with every fetched feed's articles instead of one feed's at a time.
+    """
+    if feeds is None:
+        feeds = await run_blocking(db.get_active_feeds, ready_only=True)
+    preferences = await run_blocking(db.get_category_preferences)
+    job.advance(feeds_total=len(feeds))
+    
+    # Stories first seen in this refresh, and the task of the feed storing each one
+    first_copies = first_copy_index()
+    owners: Dict[int, asyncio.Task] = {}
+    tasks = []
     try:
-        feeds = db.get_active_feeds()
-        preferences = db.get_category_preferences()
-        total_articles = 0
-        
-        for feed in feeds:
-            logger.info(f"Refreshing feed: {feed['title']}")
-            articles = parser.parse_feed(feed['url'])
+        # Feeds are downloaded concurrently and handed over as each one finishes
+        results = parser.fetch_feeds(feeds)
+        while True:
+            result = await run_blocking(next, results, None)
+            if result is None:
+                break
             
-            for article in articles:
-                # Generate AI analysis if LM Studio is available
-                if lm_studio.is_available():
-                    # Generate embedding
-                    text = f"{article['title']} {article['content']}"
-                    embedding = lm_studio.generate_embedding(text)
-                    article['embedding'] = embedding
-                    
-                    # Categorize article with preferences
-                    ai_analysis = lm_studio.categorize_article(
-                        article['title'], 
-                        article['content'],
-                        category_prefs=preferences
-                    )
-                    article.update(ai_analysis)
-                    
-                    # Apply relevance boost from AI analysis
-                    base_relevance = article.get('relevance_score', 0.5)
-                    boost = ai_analysis.get('relevance_boost', 0.0)
-                    article['relevance_score'] = min(1.0, base_relevance + boost)
-                
-                # Insert into database
-                article_id = db.insert_article(article)
-                if article_id:
-                    total_articles += 1
-        
-        return {
-            "message": f"Refreshed {len(feeds)} feeds",
-            "new_articles": total_articles
-        }
+            new_articles = await run_blocking(prepare_articles, result)
+            representatives, copies = await run_blocking(cluster_articles, new_articles, first_copies)
+            job.advance(
+                feeds_fetched=1,
+                feeds_failed=int(result['status'] == 'error'),
+                articles_found=len(result['articles']),
+                articles_new=len(new_articles),
+                articles_duplicate=len(new_articles) - len(representatives),
+                articles_skipped=len(result['articles']) - len(new_articles)
+            )
+            
+            # Feeds are only ever clustered against earlier ones, so waits never form a cycle
+            earlier = {owners[id(first)] for _, first in copies if id(first) in owners}
+            task = asyncio.ensure_future(process_feed(job, result, new_articles, representatives,
+                                                      copies, preferences, earlier))
+            owners.update((id(article), task) for article in representatives)
+            tasks.append(task)
         
-    except Exception as e:
-        logger.error(f"Error refreshing feeds: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+        outcomes = await asyncio.gather(*tasks, return_exceptions=True)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+    
+    errors = [outcome for outcome in outcomes if isinstance(outcome, BaseException)]
+    if errors:
+        raise errors[0]
+
+async def process_feed(job: RefreshJob, result: Dict[str, Any], new_articles: List[Dict[str, Any]],
+                       representatives: List[Dict[str, Any]],
+                       copies: List[Tuple[Dict[str, Any], Dict[str, Any]]],
+                       preferences: List[Dict[str, Any]], earlier: Set[asyncio.Task]):
+    """Analyze and store one fetched feed's new articles, then record the fetch.
+    
+    Copies of stories first seen in an earlier feed are stored once that
+    feed's task has finished, so they can take its analysis and ids.
+    """
+    # Only one article per story is sent to the model
+    job.advance(articles_analyzed=await analyze_articles(representatives, preferences))
+    if earlier:
+        await asyncio.wait(earlier)
+    
+    stored = await run_blocking(store_articles, new_articles, preferences, copies)
+    job.advance(
+        articles_inserted=stored['inserted'],
+        articles_updated=stored['updated'],
+        articles_skipped=stored['skipped']
+    )
+    if result['status'] != 'error' and not stored['error']:
+        await run_blocking(save_fetch_state, result, new_articles)
+
+async def refresh_due_feeds(limit: int):
+    """Start a refresh of the feeds whose scheduled fetch time has passed."""
+    if refresh_manager.current is not None:
+        return
+    feeds = await run_blocking(db.get_due_feeds, limit)
+    if feeds:
+        logger.info(f"Scheduled refresh of {len(feeds)} due feeds")
+        refresh_manager.start(partial(run_refresh, feeds=feeds), scope='due')
+
+@app.post("/refresh", status_code=202)
+async def refresh_feeds() -> Dict[str, Any]:
+    """Start refreshing all feeds in the background, or join the refresh already running.
+    
+    While a scheduled refresh of just the due feeds runs, the full refresh is
+    queued behind it instead and reported with status ``queued``.
+    """
+    job, started = refresh_manager.start(run_refresh)
+    return {**job.to_dict(), "started": started}
+
+@app.get("/refresh/{job_id}")
+async def get_refresh_job(job_id: str) -> Dict[str, Any]:
+    """Report the status and per-stage progress of a refresh job."""
+    job = refresh_manager.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Refresh job not found")
+    return job.to_dict()
 
 @app.post("/articles/{article_id}/interact")
 async def record_interaction(
@@ -186,18 +664,30 @@ async def record_interaction(
 ) -> Dict[str, Any]:
     """Record user interaction with an article."""
     try:
-        db.record_user_interaction(article_id, request.action, request.value)
+        await run_blocking(db.record_user_interaction, article_id, request.action, request.value)
         return {"message": "Interaction recorded"}
         
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+async def create_summary(article: Dict[str, Any]) -> str:
+    """Summarize an article with the LLM and save the summary."""
+    full_content = f"{article['title']} - {article['content']}"
+    ai_summary = await llm_pool.run(lm_studio.summarize_article, full_content)
+    
+    # Save the summary to database
+    await run_blocking(db.update_article_ai_summary, article['id'], ai_summary)
+    return ai_summary
+
 @app.post("/articles/{article_id}/summary")
 async def generate_ai_summary(article_id: int) -> Dict[str, Any]:
-    """Generate an AI summary for a specific article."""
+    """Generate an AI summary for a specific article.
+    
+    Concurrent requests for the same article share one generation.
+    """
     try:
         # Get the article
-        article = db.get_article_by_id(article_id)
+        article = await run_blocking(db.get_article_by_id, article_id)
         if not article:
             raise HTTPException(status_code=404, detail="Article not found")
         
@@ -209,12 +699,8 @@ async def generate_ai_summary(article_id: int) -> Dict[str, Any]:
             }
         
         # Generate new summary if LM Studio is available
-        if lm_studio.is_available():
-            full_content = f"{article['title']} - {article['content']}"
-            ai_summary = lm_studio.summarize_article(full_content)
-            
-            # Save the summary to database
-            db.update_article_ai_summary(article_id, ai_summary)
+        if await run_blocking(lm_studio.is_available):
+            ai_summary = await summary_flights.run(article_id, partial(create_summary, article))
             
             return {
                 "summary": ai_summary,
@@ -229,12 +715,88 @@ async def generate_ai_summary(article_id: int) -> Dict[str, Any]:
         logger.error(f"Error generating summary: {e}")
         raise HTTPException(status_code=500, detail="Failed to generate summary")
 
+async def stream_summary(article: Dict[str, Any], tokens: asyncio.Queue) -> str:
+    """Summarize an article with a streaming completion and save the summary.
+    
+    Text is put on ``tokens`` as it arrives, followed by None once the
+    generation ends, whether it succeeded or not.
+    """
+    loop = asyncio.get_running_loop()
+    full_content = f"{article['title']} - {article['content']}"
+    
+    def generate() -> str:
+        parts = []
+        for text in lm_studio.stream_summary(full_content):
+            parts.append(text)
+            loop.call_soon_threadsafe(tokens.put_nowait, text)
+        return ''.join(parts).strip()
+    
+    try:
+        ai_summary = await llm_pool.run(generate)
+    finally:
+        tokens.put_nowait(None)
+    if not ai_summary:
+        raise Exception("Empty summary")
+    
+    await run_blocking(db.update_article_ai_summary, article['id'], ai_summary)
+    return ai_summary
+
+def sse_event(event: str, data: Dict[str, Any]) -> str:
+    """Format one Server-Sent Event."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+async def summary_events(article: Dict[str, Any]) -> AsyncIterator[str]:
+    """Relay a summary generation as ``token`` events followed by ``done`` or ``error``."""
+    article_id = article['id']
+    try:
+        if article.get('ai_summary'):
+            yield sse_event('done', {"summary": article['ai_summary'], "cached": True})
+            return
+        
+        if summary_flights.in_flight(article_id):
+            # Another request is generating this summary; wait for its result
+            ai_summary = await summary_flights.run(article_id, partial(create_summary, article))
+        else:
+            tokens: asyncio.Queue = asyncio.Queue()
+            flight = summary_flights.start(article_id, partial(stream_summary, article, tokens))
+            text = await tokens.get()
+            while text is not None:
+                yield sse_event('token', {"text": text})
+                text = await tokens.get()
+            ai_summary = await asyncio.shield(flight)
+        
+        yield sse_event('done', {"summary": ai_summary, "cached": False})
+        
+    except Exception as e:
+        logger.error(f"Error streaming summary for article {article_id}: {e}")
+        yield sse_event('error', {"detail": "Failed to generate summary"})
+
+@app.get("/articles/{article_id}/summary/stream")
+async def stream_ai_summary(article_id: int) -> StreamingResponse:
+    """Stream an AI summary for an article as Server-Sent Events.
+    
+    Sends ``token`` events with text as the model generates it, then a
+    ``done`` event with the full summary (or an ``error`` event). The summary
+    is saved like one from POST /articles/{id}/summary.
+    """
+    article = await run_blocking(db.get_article_by_id, article_id)
+    if not article:
+        raise HTTPException(status_code=404, detail="Article not found")
+    if not article.get('ai_summary') and not await run_blocking(lm_studio.is_available):
+        raise HTTPException(status_code=503, detail="AI service not available")
+    
+    return StreamingResponse(
+        summary_events(article),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @app.get("/articles/{article_id}/bias-analysis")
 async def get_bias_analysis(article_id: int) -> Dict[str, Any]:
     """Get detailed bias analysis for a specific article."""
     try:
         # Get the article
-        article = db.get_article_by_id(article_id)
+        article = await run_blocking(db.get_article_by_id, article_id)
         if not article:
             raise HTTPException(status_code=404, detail="Article not found")
         
@@ -276,7 +838,7 @@ async def get_bias_analysis(article_id: int) -> Dict[str, Any]:
 @app.get("/preferences")
 async def get_preferences() -> List[Dict[str, Any]]:
     """Get all category preferences."""
-    return db.get_category_preferences()
+    return await run_blocking(db.get_category_preferences)
 
 @app.post("/preferences")
 async def set_preference(request: PreferenceRequest) -> Dict[str, Any]:
@@ -285,8 +847,9 @@ async def set_preference(request: PreferenceRequest) -> Dict[str, Any]:
         if not request.category or not request.keywords:
             raise HTTPException(status_code=400, detail="Category and keywords required")
         
-        success = db.upsert_category_preference(request.category, request.keywords, request.priority)
+        success = await run_blocking(db.upsert_category_preference, request.category, request.keywords, request.priority)
         if success:
+            await run_blocking(rescore_articles)
             return {"message": "Preference saved successfully"}
         else:
             raise HTTPException(status_code=500, detail="Failed to save preference")
@@ -299,8 +862,9 @@ async def set_preference(request: PreferenceRequest) -> Dict[str, Any]:
 @app.delete("/preferences/{category}")
 async def delete_preference(category: str) -> Dict[str, Any]:
     """Delete a category preference."""
-    success = db.delete_category_preference(category)
+    success = await run_blocking(db.delete_category_preference, category)
     if success:
+        await run_blocking(rescore_articles)
         return {"message": "Preference deleted successfully"}
     else:
         raise HTTPException(status_code=404, detail="Preference not found")
@@ -309,7 +873,7 @@ async def delete_preference(category: str) -> Dict[str, Any]:
 async def mark_article_read(article_id: int) -> Dict[str, Any]:
     """Mark an article as read."""
     try:
-        success = db.mark_article_read(article_id)
+        success = await run_blocking(db.mark_article_read, article_id)
         if success:
             return {"message": "Article marked as read"}
         else:
@@ -321,7 +885,7 @@ async def mark_article_read(article_id: int) -> Dict[str, Any]:
 async def mark_article_unread(article_id: int) -> Dict[str, Any]:
     """Mark an article as unread."""
     try:
-        success = db.mark_article_unread(article_id)
+        success = await run_blocking(db.mark_article_unread, article_id)
         if success:
             return {"message": "Article marked as unread"}
         else:
@@ -333,7 +897,7 @@ async def mark_article_unread(article_id: int) -> Dict[str, Any]:
 async def get_reading_stats() -> Dict[str, Any]:
     """Get reading statistics."""
     try:
-        stats = db.get_read_count()
+        stats = await run_blocking(db.get_read_count)
         return {
             "total_articles": stats["total"],
             "read_count": stats["read"],
@@ -343,13 +907,21 @@ async def get_reading_stats() -> Dict[str, Any]:
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/stats/llm-cache")
+async def get_llm_cache_stats() -> Dict[str, Any]:
+    """Get LLM result cache hit/miss counts and size."""
+    try:
+        return await run_blocking(llm_cache.stats)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 @app.get("/health")
 async def health_check() -> Dict[str, Any]:
     """Health check endpoint."""
     return {
         "status": "healthy",
         "timestamp": datetime.now().isoformat(),
-        "lm_studio_available": lm_studio.is_available()
+        "lm_studio_available": await run_blocking(lm_studio.is_available)
     }
 
 if __name__ == "__main__":
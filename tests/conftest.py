@@ -63,4 +63,11 @@ def test_db():
     # Create connection attribute for tests that need it
     db.connection = sqlite3.connect(test_db_path)
     
-    return db
\ No newline at end of file
+    return db
+
+@pytest.fixture
+def file_db(tmp_path):
+    """Create a test database backed by a temporary file."""
+    from database.models import DatabaseManager
+    
+    return DatabaseManager(str(tmp_path / "test_news_feed.db"))
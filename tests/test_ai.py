@@ -2,6 +2,8 @@
 import pytest
 from unittest.mock import Mock, patch
 import requests
+import threading
+import time
 
 class TestLMStudioClient:
     """Test LM Studio client functionality."""
@@ -136,4 +138,498 @@ class TestLMStudioClient:
             assert result["political_bias"] == 0.0
             
             summary = client.summarize_article("Test content")
-            assert summary == "Summary not available - AI service connection failed."
\ No newline at end of file
+            assert summary == "Summary not available - AI service connection failed."
+
+class TestModelDiscoveryCache:
+    """Test caching of LM Studio availability and model discovery."""
+    
+    def _models_response(self, model_id="test-model"):
+        response = Mock()
+        response.status_code = 200
+        response.json.return_value = {"data": [{"id": model_id}]}
+        return response
+    
+    def test_model_id_is_cached(self):
+        """Test repeated model lookups reuse one /v1/models probe."""
+        from ai.lm_studio_client import LMStudioClient
+        
+        client = LMStudioClient(base_url="http://localhost:1234")
+        with patch.object(client.session, 'get', return_value=self._models_response()) as mock_get:
+            assert client._get_available_model() == "test-model"
+            assert client._get_available_model() == "test-model"
+            assert client._check_models() is True
+            assert mock_get.call_count == 1
+    
+    def test_down_backend_fails_fast(self):
+        """Test a backend marked down is not probed again within the down TTL."""
+        from ai.lm_studio_client import LMStudioClient
+        
+        client = LMStudioClient(base_url="http://localhost:1234")
+        with patch.object(client.session, 'get', side_effect=requests.exceptions.ConnectionError()) as mock_get:
+            assert client._check_models() is False
+            assert client._check_models() is False
+            assert client._get_available_model() == "mistralai/mistral-7b-instruct-v0.3"
+            assert mock_get.call_count == 1
+    
+    def test_stale_cache_reprobes_in_background(self):
+        """Test a stale entry is served while a background probe refreshes it."""
+        from ai.lm_studio_client import LMStudioClient
+        
+        client = LMStudioClient(base_url="http://localhost:1234")
+        with patch.object(client.session, 'get', side_effect=requests.exceptions.ConnectionError()):
+            client.down_ttl = 0
+            assert client._check_models() is False
+        
+        with patch.object(client.session, 'get', return_value=self._models_response("new-model")):
+            # Still reports the cached answer while the probe runs
+            assert client._check_models() is False
+            for _ in range(100):
+                if not client._probe_in_flight:
+                    break
+                time.sleep(0.01)
+            client.cache_ttl = 60
+            assert client._check_models() is True
+            assert client._get_available_model() == "new-model"
+    
+    def test_cold_cache_probes_once_for_concurrent_callers(self):
+        """Test threads arriving together on a cold cache share the first probe."""
+        from ai.lm_studio_client import LMStudioClient
+        
+        client = LMStudioClient(base_url="http://localhost:1234")
+        
+        def slow_models(*args, **kwargs):
+            time.sleep(0.05)
+            return self._models_response()
+        
+        results = []
+        with patch.object(client.session, 'get', side_effect=slow_models) as mock_get:
+            threads = [threading.Thread(target=lambda: results.append(client._check_models()))
+                       for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        
+        assert results == [True] * 8
+        assert mock_get.call_count == 1
+
+class TestLLMWorkerPool:
+    """Test the bounded-concurrency LLM worker pool."""
+    
+    @pytest.mark.asyncio
+    async def test_runs_calls_concurrently_within_limit(self):
+        """Test calls run in parallel but never above the concurrency limit."""
+        import asyncio
+        import threading
+        from ai.worker_pool import LLMWorkerPool
+        
+        lock = threading.Lock()
+        state = {'active': 0, 'max_active': 0}
+        
+        def slow_call(value):
+            with lock:
+                state['active'] += 1
+                state['max_active'] = max(state['max_active'], state['active'])
+            time.sleep(0.05)
+            with lock:
+                state['active'] -= 1
+            return value * 2
+        
+        pool = LLMWorkerPool(concurrency=3, timeout=5)
+        started = time.monotonic()
+        results = await asyncio.gather(*[pool.run(slow_call, i) for i in range(9)])
+        elapsed = time.monotonic() - started
+        await pool.stop()
+        
+        assert results == [i * 2 for i in range(9)]
+        assert state['max_active'] == 3
+        assert elapsed < 9 * 0.05
+    
+    @pytest.mark.asyncio
+    async def test_timeout(self):
+        """Test a call exceeding the per-request timeout fails."""
+        import asyncio
+        from ai.worker_pool import LLMWorkerPool
+        
+        pool = LLMWorkerPool(concurrency=1, timeout=0.05)
+        with pytest.raises(asyncio.TimeoutError):
+            await pool.run(time.sleep, 0.5)
+        await pool.stop()
+    
+    @pytest.mark.asyncio
+    async def test_exceptions_propagate(self):
+        """Test exceptions raised by a call reach the caller."""
+        from ai.worker_pool import LLMWorkerPool
+        
+        def failing_call():
+            raise ValueError("bad response")
+        
+        pool = LLMWorkerPool(concurrency=2, timeout=5)
+        with pytest.raises(ValueError):
+            await pool.run(failing_call)
+        await pool.stop()
+
+class TestSingleFlight:
+    """Test coalescing of concurrent calls."""
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_one_run(self):
+        """Test callers with the same key get the result of a single call."""
+        import asyncio
+        from ai.worker_pool import SingleFlight
+        
+        flights = SingleFlight()
+        calls = []
+        async def generate(value):
+            calls.append(value)
+            await asyncio.sleep(0.05)
+            return value * 2
+        
+        results = await asyncio.gather(
+            flights.run(1, lambda: generate(1)),
+            flights.run(1, lambda: generate(1)),
+            flights.run(2, lambda: generate(2)),
+        )
+        
+        assert results == [2, 2, 4]
+        assert sorted(calls) == [1, 2]
+        assert not flights.in_flight(1)
+        assert await flights.run(1, lambda: generate(1)) == 2
+        assert len(calls) == 3
+    
+    @pytest.mark.asyncio
+    async def test_failure_reaches_every_caller(self):
+        """Test an exception is raised to all waiters and the key is released."""
+        import asyncio
+        from ai.worker_pool import SingleFlight
+        
+        flights = SingleFlight()
+        async def failing():
+            await asyncio.sleep(0.01)
+            raise ValueError("model error")
+        
+        results = await asyncio.gather(flights.run('a', failing), flights.run('a', failing),
+                                       return_exceptions=True)
+        
+        assert all(isinstance(result, ValueError) for result in results)
+        assert not flights.in_flight('a')
+    
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_shared_call(self):
+        """Test a caller giving up leaves the call running for the others."""
+        import asyncio
+        from ai.worker_pool import SingleFlight
+        
+        flights = SingleFlight()
+        async def generate():
+            await asyncio.sleep(0.05)
+            return 'done'
+        
+        first = asyncio.ensure_future(flights.run('a', generate))
+        second = asyncio.ensure_future(flights.run('a', generate))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        
+        assert await second == 'done'
+
+class TestBatchCategorization:
+    """Test categorizing several articles in one prompt."""
+    
+    def _client(self):
+        from ai.lm_studio_client import LMStudioClient
+        
+        client = LMStudioClient(base_url="http://localhost:1234")
+        client._available = True
+        client._model_id = "test-model"
+        client._checked_at = time.monotonic()
+        return client
+    
+    def _chat_response(self, content):
+        response = Mock()
+        response.status_code = 200
+        response.json.return_value = {"choices": [{"message": {"content": content}}]}
+        return response
+    
+    def test_batch_uses_single_request(self):
+        """Test a batch is answered by one completion with per-article results."""
+        import json as json_lib
+        
+        articles = [
+            {"title": "Chip launch", "content": "A new processor."},
+            {"title": "Election", "content": "Votes counted."},
+        ]
+        reply = json_lib.dumps([
+            {"article": 2, "category": "politics", "topics": ["election"], "political_bias": "0.1"},
+            {"article": 1, "category": "technology", "topics": ["chips"]},
+        ])
+        
+        client = self._client()
+        with patch.object(client.session, 'post', return_value=self._chat_response(reply)) as mock_post:
+            results = client.categorize_articles(articles)
+        
+        assert mock_post.call_count == 1
+        prompt = mock_post.call_args.kwargs['json']['messages'][0]['content']
+        assert prompt.count("For political bias analysis") == 1
+        assert [result["category"] for result in results] == ["technology", "politics"]
+        assert results[1]["political_bias"] == 0.1
+    
+    def test_invalid_items_fall_back_to_single_calls(self):
+        """Test items missing from or invalid in the batch reply are retried alone."""
+        from ai.lm_studio_client import LMStudioClient
+        
+        articles = [
+            {"title": "First", "content": "One."},
+            {"title": "Second", "content": "Two."},
+            {"title": "Third", "content": "Three."},
+        ]
+        reply = 'Here you go: [{"article": 1, "category": "science"}, {"article": 2, "topics": "not-a-list"}]'
+        
+        client = self._client()
+        with patch.object(client.session, 'post', return_value=self._chat_response(reply)):
+            results = client.categorize_articles(articles)
+        
+        assert results[0]["category"] == "science"
+        # categorize_article is mocked in conftest and answers "technology"
+        assert results[1]["category"] == "technology"
+        assert results[2]["category"] == "technology"
+        assert LMStudioClient.categorize_article.call_count == 2
+    
+    def test_session_is_reused(self):
+        """Test every request goes through the client's pooled session."""
+        client = self._client()
+        with patch.object(client.session, 'post', return_value=self._chat_response('{"category": "world"}')) as mock_post, \
+             patch('requests.post') as module_post:
+            client.categorize_articles([{"title": "A", "content": "a"}, {"title": "B", "content": "b"}])
+            client._chat_completion("system", "prompt", "test-model", max_tokens=10)
+        
+        assert mock_post.call_count == 2
+        module_post.assert_not_called()
+        adapter = client.session.get_adapter("http://localhost:1234")
+        assert adapter._pool_maxsize >= 1
+
+class TestSummaryStreaming:
+    """Test relaying streamed completions."""
+    
+    def test_stream_yields_deltas_and_caches_summary(self, file_db):
+        """Test SSE deltas are yielded in order and the joined text is cached."""
+        from unittest.mock import MagicMock
+        from ai.llm_cache import LLMCache
+        from ai.lm_studio_client import LMStudioClient
+        
+        client = LMStudioClient(base_url="http://localhost:1234", cache=LLMCache(file_db, max_entries=10))
+        client._available = True
+        client._model_id = "test-model"
+        client._checked_at = time.monotonic()
+        
+        response = MagicMock(status_code=200)
+        response.__enter__.return_value = response
+        response.iter_lines.return_value = [
+            b'data: {"choices": [{"delta": {"role": "assistant"}}]}',
+            b'',
+            b'data: {"choices": [{"delta": {"content": "Rates "}}]}',
+            b'data: {"choices": [{"delta": {"content": "rose."}}]}',
+            b'data: [DONE]',
+        ]
+        with patch.object(client.session, 'post', return_value=response) as mock_post:
+            chunks = list(client.stream_summary("The bank raised rates."))
+            cached = list(client.stream_summary("The bank raised rates."))
+        
+        assert chunks == ["Rates ", "rose."]
+        assert cached == ["Rates rose."]
+        assert mock_post.call_count == 1
+        assert mock_post.call_args.kwargs['json']['stream'] is True
+        assert mock_post.call_args.kwargs['stream'] is True
+    
+    def test_stream_errors_are_raised(self):
+        """Test a failed stream raises instead of yielding a placeholder summary."""
+        from ai.lm_studio_client import LMStudioClient
+        
+        client = LMStudioClient(base_url="http://localhost:1234")
+        client._available = True
+        client._model_id = "test-model"
+        client._checked_at = time.monotonic()
+        with patch.object(client.session, 'post', side_effect=requests.exceptions.ConnectionError()):
+            with pytest.raises(requests.exceptions.ConnectionError):
+                list(client.stream_summary("Some content"))
+        
+        assert client._available is False
+
+class TestLLMCache:
+    """Test the persistent LLM result cache."""
+    
+    def _client(self, cache, model="test-model"):
+        from ai.lm_studio_client import LMStudioClient
+        
+        client = LMStudioClient(base_url="http://localhost:1234", cache=cache)
+        client._available = True
+        client._model_id = model
+        client._checked_at = time.monotonic()
+        return client
+    
+    def test_repeated_text_skips_the_model(self, file_db):
+        """Test re-analyzing the same text, modulo whitespace, makes no request."""
+        import json as json_lib
+        from ai.llm_cache import LLMCache
+        
+        cache = LLMCache(file_db, max_entries=100)
+        articles = [
+            {"title": "Chip launch", "content": "A new processor."},
+            {"title": "Election", "content": "Votes counted."},
+        ]
+        reply = json_lib.dumps([{"article": 1, "category": "technology"}, {"article": 2, "category": "politics"}])
+        response = Mock(status_code=200)
+        response.json.return_value = {"choices": [{"message": {"content": reply}}]}
+        
+        client = self._client(cache)
+        with patch.object(client.session, 'post', return_value=response) as mock_post:
+            first = client.categorize_articles(articles)
+            again = client.categorize_articles([
+                {"title": "Chip  launch", "content": " A new processor.\n"},
+                {"title": "Election", "content": "Votes counted."},
+            ])
+        
+        assert mock_post.call_count == 1
+        assert again == first
+        stats = cache.stats()["kinds"]["analysis"]
+        assert (stats["hits"], stats["misses"], stats["entries"]) == (2, 2, 2)
+    
+    def test_model_is_part_of_the_key(self, file_db):
+        """Test a result cached for one model is not reused for another."""
+        from ai.llm_cache import LLMCache
+        
+        cache = LLMCache(file_db, max_entries=100)
+        key = cache.key('summary', 'model-a', 1, "Some article text")
+        cache.put(key, 'summary', 'model-a', "A summary.")
+        
+        assert cache.get(key, 'summary') == "A summary."
+        assert cache.get(cache.key('summary', 'model-b', 1, "Some article text"), 'summary') is None
+        assert cache.get(cache.key('summary', 'model-a', 2, "Some article text"), 'summary') is None
+    
+    def test_least_recently_used_entries_are_evicted(self, file_db):
+        """Test the table stays within max_entries, keeping recently read results."""
+        from ai.llm_cache import LLMCache
+        
+        cache = LLMCache(file_db, max_entries=2)
+        keys = [cache.key('summary', 'm', 1, f"text {i}") for i in range(3)]
+        cache.put(keys[0], 'summary', 'm', "zero")
+        time.sleep(0.01)
+        cache.put(keys[1], 'summary', 'm', "one")
+        time.sleep(0.01)
+        assert cache.get(keys[0], 'summary') == "zero"
+        time.sleep(0.01)
+        cache.put(keys[2], 'summary', 'm', "two")
+        
+        assert cache.get(keys[1], 'summary') is None
+        assert cache.get(keys[0], 'summary') == "zero"
+        assert cache.get(keys[2], 'summary') == "two"
+        assert cache.stats()["evictions"] == 1
+    
+    def test_lookups_do_not_write(self, file_db, monkeypatch):
+        """Test cache reads never take the writer; hits are written in one batch later."""
+        from ai.llm_cache import LLMCache
+        
+        cache = LLMCache(file_db, max_entries=100)
+        keys = [cache.key('analysis', 'm', 1, f"text {i}") for i in range(3)]
+        cache.put_many([(key, 'analysis', 'm', {"category": "technology"}) for key in keys[:2]])
+        
+        writer = file_db._writer
+        def no_writes():
+            raise AssertionError("cache lookup took the writer")
+        monkeypatch.setattr(file_db, '_writer', no_writes)
+        assert cache.get_many(keys, 'analysis') == [{"category": "technology"}] * 2 + [None]
+        assert cache.get(keys[0], 'analysis') == {"category": "technology"}
+        assert cache.stats()["kinds"]["analysis"]["lifetime_hits"] == 3
+        
+        monkeypatch.setattr(file_db, '_writer', writer)
+        cache.flush()
+        assert file_db.get_llm_cache_stats()["analysis"]["hits"] == 3
+        assert cache.stats()["kinds"]["analysis"]["lifetime_hits"] == 3
+
+class TestHashingEmbedder:
+    """Test the local embedding engine."""
+    
+    def test_batch_output_is_normalized_float32(self):
+        """Test embeddings are unit-length float32 rows of fixed size."""
+        import numpy as np
+        from ai.embeddings import HashingEmbedder
+        
+        embedder = HashingEmbedder(dim=384)
+        matrix = embedder.embed_batch(["Central bank raises interest rates", "New smartphone released", ""])
+        
+        assert matrix.dtype == np.float32
+        assert matrix.shape == (3, 384)
+        assert np.allclose(np.linalg.norm(matrix[:2], axis=1), 1.0, atol=1e-5)
+        assert not matrix[2].any()
+        assert np.array_equal(matrix[0], embedder.embed("Central bank raises interest rates"))
+    
+    def test_related_texts_are_closer(self):
+        """Test texts sharing vocabulary score higher than unrelated ones."""
+        from ai.embeddings import HashingEmbedder
+        
+        embedder = HashingEmbedder()
+        base, related, unrelated = embedder.embed_batch([
+            "Federal Reserve raises interest rates to fight inflation",
+            "Inflation pressures push the Federal Reserve toward higher interest rates",
+            "Local team wins championship after dramatic overtime goal",
+        ])
+        
+        assert float(base @ related) > float(base @ unrelated) + 0.2
+    
+    def test_client_generate_embedding(self):
+        """Test the client exposes embeddings with the recorded dimensionality."""
+        from ai.lm_studio_client import LMStudioClient
+        
+        client = LMStudioClient(base_url="http://localhost:1234")
+        embedding = client.generate_embedding("Some article text")
+        
+        assert len(embedding) == client.embedder.dim
+        assert client.generate_embeddings(["a text", "another text"]).shape == (2, client.embedder.dim)
+
+class TestRelevanceScorer:
+    """Test vectorized relevance scoring."""
+    
+    def test_score_all_matches_pairwise_cosine(self):
+        """Test bulk scores equal the single-pair cosine mapping."""
+        import numpy as np
+        from ai.relevance import RelevanceScorer
+        
+        rng = np.random.default_rng(0)
+        embeddings = rng.normal(size=(2500, 16)).astype(np.float32)
+        preference = rng.normal(size=16).astype(np.float32)
+        
+        scorer = RelevanceScorer(16)
+        scorer.load(np.arange(2500), embeddings, np.zeros(2500))
+        ids, scores = scorer.score_all(preference[None, :] / np.linalg.norm(preference), np.ones(1))
+        
+        expected = [
+            (np.dot(e, preference) / (np.linalg.norm(e) * np.linalg.norm(preference)) + 1) / 2
+            for e in embeddings[:5]
+        ]
+        assert len(ids) == 2500
+        assert np.allclose(scores[:5], expected, atol=1e-5)
+    
+    def test_upsert_replaces_and_appends(self):
+        """Test upserting keeps one row per article and applies boosts."""
+        import numpy as np
+        from ai.relevance import RelevanceScorer
+        
+        scorer = RelevanceScorer(2)
+        scorer.upsert([1, 2], np.array([[1, 0], [0, 1]]), [0.0, 0.0])
+        scorer.upsert([2, 3], np.array([[1, 0], [-1, 0]]), [0.25, 0.0])
+        
+        ids, scores = scorer.score_all(np.array([[1.0, 0.0]]), np.ones(1))
+        by_id = dict(zip(ids.tolist(), scores.tolist()))
+        
+        assert len(scorer) == 3
+        assert by_id[1] == pytest.approx(1.0)
+        assert by_id[2] == pytest.approx(1.0)  # capped after the 0.25 boost
+        assert by_id[3] == pytest.approx(0.0)
+    
+    def test_no_preferences_keeps_neutral_score(self):
+        """Test articles score 0.5 plus their boost without preferences."""
+        import numpy as np
+        from ai.relevance import score_embeddings
+        
+        scores = score_embeddings(np.eye(3, dtype=np.float32), np.array([0.0, 0.5, 0.1], dtype=np.float32),
+                                  np.empty((0, 3), dtype=np.float32), np.empty(0))
+        assert np.allclose(scores, [0.5, 1.0, 0.6])
@@ -168,7 +168,590 @@ class TestRefreshEndpoint:
     """Test the refresh feeds endpoint."""
     
     def test_refresh_feeds(self, test_client):
-        """Test refreshing feeds."""
+        """Test refreshing feeds starts a background job."""
         response = test_client.post("/refresh")
-        # Should return 200 even if no feeds are configured
-        assert response.status_code in [200, 500]  # 500 if no feeds or LM Studio issues
\ No newline at end of file
+        assert response.status_code == 202
+        
+        job_id = response.json()["job_id"]
+        response = test_client.get(f"/refresh/{job_id}")
+        assert response.status_code == 200
+        assert response.json()["status"] in ["pending", "running", "completed", "failed"]
+    
+    def test_unknown_refresh_job(self, test_client):
+        """Test polling an unknown job returns 404."""
+        response = test_client.get("/refresh/does-not-exist")
+        assert response.status_code == 404
+
+class TestRefreshManager:
+    """Test background refresh job handling."""
+    
+    @pytest.mark.asyncio
+    async def test_second_start_joins_running_job(self):
+        """Test starting a refresh while one runs returns the same job."""
+        import asyncio
+        from jobs.refresh import RefreshManager
+        
+        release = asyncio.Event()
+        runs = []
+        async def run(job):
+            runs.append(job.id)
+            job.advance(feeds_total=2, feeds_fetched=1)
+            await release.wait()
+        
+        manager = RefreshManager()
+        first, started = manager.start(run)
+        second, joined_started = manager.start(run)
+        await asyncio.sleep(0)
+        
+        assert started and not joined_started
+        assert second is first
+        assert first.status == 'running'
+        assert first.to_dict()['progress']['feeds_fetched'] == 1
+        
+        release.set()
+        await manager.wait(first)
+        assert first.status == 'completed'
+        assert runs == [first.id]
+        
+        third, started = manager.start(run)
+        assert started and third is not first
+        release.set()
+        await manager.wait(third)
+    
+    @pytest.mark.asyncio
+    async def test_failed_job_reports_error(self):
+        """Test an exception in the refresh marks the job failed."""
+        from jobs.refresh import RefreshManager
+        
+        async def run(job):
+            raise RuntimeError("feeds unavailable")
+        
+        manager = RefreshManager()
+        job, _ = manager.start(run)
+        await manager.wait(job)
+        
+        assert job.status == 'failed'
+        assert job.error == 'feeds unavailable'
+        assert manager.get(job.id) is job
+    
+    @pytest.mark.asyncio
+    async def test_full_refresh_queues_behind_partial_job(self):
+        """Test a full refresh requested during a scheduled partial one runs after it."""
+        import asyncio
+        from jobs.refresh import RefreshManager
+        
+        release = asyncio.Event()
+        runs = []
+        async def run(job):
+            runs.append(job.scope)
+            await release.wait()
+        
+        manager = RefreshManager()
+        partial_job, _ = manager.start(run, scope='due')
+        full, started = manager.start(run)
+        joined, joined_started = manager.start(run)
+        await asyncio.sleep(0)
+        
+        assert started and full is not partial_job
+        assert full.status == 'queued' and full.to_dict()['scope'] == 'all'
+        assert joined is full and not joined_started
+        
+        release.set()
+        await manager.wait(full)
+        assert partial_job.status == 'completed' and full.status == 'completed'
+        assert runs == ['due', 'all']
+    
+    @pytest.mark.asyncio
+    async def test_stop_cancels_queued_job(self):
+        """Test shutdown cancels a queued refresh along with the running one."""
+        import asyncio
+        from jobs.refresh import RefreshManager
+        
+        async def run(job):
+            await asyncio.Event().wait()
+        
+        manager = RefreshManager()
+        running, _ = manager.start(run, scope='due')
+        queued, _ = manager.start(run)
+        await asyncio.sleep(0)
+        await manager.stop()
+        
+        assert running.status == 'failed' and queued.status == 'failed'
+        assert queued.error == 'cancelled'
+        assert manager.current is None
+
+class TestRefreshPipeline:
+    """Test refresh pipeline helpers."""
+    
+    def test_select_new_articles_skips_known(self, file_db, monkeypatch):
+        """Test unchanged stored articles are not sent for analysis again."""
+        import backend.main as main
+        monkeypatch.setattr(main, 'db', file_db)
+        
+        file_db.insert_article({'title': 'Same', 'url': 'https://example.com/same', 'guid': 'same',
+                                'content_hash': 'h1', 'category': 'technology'})
+        file_db.insert_article({'title': 'Edited', 'url': 'https://example.com/edited', 'guid': 'edited',
+                                'content_hash': 'old', 'category': 'technology'})
+        file_db.insert_article({'title': 'Unanalyzed', 'url': 'https://example.com/unanalyzed', 'content_hash': 'h4'})
+        file_db.insert_article({'title': 'Fallback', 'url': 'https://example.com/fallback', 'content_hash': 'h5',
+                                'category': 'uncategorized'})
+        
+        articles = [
+            {'title': 'Same', 'url': 'https://example.com/same', 'guid': 'same', 'content_hash': 'h1'},
+            {'title': 'Edited', 'url': 'https://example.com/edited', 'guid': 'edited', 'content_hash': 'new'},
+            {'title': 'New', 'url': 'https://example.com/new', 'guid': 'new', 'content_hash': 'h3'},
+            {'title': 'New', 'url': 'https://example.com/new', 'guid': 'new', 'content_hash': 'h3'},
+            {'title': 'Unanalyzed', 'url': 'https://example.com/unanalyzed', 'content_hash': 'h4'},
+            {'title': 'Fallback', 'url': 'https://example.com/fallback', 'content_hash': 'h5'},
+        ]
+        
+        selected = main.select_new_articles(articles)
+        
+        assert [article['url'] for article in selected] == [
+            'https://example.com/edited', 'https://example.com/new',
+            'https://example.com/unanalyzed', 'https://example.com/fallback',
+        ]
+    
+    def test_preference_change_rescores_articles(self, file_db, monkeypatch):
+        """Test saving a preference re-ranks stored articles by embedding similarity."""
+        import backend.main as main
+        from ai.relevance import RelevanceScorer
+        monkeypatch.setattr(main, 'db', file_db)
+        monkeypatch.setattr(main, 'scorer', RelevanceScorer(main.lm_studio.embedder.dim))
+        
+        articles = [
+            {'title': 'Quantum computing breakthrough', 'content': 'Researchers build a faster quantum processor chip.',
+             'url': 'https://example.com/tech'},
+            {'title': 'Football final', 'content': 'The home team won the cup final on penalties.',
+             'url': 'https://example.com/sport'},
+        ]
+        main.embed_articles(articles)
+        for article in articles:
+            file_db.insert_article(article)
+        
+        client = TestClient(main.app)
+        response = client.post("/preferences", json={"category": "technology",
+                                                     "keywords": ["quantum computing", "processor chip"]})
+        assert response.status_code == 200
+        
+        ranked = file_db.get_articles()
+        assert ranked[0]['url'] == 'https://example.com/tech'
+        assert ranked[0]['relevance_score'] > ranked[1]['relevance_score']
+
+    def test_near_duplicates_share_one_story(self, file_db, monkeypatch):
+        """Test syndicated copies skip analysis, point at their story and are collapsed."""
+        import backend.main as main
+        from content.dedup import SimHashIndex
+        from database.models import ARTICLE_CARD_FIELDS
+        monkeypatch.setattr(main, 'db', file_db)
+        monkeypatch.setattr(main, 'stories', SimHashIndex(max_distance=6, window=3600))
+        
+        content = ("The central bank raised interest rates by a quarter point on Wednesday, "
+                   "citing persistent inflation and a strong labour market.")
+        first = [
+            {'title': 'Rates rise again', 'content': content, 'url': 'https://wire.example.com/rates'},
+            {'title': 'Rates rise again', 'content': content + ' Reporting by staff.',
+             'url': 'https://paper.example.com/rates'},
+        ]
+        main.embed_articles(first)
+        representatives, copies = main.cluster_articles(first)
+        assert representatives == [first[0]]
+        representatives[0]['category'] = 'business'
+        main.store_articles(first, [], copies)
+        
+        # Reload the index from the database, as after a restart
+        main.stories.loaded = False
+        later = [{'title': 'Rates rise again', 'content': content, 'url': 'https://blog.example.com/rates'}]
+        main.embed_articles(later)
+        representatives, copies = main.cluster_articles(later)
+        assert representatives == [] and copies == []
+        main.store_articles(later, [], copies)
+        
+        story = file_db.get_articles(fields=ARTICLE_CARD_FIELDS, collapse=True)
+        assert [a['url'] for a in story] == ['https://wire.example.com/rates']
+        assert story[0]['duplicate_count'] == 2
+        assert all(a['category'] == 'business' for a in file_db.get_articles())
+    
+    @pytest.mark.asyncio
+    async def test_failed_store_keeps_next_fetch_unconditional(self, file_db, monkeypatch):
+        """Test a feed's validators are only saved once its articles are stored."""
+        import backend.main as main
+        from unittest.mock import Mock
+        from content.feed_parser import FeedParser
+        from jobs.refresh import RefreshJob
+        monkeypatch.setattr(main, 'db', file_db)
+        monkeypatch.setattr(main, 'parser', FeedParser())
+        
+        async def analyze(articles, preferences):
+            for article in articles:
+                article['category'] = 'technology'
+            return len(articles)
+        monkeypatch.setattr(main, 'analyze_articles', analyze)
+        
+        feed_id = file_db.insert_feed({'title': 'Feed', 'url': 'https://example.com/rss'})
+        body = (b'<?xml version="1.0"?><rss version="2.0"><channel><title>Feed</title>'
+                b'<item><title>First</title><link>https://example.com/first</link></item>'
+                b'</channel></rss>')
+        get = Mock(return_value=Mock(status_code=200, headers={'ETag': '"v1"'},
+                                     iter_content=Mock(return_value=[body])))
+        monkeypatch.setattr(main.parser.session, 'get', get)
+        
+        insert_articles = file_db.insert_articles
+        monkeypatch.setattr(file_db, 'insert_articles', lambda articles: {
+            'inserted': 0, 'updated': 0, 'skipped': len(articles),
+            'ids': [None] * len(articles), 'error': 'disk I/O error'})
+        await main.run_refresh(RefreshJob(), feeds=file_db.get_active_feeds())
+        
+        feed = file_db.get_active_feeds()[0]
+        assert feed['etag'] is None and feed['content_hash'] is None
+        
+        monkeypatch.setattr(file_db, 'insert_articles', insert_articles)
+        await main.run_refresh(RefreshJob(), feeds=[feed])
+        
+        assert 'If-None-Match' not in get.call_args.kwargs['headers']
+        assert [a['url'] for a in file_db.get_articles()] == ['https://example.com/first']
+        assert file_db.get_active_feeds()[0]['etag'] == '"v1"'
+    
+    @pytest.mark.asyncio
+    async def test_article_stored_while_model_down_is_analyzed_later(self, file_db, monkeypatch):
+        """Test an article ingested while LM Studio is unavailable is analyzed on the next refresh."""
+        import backend.main as main
+        from unittest.mock import Mock
+        from ai.worker_pool import LLMWorkerPool
+        from content.dedup import SimHashIndex
+        from content.feed_parser import FeedParser
+        from jobs.refresh import RefreshJob
+        monkeypatch.setattr(main, 'db', file_db)
+        monkeypatch.setattr(main, 'parser', FeedParser())
+        monkeypatch.setattr(main, 'stories', SimHashIndex(max_distance=6, window=3600))
+        monkeypatch.setattr(main, 'llm_pool', LLMWorkerPool(concurrency=2, timeout=5))
+        
+        file_db.insert_feed({'title': 'Feed', 'url': 'https://example.com/rss'})
+        body = (b'<?xml version="1.0"?><rss version="2.0"><channel><title>Feed</title>'
+                b'<item><title>Chip launch</title><link>https://example.com/chip</link>'
+                b'<description>A new processor ships with twice the cores.</description></item>'
+                b'</channel></rss>')
+        get = Mock(return_value=Mock(status_code=200, headers={'ETag': '"v1"'},
+                                     iter_content=Mock(return_value=[body])))
+        monkeypatch.setattr(main.parser.session, 'get', get)
+        categorize = Mock(side_effect=lambda articles, **kwargs: [
+            dict(main.lm_studio.default_analysis(article['title']), category='technology')
+            for article in articles])
+        monkeypatch.setattr(main.lm_studio, 'categorize_articles', categorize)
+        
+        monkeypatch.setattr(main.lm_studio, 'is_available', Mock(return_value=False))
+        await main.run_refresh(RefreshJob(), feeds=file_db.get_active_feeds())
+        
+        assert file_db.get_articles()[0]['category'] is None
+        assert file_db.get_active_feeds()[0]['etag'] is None
+        
+        monkeypatch.setattr(main.lm_studio, 'is_available', Mock(return_value=True))
+        await main.run_refresh(RefreshJob(), feeds=file_db.get_active_feeds())
+        
+        assert 'If-None-Match' not in get.call_args.kwargs['headers']
+        assert categorize.call_count == 1
+        stored = file_db.get_articles()
+        assert len(stored) == 1
+        assert stored[0]['category'] == 'technology'
+        assert stored[0]['duplicate_of'] is None
+        
+        await main.run_refresh(RefreshJob(), feeds=file_db.get_active_feeds())
+        await main.llm_pool.stop()
+        assert get.call_args.kwargs['headers']['If-None-Match'] == '"v1"'
+    
+    @pytest.mark.asyncio
+    async def test_feeds_are_analyzed_concurrently(self, file_db, monkeypatch):
+        """Test one feed's analysis does not wait for another feed's to finish."""
+        import threading
+        import backend.main as main
+        from unittest.mock import Mock
+        from ai.worker_pool import LLMWorkerPool
+        from content.dedup import SimHashIndex
+        from content.feed_parser import FeedParser
+        from jobs.refresh import RefreshJob
+        monkeypatch.setattr(main, 'db', file_db)
+        monkeypatch.setattr(main, 'parser', FeedParser())
+        monkeypatch.setattr(main, 'stories', SimHashIndex(max_distance=6, window=3600))
+        monkeypatch.setattr(main, 'llm_pool', LLMWorkerPool(concurrency=2, timeout=5))
+        monkeypatch.setattr(main.lm_studio, 'is_available', Mock(return_value=True))
+        
+        bodies = {
+            'https://a.example.com/rss': (b'<?xml version="1.0"?><rss version="2.0"><channel><title>A</title>'
+                                          b'<item><title>Chip launch</title><link>https://a.example.com/chip</link>'
+                                          b'<description>A new processor ships with twice the cores.</description>'
+                                          b'</item></channel></rss>'),
+            'https://b.example.com/rss': (b'<?xml version="1.0"?><rss version="2.0"><channel><title>B</title>'
+                                          b'<item><title>Harvest report</title><link>https://b.example.com/crops</link>'
+                                          b'<description>Wheat yields rose after a wet spring.</description>'
+                                          b'</item></channel></rss>'),
+        }
+        for url in bodies:
+            file_db.insert_feed({'title': url, 'url': url})
+        monkeypatch.setattr(main.parser.session, 'get', lambda url, **kwargs: Mock(
+            status_code=200, headers={}, iter_content=Mock(return_value=[bodies[url]])))
+        
+        # Each call only returns once both feeds' calls are in flight
+        both_running = threading.Barrier(2, timeout=5)
+        def categorize(articles, **kwargs):
+            both_running.wait()
+            return [dict(main.lm_studio.default_analysis(article['title']), category='technology')
+                    for article in articles]
+        monkeypatch.setattr(main.lm_studio, 'categorize_articles', categorize)
+        
+        job = RefreshJob()
+        await main.run_refresh(job, feeds=file_db.get_active_feeds())
+        await main.llm_pool.stop()
+        
+        assert not both_running.broken
+        assert job.progress['articles_analyzed'] == 2
+        assert [a['category'] for a in file_db.get_articles()] == ['technology', 'technology']
+    
+    @pytest.mark.asyncio
+    async def test_copy_in_later_feed_waits_for_first_copy(self, file_db, monkeypatch):
+        """Test a story carried by two feeds is analyzed once and linked across feeds."""
+        import asyncio
+        import backend.main as main
+        from unittest.mock import Mock
+        from content.dedup import SimHashIndex
+        from content.feed_parser import FeedParser
+        from jobs.refresh import RefreshJob
+        monkeypatch.setattr(main, 'db', file_db)
+        monkeypatch.setattr(main, 'parser', FeedParser())
+        monkeypatch.setattr(main, 'stories', SimHashIndex(max_distance=6, window=3600))
+        
+        analyzed = []
+        async def analyze(articles, preferences):
+            await asyncio.sleep(0.05)
+            for article in articles:
+                article['category'] = 'business'
+            analyzed.extend(articles)
+            return len(articles)
+        monkeypatch.setattr(main, 'analyze_articles', analyze)
+        
+        item = (b'<item><title>Central bank raises interest rates by half a point</title><link>{}</link>'
+                b'<description>The central bank raised its benchmark interest rate by half a percentage '
+                b'point on Tuesday to curb inflation.</description></item>')
+        bodies = {
+            url: b'<?xml version="1.0"?><rss version="2.0"><channel><title>Feed</title>'
+                 + item.replace(b'{}', link) + b'</channel></rss>'
+            for url, link in [('https://wire.example.com/rss', b'https://wire.example.com/rates'),
+                              ('https://paper.example.com/rss', b'https://paper.example.com/rates')]
+        }
+        for url in bodies:
+            file_db.insert_feed({'title': url, 'url': url})
+        monkeypatch.setattr(main.parser.session, 'get', lambda url, **kwargs: Mock(
+            status_code=200, headers={}, iter_content=Mock(return_value=[bodies[url]])))
+        
+        await main.run_refresh(RefreshJob(), feeds=file_db.get_active_feeds())
+        
+        assert len(analyzed) == 1
+        stored = {a['url']: a for a in file_db.get_articles()}
+        first, copy = analyzed[0]['url'], ({*stored} - {analyzed[0]['url']}).pop()
+        assert stored[copy]['duplicate_of'] == stored[first]['id']
+        assert stored[copy]['category'] == 'business'
+    
+    def test_embedding_model_change_backfills_embeddings(self, file_db, monkeypatch):
+        """Test articles cleared by an embedding model change are embedded again."""
+        import numpy as np
+        import backend.main as main
+        monkeypatch.setattr(main, 'db', file_db)
+        embedder = main.lm_studio.embedder
+        
+        file_db.ensure_embedding_model('old-model', 8)
+        for i in range(5):
+            file_db.insert_article({'title': f'Article {i}', 'content': f'Story number {i}',
+                                    'url': f'https://example.com/{i}', 'embedding': [1.0] * 8})
+        
+        assert file_db.ensure_embedding_model(embedder.name, embedder.dim) is True
+        assert len(file_db.get_article_embeddings(embedder.dim)[0]) == 0
+        
+        assert main.backfill_embeddings(batch_size=2) == 5
+        ids, embeddings, _ = file_db.get_article_embeddings(embedder.dim)
+        assert len(ids) == 5
+        expected = embedder.embed_batch(['Article 0 Story number 0'])[0]
+        assert np.allclose(embeddings[list(ids).index(1)], expected)
+        assert main.backfill_embeddings() == 0
+
+class TestArticleCursor:
+    """Test cursor pagination on GET /articles."""
+    
+    def test_next_cursor_pages_forward(self, file_db, monkeypatch):
+        """Test following next_cursor returns the following page."""
+        import backend.main as main
+        monkeypatch.setattr(main, 'db', file_db)
+        for i in range(5):
+            file_db.insert_article({'title': f'Article {i}', 'url': f'https://example.com/{i}',
+                                    'relevance_score': 0.1 * i})
+        
+        client = TestClient(main.app)
+        first = client.get("/articles?limit=2").json()
+        second = client.get(f"/articles?limit=2&cursor={first['next_cursor']}").json()
+        by_offset = client.get("/articles?limit=2&offset=2").json()
+        
+        assert [a['title'] for a in first['articles']] == ['Article 4', 'Article 3']
+        assert [a['id'] for a in second['articles']] == [a['id'] for a in by_offset['articles']]
+    
+    def test_invalid_cursor(self, test_client):
+        """Test a malformed cursor is rejected."""
+        response = test_client.get("/articles?cursor=not-a-cursor")
+        assert response.status_code == 400
+    
+    def test_cursor_with_invalid_values(self, test_client):
+        """Test a well-formed cursor holding non-scalar values or a non-integer id is rejected."""
+        from backend.main import encode_cursor
+        
+        for position in ([[0.5], '2025-01-01', 1], (0.5, {'a': 1}, 1), (0.5, '2025-01-01', '1'),
+                         (0.5, '2025-01-01', 1.5), (0.5, None, 1), (True, '2025-01-01', 1)):
+            response = test_client.get(f"/articles?cursor={encode_cursor(position)}")
+            assert response.status_code == 400, position
+
+class TestArticleProjection:
+    """Test field projection on GET /articles."""
+    
+    def _client(self, file_db, monkeypatch):
+        import backend.main as main
+        monkeypatch.setattr(main, 'db', file_db)
+        file_db.insert_article({'title': 'Card', 'url': 'https://example.com/card', 'content': 'x' * 5000,
+                                'bias_reasoning': 'long reasoning', 'embedding': [0.1] * 384})
+        return TestClient(main.app)
+    
+    def test_default_card_view(self, file_db, monkeypatch):
+        """Test list pages skip heavy columns and include a snippet."""
+        client = self._client(file_db, monkeypatch)
+        article = client.get("/articles").json()['articles'][0]
+        
+        assert article['title'] == 'Card'
+        assert article['snippet'] == 'x' * 200
+        for heavy in ('content', 'bias_reasoning', 'embedding'):
+            assert heavy not in article
+    
+    def test_explicit_fields(self, file_db, monkeypatch):
+        """Test fields= selects columns, always keeping the cursor keys."""
+        client = self._client(file_db, monkeypatch)
+        article = client.get("/articles?fields=title,url").json()['articles'][0]
+        
+        assert set(article) == {'id', 'title', 'url', 'relevance_score', 'published'}
+    
+    def test_full_view_and_unknown_fields(self, file_db, monkeypatch):
+        """Test the full view returns content and unknown fields are rejected."""
+        client = self._client(file_db, monkeypatch)
+        
+        article = client.get("/articles?fields=full").json()['articles'][0]
+        assert len(article['content']) == 5000
+        assert 'embedding' not in article
+        
+        assert client.get("/articles?fields=title,password").status_code == 400
+
+class TestBlockingOffload:
+    """Test blocking work runs off the event loop."""
+    
+    @pytest.mark.asyncio
+    async def test_run_blocking_keeps_loop_responsive(self):
+        """Test the event loop keeps running while a blocking call is in flight."""
+        import asyncio
+        import threading
+        import time
+        import backend.main as main
+        
+        threads = []
+        def slow():
+            threads.append(threading.current_thread().name)
+            time.sleep(0.3)
+            return 'done'
+        
+        task = asyncio.ensure_future(main.run_blocking(slow))
+        started = time.monotonic()
+        await asyncio.sleep(0.01)
+        assert time.monotonic() - started < 0.2
+        assert not task.done()
+        
+        assert await task == 'done'
+        assert threads[0].startswith('api-blocking')
+
+class TestSummaryCoalescing:
+    """Test concurrent summary requests share one generation."""
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_share_one_llm_call(self, file_db, monkeypatch):
+        """Test simultaneous clicks on one article make a single summarize call."""
+        import asyncio
+        import time
+        import backend.main as main
+        from ai.lm_studio_client import LMStudioClient
+        from ai.worker_pool import LLMWorkerPool
+        monkeypatch.setattr(main, 'db', file_db)
+        monkeypatch.setattr(main, 'llm_pool', LLMWorkerPool(concurrency=4, timeout=5))
+        
+        def slow_summary(*args, **kwargs):
+            time.sleep(0.1)
+            return "Shared summary."
+        LMStudioClient.summarize_article.side_effect = slow_summary
+        
+        article_id = file_db.insert_article({'title': 'Popular', 'content': 'Everyone reads this.',
+                                             'url': 'https://example.com/popular'})
+        results = await asyncio.gather(*[main.generate_ai_summary(article_id) for _ in range(5)])
+        await main.llm_pool.stop()
+        
+        assert [result['summary'] for result in results] == ["Shared summary."] * 5
+        assert LMStudioClient.summarize_article.call_count == 1
+        assert not main.summary_flights.in_flight(article_id)
+        assert file_db.get_article_by_id(article_id)['ai_summary'] == "Shared summary."
+    
+    def test_summary_stream_relays_tokens_and_saves(self, file_db, monkeypatch):
+        """Test the SSE endpoint sends token events, then done, and stores the summary."""
+        import json as json_lib
+        import backend.main as main
+        from ai.worker_pool import LLMWorkerPool
+        monkeypatch.setattr(main, 'db', file_db)
+        monkeypatch.setattr(main, 'llm_pool', LLMWorkerPool(concurrency=1, timeout=5))
+        monkeypatch.setattr(main.lm_studio, 'stream_summary', lambda content: iter(["Rates ", "rose ", "again."]))
+        
+        article_id = file_db.insert_article({'title': 'Rates', 'content': 'The bank raised rates.',
+                                             'url': 'https://example.com/rates'})
+        client = TestClient(main.app)
+        response = client.get(f"/articles/{article_id}/summary/stream")
+        
+        assert response.status_code == 200
+        assert response.headers['content-type'].startswith('text/event-stream')
+        events = [(block.split('\n')[0][len('event: '):], json_lib.loads(block.split('\n')[1][len('data: '):]))
+                  for block in response.text.strip().split('\n\n')]
+        assert [text['text'] for event, text in events if event == 'token'] == ["Rates ", "rose ", "again."]
+        assert events[-1] == ('done', {"summary": "Rates rose again.", "cached": False})
+        assert file_db.get_article_by_id(article_id)['ai_summary'] == "Rates rose again."
+        
+        again = client.get(f"/articles/{article_id}/summary/stream")
+        assert 'event: token' not in again.text
+        assert '"cached": true' in again.text
+    
+    def test_summary_stream_unknown_article(self, test_client):
+        """Test streaming a summary for a missing article returns 404."""
+        response = test_client.get("/articles/99999/summary/stream")
+        assert response.status_code == 404
+
+class TestSearchEndpoint:
+    """Test GET /search."""
+    
+    def test_search_pages_with_cursor(self, file_db, monkeypatch):
+        """Test search returns ranked cards with snippets and a working cursor."""
+        import backend.main as main
+        monkeypatch.setattr(main, 'db', file_db)
+        for i in range(3):
+            file_db.insert_article({'title': f'Quantum chip {i}', 'url': f'https://example.com/q{i}',
+                                    'content': 'A faster quantum processor.'})
+        file_db.insert_article({'title': 'Football', 'url': 'https://example.com/f', 'content': 'A match.'})
+        
+        client = TestClient(main.app)
+        first = client.get("/search?q=quantum&limit=2").json()
+        second = client.get(f"/search?q=quantum&limit=2&cursor={first['next_cursor']}").json()
+        
+        assert first['count'] == 2 and second['count'] == 1
+        assert second['next_cursor'] is None
+        titles = [a['title'] for a in first['articles'] + second['articles']]
+        assert sorted(titles) == ['Quantum chip 0', 'Quantum chip 1', 'Quantum chip 2']
+        assert '<mark>' in first['articles'][0]['search_snippet']
+        assert 'content' not in first['articles'][0]
+    
+    def test_empty_query(self, test_client):
+        """Test a query without words is rejected."""
+        assert test_client.get("/search?q=%20%3F").status_code == 400
+        assert test_client.get("/search").status_code == 422
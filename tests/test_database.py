@@ -232,4 +232,510 @@ class TestDatabaseManager:
         
         # Verify update
         article = test_db.get_article_by_id(article_id)
-        assert article['ai_summary'] == test_summary
\ No newline at end of file
+        assert article['ai_summary'] == test_summary
+
+class TestFeedFetchState:
+    """Test per-feed fetch state persistence."""
+    
+    def test_update_feed_fetch_state(self, file_db):
+        """Test storing conditional GET validators for a feed."""
+        feed_id = file_db.insert_feed({'title': 'Test Feed', 'url': 'https://example.com/feed.xml'})
+        
+        success = file_db.update_feed_fetch_state(feed_id, '"abc"', 'Wed, 01 Jan 2025 00:00:00 GMT', 'deadbeef')
+        assert success is True
+        
+        feed = file_db.get_active_feeds()[0]
+        assert feed['etag'] == '"abc"'
+        assert feed['last_modified'] == 'Wed, 01 Jan 2025 00:00:00 GMT'
+        assert feed['content_hash'] == 'deadbeef'
+        assert feed['last_fetched'] is not None
+
+class TestKnownArticles:
+    """Test batched lookup of stored articles."""
+    
+    def test_get_known_articles(self, file_db):
+        """Test known articles are found by URL or GUID."""
+        file_db.insert_article({'title': 'A', 'url': 'https://example.com/a', 'guid': 'guid-a', 'content_hash': 'h1'})
+        file_db.insert_article({'title': 'B', 'url': 'https://example.com/b', 'guid': 'guid-b', 'content_hash': 'h2'})
+        
+        known = file_db.get_known_articles(['https://example.com/a', 'https://example.com/new'], ['guid-b'])
+        
+        assert sorted(row['url'] for row in known) == ['https://example.com/a', 'https://example.com/b']
+        assert {row['content_hash'] for row in known} == {'h1', 'h2'}
+    
+    def test_get_known_articles_empty(self, file_db):
+        """Test an empty lookup does not touch the database."""
+        assert file_db.get_known_articles([], []) == []
+    
+    def test_get_article_analyses(self, file_db):
+        """Test stored analyses are read for several ids at once, skipping unknown ids."""
+        first = file_db.insert_article({'title': 'A', 'url': 'https://example.com/a', 'category': 'science',
+                                        'topics': ['space'], 'political_bias': 0.1})
+        second = file_db.insert_article({'title': 'B', 'url': 'https://example.com/b', 'category': 'sports'})
+        
+        analyses = file_db.get_article_analyses([first, second, 999])
+        
+        assert set(analyses) == {first, second}
+        assert analyses[first]['category'] == 'science'
+        assert analyses[first]['topics'] == ['space']
+        assert analyses[second]['topics'] == []
+        assert 'embedding' not in analyses[first] and 'title' not in analyses[first]
+    
+    def test_lookups_span_several_chunks(self, file_db):
+        """Test batched lookups return every match when the ids fill more than one IN (...) chunk."""
+        from database.models import SELECT_IN_CHUNK_SIZE
+        
+        count = SELECT_IN_CHUNK_SIZE + 50
+        result = file_db.insert_articles([{'title': f'Article {i}', 'url': f'https://example.com/{i}'}
+                                          for i in range(count)])
+        
+        assert result['inserted'] == count
+        assert len(file_db.get_article_analyses(result['ids'])) == count
+        assert len(file_db.get_known_articles([f'https://example.com/{i}' for i in range(count)], [])) == count
+
+class TestEmbeddingModel:
+    """Test embedding model bookkeeping."""
+    
+    def test_ensure_embedding_model(self, file_db):
+        """Test stored embeddings are cleared when the embedding model changes."""
+        assert file_db.ensure_embedding_model('model-a', 384) is False
+        
+        article_id = file_db.insert_article({'title': 'A', 'url': 'https://example.com/a', 'embedding': [0.5] * 384})
+        assert file_db.ensure_embedding_model('model-a', 384) is False
+        assert file_db.get_article_by_id(article_id)['embedding'] is not None
+        
+        assert file_db.ensure_embedding_model('model-b', 256) is True
+        assert file_db.get_article_by_id(article_id)['embedding'] is None
+
+class TestEmbeddingStorage:
+    """Test compact float32 embedding storage."""
+    
+    def test_embedding_roundtrip(self, file_db):
+        """Test embeddings are stored as headered float32 blobs and decoded as arrays."""
+        import numpy as np
+        
+        vector = np.linspace(-1, 1, 384, dtype=np.float32)
+        blob = file_db._serialize_embedding(vector)
+        
+        assert len(blob) == 8 + 384 * 4
+        decoded = file_db._deserialize_embedding(blob)
+        assert decoded.dtype == np.float32
+        assert np.array_equal(decoded, vector)
+    
+    def test_pickled_blobs_are_not_loaded(self, file_db):
+        """Test pickled data is never unpickled on read."""
+        import pickle
+        
+        assert file_db._deserialize_embedding(pickle.dumps([0.1] * 384)) is None
+    
+    def test_migrates_pickled_embeddings(self, tmp_path):
+        """Test existing pickled embedding rows are converted on startup."""
+        import pickle
+        import numpy as np
+        from database.models import DatabaseManager
+        
+        db_path = str(tmp_path / "legacy.db")
+        db = DatabaseManager(db_path)
+        article_id = db.insert_article({'title': 'A', 'url': 'https://example.com/a'})
+        
+        conn = sqlite3.connect(db_path)
+        conn.execute('UPDATE articles SET embedding = ? WHERE id = ?', (pickle.dumps([0.25] * 384), article_id))
+        conn.execute('PRAGMA user_version = 0')
+        conn.commit()
+        conn.close()
+        
+        migrated = DatabaseManager(db_path)
+        embedding = migrated.get_article_by_id(article_id)['embedding']
+        
+        assert isinstance(embedding, np.ndarray)
+        assert embedding.shape == (384,)
+        assert np.allclose(embedding, 0.25)
+
+class TestArticleIndexes:
+    """Test that article listings are served by indexes."""
+    
+    @pytest.mark.parametrize("category,read_status,after", [
+        (None, None, None),
+        ('technology', None, None),
+        (None, False, None),
+        ('technology', True, None),
+        (None, None, (0.5, '2025-01-01T00:00:00', 10)),
+        ('technology', False, (0.5, '2025-01-01T00:00:00', 10)),
+    ])
+    def test_listing_queries_use_index(self, file_db, category, read_status, after):
+        """Test common /articles query shapes search an index without a scan or sort."""
+        query, params = file_db._articles_query(category=category, min_relevance=0.3,
+                                                read_status=read_status, after=after)
+        
+        conn = sqlite3.connect(file_db.db_path)
+        plan = [row[3] for row in conn.execute('EXPLAIN QUERY PLAN ' + query, params + [20, 0])]
+        conn.close()
+        
+        assert plan, "expected a query plan"
+        for step in plan:
+            assert step.startswith('SEARCH articles USING INDEX'), plan
+            assert 'TEMP B-TREE' not in step, plan
+    
+    def test_indexes_created_by_migration(self, file_db):
+        """Test the migration records its schema version."""
+        conn = sqlite3.connect(file_db.db_path)
+        version = conn.execute('PRAGMA user_version').fetchone()[0]
+        indexes = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        conn.close()
+        
+        assert version >= 2
+        assert {'idx_articles_rank', 'idx_articles_category_rank',
+                'idx_articles_read_rank', 'idx_articles_category_read_rank'} <= indexes
+
+class TestKeysetPagination:
+    """Test cursor-based article paging."""
+    
+    def test_cursor_pages_cover_all_articles(self, file_db):
+        """Test walking pages by cursor returns each article once, in rank order."""
+        for i in range(7):
+            file_db.insert_article({
+                'title': f'Article {i}',
+                'url': f'https://example.com/{i}',
+                'published': '2025-01-01T00:00:00',  # identical keys exercise the id tie-break
+                'relevance_score': 0.5 if i % 2 else 0.8
+            })
+        
+        seen = []
+        after = None
+        while True:
+            page = file_db.get_articles(limit=3, after=after)
+            if not page:
+                break
+            seen.extend(article['id'] for article in page)
+            after = file_db.article_cursor(page[-1])
+        
+        expected = [article['id'] for article in file_db.get_articles(limit=100)]
+        assert seen == expected
+        assert len(set(seen)) == 7
+    
+    def test_missing_published_is_filled(self, file_db):
+        """Test articles without a publication date still get a sortable one."""
+        article_id = file_db.insert_article({'title': 'Undated', 'url': 'https://example.com/undated'})
+        assert file_db.get_article_by_id(article_id)['published'] is not None
+
+class TestFullTextSearch:
+    """Test FTS5 article search."""
+    
+    def _insert(self, file_db):
+        return {
+            'rates': file_db.insert_article({'title': 'Central bank raises interest rates', 'url': 'https://example.com/rates',
+                                             'content': 'Inflation remains high.', 'category': 'business'}),
+            'mention': file_db.insert_article({'title': 'Markets close higher', 'url': 'https://example.com/markets',
+                                               'content': 'Traders shrugged off talk of interest rates.', 'category': 'business'}),
+            'football': file_db.insert_article({'title': 'Cup final goes to penalties', 'url': 'https://example.com/cup',
+                                                'content': 'A goalless draw.', 'category': 'sports', 'topics': ['football']}),
+        }
+    
+    def test_title_matches_rank_first(self, file_db):
+        """Test results are ranked by weighted BM25 and carry highlighted snippets."""
+        ids = self._insert(file_db)
+        
+        results = file_db.search_articles('interest rates')
+        
+        assert [article['id'] for article in results] == [ids['rates'], ids['mention']]
+        assert '<mark>interest</mark> <mark>rates</mark>' in results[0]['search_snippet']
+        assert results[0]['search_rank'] < results[1]['search_rank']
+    
+    def test_index_follows_updates_and_deletes(self, file_db):
+        """Test the triggers keep the index in step with the articles table."""
+        ids = self._insert(file_db)
+        
+        assert [a['id'] for a in file_db.search_articles('football')] == [ids['football']]
+        assert [a['id'] for a in file_db.search_articles('penal')] == [ids['football']]
+        
+        file_db.insert_article({'title': 'Cup final decided by a replay', 'url': 'https://example.com/cup',
+                                'content': 'A goalless draw.', 'category': 'sports', 'topics': ['football'],
+                                'content_hash': 'edited'})
+        assert file_db.search_articles('penalties') == []
+        assert [a['id'] for a in file_db.search_articles('replay')] == [ids['football']]
+        
+        with file_db._writer() as conn:
+            conn.execute('DELETE FROM articles WHERE id = ?', (ids['football'],))
+        assert file_db.search_articles('replay') == []
+    
+    def test_filters_and_cursor(self, file_db):
+        """Test filters apply and cursor pages cover every match once."""
+        ids = self._insert(file_db)
+        
+        assert file_db.search_articles('interest', category='sports') == []
+        
+        first = file_db.search_articles('interest rates', limit=1)
+        second = file_db.search_articles('interest rates', limit=1, after=file_db.search_cursor(first[0]))
+        assert [first[0]['id'], second[0]['id']] == [ids['rates'], ids['mention']]
+    
+    def test_user_input_is_not_fts_syntax(self, file_db):
+        """Test operators and stray quotes in the query are matched literally."""
+        from database.models import search_match_query
+        
+        self._insert(file_db)
+        
+        assert search_match_query('rates AND (') == '"rates" "AND"*'
+        assert search_match_query('"interest rates" bank') == '"interest rates" "bank"*'
+        assert search_match_query(' ?! ') is None
+        assert file_db.search_articles('"unterminated') == []
+        assert len(file_db.search_articles('rates)')) == 2
+    
+    def test_existing_articles_are_indexed_by_migration(self, tmp_path):
+        """Test upgrading a database indexes the articles it already holds."""
+        from database.models import DatabaseManager
+        
+        path = str(tmp_path / "old.db")
+        db = DatabaseManager(path)
+        db.insert_article({'title': 'Solar power record', 'url': 'https://example.com/solar'})
+        with db._writer() as conn:
+            conn.execute("INSERT INTO articles_fts (articles_fts) VALUES ('delete-all')")
+            conn.execute('PRAGMA user_version = 4')
+        db.close()
+        
+        upgraded = DatabaseManager(path)
+        assert [a['title'] for a in upgraded.search_articles('solar')] == ['Solar power record']
+        upgraded.close()
+
+class TestBulkInsert:
+    """Test single-transaction batch upserts."""
+    
+    def test_insert_articles_counts(self, file_db):
+        """Test a batch reports inserted, updated and skipped articles."""
+        file_db.insert_article({'title': 'Existing', 'url': 'https://example.com/existing'})
+        
+        result = file_db.insert_articles([
+            {'title': 'New', 'url': 'https://example.com/new'},
+            {'title': 'Existing again', 'url': 'https://example.com/existing'},
+            {'title': 'No URL'},
+            {'title': 'Repeat', 'url': 'https://example.com/repeat'},
+            {'title': 'Repeat latest', 'url': 'https://example.com/repeat'},
+        ])
+        
+        assert result['inserted'] == 2
+        assert result['updated'] == 1
+        assert result['skipped'] == 2
+        assert result['ids'][2] is None and result['ids'][3] is None
+        assert file_db.get_article_by_id(result['ids'][4])['title'] == 'Repeat latest'
+        assert len(file_db.get_articles(limit=100)) == 3
+    
+    def test_insert_articles_empty(self, file_db):
+        """Test an empty batch is a no-op."""
+        assert file_db.insert_articles([]) == {'inserted': 0, 'updated': 0, 'skipped': 0, 'ids': [], 'error': None}
+
+class TestArticleUpsert:
+    """Test upserts keep stored articles in place."""
+    
+    def test_reingest_keeps_id_and_user_state(self, file_db):
+        """Test updating a known URL keeps its id, AI summary and read status."""
+        article = {'title': 'Original', 'url': 'https://example.com/a', 'guid': 'a',
+                   'published': '2025-01-01T00:00:00'}
+        article_id = file_db.insert_article(article)
+        file_db.update_article_ai_summary(article_id, 'Stored summary')
+        file_db.mark_article_read(article_id)
+        
+        result = file_db.insert_articles([dict(article, title='Edited')])
+        
+        assert result['ids'] == [article_id]
+        assert result['updated'] == 1
+        stored = file_db.get_article_by_id(article_id)
+        assert stored['title'] == 'Edited'
+        assert stored['ai_summary'] == 'Stored summary'
+        assert stored['read_status']
+        assert stored['published'] == '2025-01-01T00:00:00'
+    
+    def test_reingest_without_analysis_keeps_analysis(self, file_db):
+        """Test a changed article stored without fresh analysis keeps its stored analysis."""
+        analysis = {
+            'category': 'politics', 'sentiment': 'negative', 'importance': 'high',
+            'topics': ['election', 'budget'], 'summary': 'Stored summary',
+            'political_bias': -0.4, 'bias_confidence': 0.7, 'bias_reasoning': 'Framing',
+            'relevance_boost': 0.2,
+        }
+        article = {'title': 'Budget vote', 'url': 'https://example.com/budget', 'content': 'First draft'}
+        article_id = file_db.insert_article(dict(article, **analysis))
+        
+        result = file_db.insert_articles([dict(article, content='Corrected draft')])
+        
+        assert result['updated'] == 1
+        stored = file_db.get_article_by_id(article_id)
+        assert stored['content'] == 'Corrected draft'
+        assert {field: stored[field] for field in analysis} == analysis
+    
+    def test_insert_without_analysis_uses_defaults(self, file_db):
+        """Test a new article without analysis gets empty topics and zero bias confidence and boost."""
+        article_id = file_db.insert_article({'title': 'Plain', 'url': 'https://example.com/plain'})
+        
+        stored = file_db.get_article_by_id(article_id)
+        assert stored['topics'] == []
+        assert stored['bias_confidence'] == 0.0
+        assert stored['relevance_boost'] == 0.0
+    
+    def test_unchanged_article_is_skipped(self, file_db):
+        """Test re-ingesting an identical article writes nothing."""
+        article = {'title': 'Same', 'url': 'https://example.com/same', 'content': 'Body'}
+        file_db.insert_article(article)
+        
+        result = file_db.insert_articles([article])
+        
+        assert result['inserted'] == 0
+        assert result['updated'] == 0
+        assert result['skipped'] == 1
+        assert result['ids'][0] is not None
+    
+    def test_moved_link_updates_by_guid(self, file_db):
+        """Test an article whose URL changed is matched by guid."""
+        article_id = file_db.insert_article({'title': 'Moved', 'url': 'https://example.com/old', 'guid': 'g1'})
+        
+        result = file_db.insert_articles([{'title': 'Moved', 'url': 'https://example.com/new', 'guid': 'g1'}])
+        
+        assert result['ids'] == [article_id]
+        assert file_db.get_article_by_id(article_id)['url'] == 'https://example.com/new'
+    
+    def test_conflicting_row_does_not_drop_batch(self, file_db):
+        """Test an article clashing with two stored rows is skipped alone."""
+        file_db.insert_article({'title': 'One', 'url': 'https://example.com/1', 'guid': 'g1'})
+        file_db.insert_article({'title': 'Two', 'url': 'https://example.com/2', 'guid': 'g2'})
+        
+        result = file_db.insert_articles([
+            {'title': 'Clash', 'url': 'https://example.com/1', 'guid': 'g2'},
+            {'title': 'Fresh', 'url': 'https://example.com/3', 'guid': 'g3'},
+        ])
+        
+        assert result['inserted'] == 1
+        assert result['skipped'] == 1
+        assert len(file_db.get_articles(limit=100)) == 3
+
+class TestFeedSchedule:
+    """Test feed scheduling state."""
+    
+    def test_due_feeds(self, file_db):
+        """Test only feeds whose next fetch has passed are due, unscheduled ones first."""
+        first = file_db.insert_feed({'title': 'First', 'url': 'https://example.com/1'})
+        second = file_db.insert_feed({'title': 'Second', 'url': 'https://example.com/2'})
+        third = file_db.insert_feed({'title': 'Third', 'url': 'https://example.com/3'})
+        
+        file_db.update_feed_schedule(first, 2.0, 1800, 3600)
+        file_db.update_feed_schedule(second, None, 1800, -60)
+        
+        due = file_db.get_due_feeds(limit=10)
+        assert [feed['id'] for feed in due] == [third, second]
+        assert file_db.get_due_feeds(limit=1)[0]['id'] == third
+        
+        scheduled = {feed['id']: feed for feed in file_db.get_active_feeds()}[first]
+        assert scheduled['publish_rate'] == 2.0
+        assert scheduled['next_fetch_at'] is not None
+
+class TestFeedHealth:
+    """Test feed failure tracking and backoff."""
+    
+    def test_failures_back_off_and_deactivate(self, file_db):
+        """Test failing feeds are held back and deactivated after repeated failures."""
+        feed_id = file_db.insert_feed({'title': 'Dead', 'url': 'https://dead.example.com/rss'})
+        
+        assert file_db.record_feed_failure(feed_id, 'timed out', 600, max_failures=3) == 1
+        feed = file_db.get_active_feeds()[0]
+        assert feed['last_error'] == 'timed out'
+        assert feed['retry_after'] is not None
+        assert file_db.get_active_feeds(ready_only=True) == []
+        assert file_db.get_due_feeds(limit=10) == []
+        
+        file_db.record_feed_failure(feed_id, 'timed out', 600, max_failures=3)
+        assert file_db.record_feed_failure(feed_id, 'gone', 600, max_failures=3) == 3
+        assert file_db.get_active_feeds() == []
+        assert file_db.get_all_feeds()[0]['active'] == 0
+    
+    def test_success_resets_health(self, file_db):
+        """Test a successful fetch clears the failure state."""
+        feed_id = file_db.insert_feed({'title': 'Flaky', 'url': 'https://flaky.example.com/rss'})
+        file_db.record_feed_failure(feed_id, 'HTTP 503', 600, max_failures=5)
+        
+        file_db.update_feed_fetch_state(feed_id, None, None, 'hash')
+        
+        feed = file_db.get_active_feeds(ready_only=True)[0]
+        assert feed['failure_count'] == 0
+        assert feed['last_error'] is None
+        assert feed['last_success'] is not None
+
+class TestConnectionPool:
+    """Test reusable connections and their PRAGMAs."""
+    
+    def test_file_database_uses_wal(self, file_db):
+        """Test file databases run in WAL mode with tuned PRAGMAs."""
+        with file_db._reader() as conn:
+            assert conn.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+            assert conn.execute('PRAGMA synchronous').fetchone()[0] == 1  # NORMAL
+            assert conn.execute('PRAGMA busy_timeout').fetchone()[0] == file_db.busy_timeout_ms
+    
+    def test_reader_connection_reused_per_thread(self, file_db):
+        """Test a thread reuses its read connection while other threads get their own."""
+        import threading
+        
+        with file_db._reader() as first:
+            pass
+        with file_db._reader() as second:
+            pass
+        assert first is second
+        
+        other = {}
+        def read():
+            with file_db._reader() as conn:
+                other['conn'] = conn
+        thread = threading.Thread(target=read)
+        thread.start()
+        thread.join()
+        assert other['conn'] is not first
+    
+    def test_close_closes_other_threads_readers(self, file_db):
+        """Test close() also closes read connections opened by other live threads."""
+        import sqlite3
+        import threading
+        
+        opened = threading.Event()
+        release = threading.Event()
+        other = {}
+        def read():
+            with file_db._reader() as conn:
+                other['conn'] = conn
+            opened.set()
+            release.wait()
+        thread = threading.Thread(target=read)
+        thread.start()
+        opened.wait()
+        
+        file_db.close()
+        release.set()
+        thread.join()
+        with pytest.raises(sqlite3.ProgrammingError):
+            other['conn'].execute('SELECT 1')
+    
+    def test_exited_thread_reader_is_closed(self, file_db):
+        """Test the read connection of a finished thread is closed once another reader opens."""
+        import sqlite3
+        import threading
+        
+        connections = []
+        def read():
+            with file_db._reader() as conn:
+                connections.append(conn)
+        for _ in range(2):
+            thread = threading.Thread(target=read)
+            thread.start()
+            thread.join()
+        
+        with pytest.raises(sqlite3.ProgrammingError):
+            connections[0].execute('SELECT 1')
+        assert len(file_db._readers) == 1
+    
+    def test_reader_sees_committed_writes(self, file_db):
+        """Test a long-lived read connection sees rows written after it opened."""
+        assert file_db.get_articles() == []
+        file_db.insert_article({'title': 'Fresh', 'url': 'https://example.com/fresh'})
+        assert [article['title'] for article in file_db.get_articles()] == ['Fresh']
+    
+    def test_failed_write_rolls_back(self, file_db):
+        """Test an exception inside a write leaves no partial changes."""
+        with pytest.raises(RuntimeError):
+            with file_db._writer() as conn:
+                conn.execute("INSERT INTO feeds (url, title) VALUES ('https://example.com/rss', 'Feed')")
+                raise RuntimeError("boom")
+        assert file_db.get_active_feeds() == []
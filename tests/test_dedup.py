@@ -0,0 +1,69 @@
+"""Test near-duplicate story detection."""
+import pytest
+
+STORY = ("The central bank raised interest rates by a quarter point on Wednesday, "
+         "citing persistent inflation and a strong labour market, and signalled "
+         "that further increases remain possible later this year.")
+
+class TestSimHash:
+    """Test SimHash fingerprints."""
+    
+    def test_near_duplicates_are_close(self):
+        """Test lightly edited copies of a story hash within a few bits."""
+        from content.dedup import simhash, hamming_distance
+        
+        edited = STORY.replace("on Wednesday", "on Wednesday afternoon")
+        unrelated = ("The home side won the cup final on penalties after a goalless draw, "
+                     "with the goalkeeper saving two spot kicks in front of a record crowd.")
+        
+        assert hamming_distance(simhash(STORY), simhash(edited)) <= 5
+        assert hamming_distance(simhash(STORY), simhash(unrelated)) > 16
+    
+    def test_short_text_has_no_hash(self):
+        """Test texts too short to compare are not fingerprinted."""
+        from content.dedup import simhash
+        
+        assert simhash("Breaking news") is None
+    
+    def test_signed_roundtrip(self):
+        """Test hashes survive storage as signed 64-bit integers."""
+        from content.dedup import to_signed, to_unsigned
+        
+        for value in (0, 1, 2 ** 63 - 1, 2 ** 63, 2 ** 64 - 1):
+            assert -2 ** 63 <= to_signed(value) < 2 ** 63
+            assert to_unsigned(to_signed(value)) == value
+
+class TestSimHashIndex:
+    """Test banded SimHash lookups."""
+    
+    def test_finds_story_within_distance(self):
+        """Test hashes a few bits away match and distant ones do not."""
+        from content.dedup import SimHashIndex
+        
+        index = SimHashIndex(max_distance=3, window=3600)
+        index.add(1, 0b1011 << 40, added_at=1000)
+        
+        assert index.find((0b1011 << 40) ^ 0b111, now=1000) == 1
+        assert index.find((0b1011 << 40) ^ 0b1111, now=1000) is None
+    
+    def test_ties_go_to_oldest_story(self):
+        """Test equally close stories resolve to the lowest id."""
+        from content.dedup import SimHashIndex
+        
+        index = SimHashIndex(max_distance=3, window=3600)
+        index.add(7, 0b01, added_at=1000)
+        index.add(3, 0b10, added_at=1000)
+        
+        assert index.find(0b00, now=1000) == 3
+    
+    def test_old_stories_expire(self):
+        """Test stories outside the window no longer match."""
+        from content.dedup import SimHashIndex
+        
+        index = SimHashIndex(max_distance=3, window=3600)
+        index.add(1, 12345, added_at=1000)
+        
+        assert index.find(12345, now=2000) == 1
+        assert index.find(12345, now=5000) is None
+        index.prune(now=5000)
+        assert len(index) == 0
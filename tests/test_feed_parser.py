@@ -0,0 +1,177 @@
+"""Test RSS feed fetching and parsing."""
+import pytest
+import threading
+import time
+from unittest.mock import Mock, patch
+
+SAMPLE_RSS = b'''<?xml version="1.0"?>
+<rss version="2.0">
+  <channel>
+    <title>Test Feed</title>
+    <item>
+      <title>First Article</title>
+      <link>https://example.com/first</link>
+      <guid>first</guid>
+      <description>&lt;p&gt;Some content&lt;/p&gt;</description>
+    </item>
+  </channel>
+</rss>'''
+
+def make_response(body=SAMPLE_RSS, status_code=200):
+    """Build a mock streaming response."""
+    response = Mock()
+    response.status_code = status_code
+    response.headers = {}
+    response.iter_content = Mock(return_value=[body])
+    response.raise_for_status = Mock()
+    return response
+
+class TestFeedParser:
+    """Test feed fetching behaviour."""
+
+    def test_parse_feed(self):
+        """Test parsing a feed returns cleaned articles."""
+        from content.feed_parser import FeedParser
+
+        parser = FeedParser()
+        with patch.object(parser.session, 'get', return_value=make_response()):
+            articles = parser.parse_feed('https://example.com/rss')
+
+        assert len(articles) == 1
+        assert articles[0]['title'] == 'First Article'
+        assert articles[0]['content'] == 'Some content'
+
+    def test_fetch_feed_error(self):
+        """Test a failing feed reports an error instead of raising."""
+        from content.feed_parser import FeedParser
+
+        parser = FeedParser()
+        with patch.object(parser.session, 'get', side_effect=ConnectionError("down")):
+            result = parser.fetch_feed({'url': 'https://dead.example.com/rss'})
+
+        assert result['status'] == 'error'
+        assert result['articles'] == []
+        assert 'down' in result['error']
+
+    def test_invalid_feed_is_error(self):
+        """Test an HTML page served in place of a feed reports an error."""
+        from content.feed_parser import FeedParser
+
+        parser = FeedParser()
+        page = make_response(b'<html><body><p>Domain for sale</p></body></html')
+        with patch.object(parser.session, 'get', return_value=page):
+            result = parser.fetch_feed({'url': 'https://parked.example.com/rss'})
+
+        assert result['status'] == 'error'
+        assert 'Not a valid feed' in result['error']
+
+    def test_fetch_feeds_respects_limits(self):
+        """Test concurrent fetching honours global and per-host limits."""
+        from content.feed_parser import FeedParser
+
+        lock = threading.Lock()
+        active = {'total': 0, 'max_total': 0}
+        per_host = {}
+        max_per_host = {}
+
+        def slow_get(url, **kwargs):
+            host = url.split('/')[2]
+            with lock:
+                active['total'] += 1
+                per_host[host] = per_host.get(host, 0) + 1
+                active['max_total'] = max(active['max_total'], active['total'])
+                max_per_host[host] = max(max_per_host.get(host, 0), per_host[host])
+            time.sleep(0.05)
+            with lock:
+                active['total'] -= 1
+                per_host[host] -= 1
+            return make_response()
+
+        feeds = [{'url': f'https://host{i % 3}.example.com/feed{i}'} for i in range(12)]
+        parser = FeedParser(max_concurrency=4, per_host_limit=1)
+        with patch.object(parser.session, 'get', side_effect=slow_get):
+            results = list(parser.fetch_feeds(feeds))
+
+        assert len(results) == 12
+        assert all(result['status'] == 'ok' for result in results)
+        assert active['max_total'] <= 4
+        assert all(count <= 1 for count in max_per_host.values())
+
+    def test_slow_feed_does_not_block_others(self):
+        """Test fast feeds are yielded before a slow feed finishes."""
+        from content.feed_parser import FeedParser
+
+        def get(url, **kwargs):
+            if 'slow' in url:
+                time.sleep(0.3)
+            return make_response()
+
+        feeds = [{'url': 'https://slow.example.com/rss'}] + \
+                [{'url': f'https://fast{i}.example.com/rss'} for i in range(3)]
+        parser = FeedParser(max_concurrency=4)
+        with patch.object(parser.session, 'get', side_effect=get):
+            order = [result['feed']['url'] for result in parser.fetch_feeds(feeds)]
+
+        assert order[-1] == 'https://slow.example.com/rss'
+
+class TestConditionalGet:
+    """Test conditional GET and body-hash short circuits."""
+
+    def test_sends_validators(self):
+        """Test stored validators are sent as conditional headers."""
+        from content.feed_parser import FeedParser
+
+        parser = FeedParser()
+        feed = {'url': 'https://example.com/rss', 'etag': '"abc"',
+                'last_modified': 'Wed, 01 Jan 2025 00:00:00 GMT'}
+        with patch.object(parser.session, 'get', return_value=make_response()) as mock_get:
+            parser.fetch_feed(feed)
+
+        headers = mock_get.call_args.kwargs['headers']
+        assert headers['If-None-Match'] == '"abc"'
+        assert headers['If-Modified-Since'] == 'Wed, 01 Jan 2025 00:00:00 GMT'
+
+    def test_not_modified(self):
+        """Test a 304 response skips parsing and keeps the old validators."""
+        from content.feed_parser import FeedParser
+
+        parser = FeedParser()
+        feed = {'url': 'https://example.com/rss', 'etag': '"abc"'}
+        with patch.object(parser.session, 'get', return_value=make_response(b'', 304)), \
+             patch('content.feed_parser.feedparser.parse') as mock_parse:
+            result = parser.fetch_feed(feed)
+
+        assert result['status'] == 'not_modified'
+        assert result['etag'] == '"abc"'
+        assert result['articles'] == []
+        mock_parse.assert_not_called()
+
+    def test_unchanged_body(self):
+        """Test an identical body hash skips parsing."""
+        import hashlib
+        from content.feed_parser import FeedParser
+
+        parser = FeedParser()
+        feed = {'url': 'https://example.com/rss',
+                'content_hash': hashlib.sha256(SAMPLE_RSS).hexdigest()}
+        with patch.object(parser.session, 'get', return_value=make_response()), \
+             patch('content.feed_parser.feedparser.parse') as mock_parse:
+            result = parser.fetch_feed(feed)
+
+        assert result['status'] == 'unchanged'
+        mock_parse.assert_not_called()
+
+    def test_changed_body_returns_new_state(self):
+        """Test a changed feed returns articles and its new validators."""
+        from content.feed_parser import FeedParser
+
+        response = make_response()
+        response.headers = {'ETag': '"def"', 'Last-Modified': 'Thu, 02 Jan 2025 00:00:00 GMT'}
+        parser = FeedParser()
+        with patch.object(parser.session, 'get', return_value=response):
+            result = parser.fetch_feed({'url': 'https://example.com/rss', 'content_hash': 'stale'})
+
+        assert result['status'] == 'ok'
+        assert len(result['articles']) == 1
+        assert result['etag'] == '"def"'
+        assert result['content_hash'] != 'stale'
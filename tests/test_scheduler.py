@@ -0,0 +1,60 @@
+"""Test adaptive feed scheduling."""
+import pytest
+from datetime import datetime, timedelta
+
+class TestFeedScheduler:
+    """Test polling interval planning."""
+    
+    def make_scheduler(self, **kwargs):
+        from jobs.scheduler import FeedScheduler
+        options = dict(enabled=False, min_interval=300, max_interval=21600,
+                       default_interval=1800, jitter=0.0)
+        options.update(kwargs)
+        return FeedScheduler(**options)
+    
+    def test_interval_clamped_to_bounds(self):
+        """Test hot feeds poll at the minimum and silent feeds at the maximum interval."""
+        scheduler = self.make_scheduler()
+        
+        assert scheduler.interval_for(None) == 1800
+        assert scheduler.interval_for(100.0) == 300
+        assert scheduler.interval_for(2.0) == 1800
+        assert scheduler.interval_for(0.0) == 21600
+    
+    def test_plan_tracks_publish_rate(self):
+        """Test a busy feed is polled sooner and a quiet feed later."""
+        scheduler = self.make_scheduler()
+        now = datetime(2025, 1, 1, 12, 0, 0)
+        fetched = (now - timedelta(hours=1)).strftime('%Y-%m-%d %H:%M:%S')
+        
+        busy = scheduler.plan({'last_fetched': fetched, 'publish_rate': None}, 6, now=now)
+        quiet = scheduler.plan({'last_fetched': fetched, 'publish_rate': 1.0}, 0, now=now)
+        
+        assert busy['publish_rate'] == pytest.approx(6.0)
+        assert busy['fetch_interval'] == pytest.approx(600)
+        assert quiet['publish_rate'] == pytest.approx(0.7)
+        assert quiet['fetch_interval'] > 3600
+    
+    def test_first_fetch_uses_default_interval(self):
+        """Test a never-fetched feed keeps the default interval."""
+        scheduler = self.make_scheduler()
+        plan = scheduler.plan({'last_fetched': None, 'publish_rate': None}, 20)
+        
+        assert plan['publish_rate'] is None
+        assert plan['delay'] == 1800
+    
+    def test_jitter_spreads_delay(self):
+        """Test jitter keeps the delay within the configured fraction."""
+        scheduler = self.make_scheduler(jitter=0.2)
+        delays = [scheduler.jittered(1000) for _ in range(50)]
+        
+        assert all(800 <= delay <= 1200 for delay in delays)
+        assert len(set(delays)) > 1
+    
+    def test_backoff_doubles_up_to_max(self):
+        """Test failure backoff grows exponentially and is capped."""
+        scheduler = self.make_scheduler(backoff_base=300, backoff_max=3600)
+        
+        assert scheduler.backoff({'failure_count': 0}) == 300
+        assert scheduler.backoff({'failure_count': 2}) == 1200
+        assert scheduler.backoff({'failure_count': 50}) == 3600